@@ -0,0 +1,64 @@
+"""Compares page rendering through the glyph run cache with the ImageDraw.text path.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_glyph_run_cache.py [font_path] [pages]
+"""
+import sys
+import time
+
+import numpy as np
+
+from SynthImage.SynthPageImage.glyph_run_cache import GlyphRunCache
+from SynthImage.SynthPageImage.page_image import PageGenerator
+
+LINES = [
+    "༄༅༅། །རྒྱ་གར་སྐད་དུ། བི་ན་ཡ་བསྟུ། བོད་སྐད་དུ། འདུལ་བ་གཞི། བམ་པོ་དང་པོ། དཀོན་མཆོག་གསུམ་ལ་ཕྱག་འཚལ་ལོ།",
+    "རྣམས་ཡང་དག་རབ་བཅད་ཅིང་། །མུ་སྟེགས་ཚོགས་རྣམས་ཐམས་ཅད་རབ་བཅོམ་སྟེ། །སྡེ་དང་བཅས་པའི་བདུད་རྣམས་ངེས་བཅོམ་ནས།",
+    "ཕྱག་འཚལ་ལོ། །ཁྱིམ་དོན་ཆེ་ཆུང་སྤངས་ཏེ་དང་པོར་རབ་འབྱུང་དཀའ། །རབ་བྱུང་ཐོབ་ནས་ཡུལ་སྤྱད་དག་གིས་དགའ་ཐོབ་དཀའ།",
+    "དག་བྱེད་པ་དཀའ། །ངུར་སྨྲིག་གོས་འཆང་མཁས་པ་ཚུལ་ལས་ཉམས་པ་དཀའ། །གཞི་རྣམས་ཀྱི་སྤྱི་སྡོམ་ལ། རབ་འབྱུང་གསོ་སྦྱོང་གཞི་དང་ནི།",  # noqa
+]
+
+
+def make_pages(count, lines_per_page=12):
+    rng = np.random.default_rng(0)
+    return [
+        "\n".join(LINES[i] for i in rng.integers(0, len(LINES), lines_per_page))
+        for _ in range(count)
+    ]
+
+
+def render(page_generator, pages):
+    start = time.perf_counter()
+    images = [np.array(page_generator.generate_page_image(page)) for page in pages]
+    return time.perf_counter() - start, images
+
+
+def main():
+    font_path = sys.argv[1] if len(sys.argv) > 1 else "tests/font/monlam_uni_ochan1.ttf"
+    page_count = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    pages = make_pages(page_count)
+
+    draw_generator = PageGenerator(30, font_path, 10, 10, 30, 30)
+    cached_generator = PageGenerator(
+        30, font_path, 10, 10, 30, 30, glyph_run_cache=GlyphRunCache()
+    )
+    draw_time, draw_images = render(draw_generator, pages)
+    cached_time, cached_images = render(cached_generator, pages)
+
+    differences = [
+        np.abs(a.astype(np.int16) - b.astype(np.int16))
+        for a, b in zip(draw_images, cached_images)
+    ]
+    max_difference = max(int(d.max()) for d in differences)
+    differing = sum(int(np.count_nonzero(d)) for d in differences)
+    total = sum(d.size for d in differences)
+    print(f"pages: {page_count}")
+    print(f"ImageDraw.text:  {draw_time:.3f}s")
+    print(f"glyph run cache: {cached_time:.3f}s ({draw_time / cached_time:.2f}x)")
+    print(f"max pixel difference: {max_difference}")
+    print(f"differing values: {differing} of {total} ({differing / total:.4%})")
+    print(f"cache: {cached_generator.glyph_run_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Compares a six-stage augmentation chain run through the legacy classes with the same chain run as a Pipeline.
+
+Counts the conversions between PIL images and numpy arrays along with the time per page. Both chains
+draw their parameters from the same seed for each page, so they do the same work and give the same
+image. The random parameters, such as the kernel sizes, change the time per page more than the
+conversions do, so unseeded runs cannot be compared. The time of each stage of the pipeline shows
+where the rest of the time goes. The page is run at its own size and scaled to A4 at 300 dpi, where
+the conversions take a larger share.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_pipeline.py [page_image] [pages]
+"""
+import sys
+import time
+
+import numpy as np
+from PIL import Image
+
+from SynthImage.Augmentation import operators
+from SynthImage.Augmentation.blur_augmentation import BlurAugmentation
+from SynthImage.Augmentation.grid_distort_augmentation import GridDistortAugmentation
+from SynthImage.Augmentation.hue_saturation_augmentation import (
+    HueSaturationAugmentation,
+)
+from SynthImage.Augmentation.pipeline import Pipeline
+from SynthImage.Augmentation.solarize_augmentation import SolarizeAugmentation
+
+A4_SIZE = (2480, 3508)
+
+LEGACY_STAGES = [
+    lambda img, rng: BlurAugmentation(img, rng).apply_blur(),
+    lambda img, rng: BlurAugmentation(img, rng).apply_motion_blur(),
+    lambda img, rng: BlurAugmentation(img, rng).apply_median_blur(),
+    lambda img, rng: SolarizeAugmentation(img, rng).apply_solarize(),
+    lambda img, rng: GridDistortAugmentation(img, rng).apply_grid_distort(),
+    lambda img, rng: HueSaturationAugmentation(img, rng).apply_hue_saturation(),
+]
+
+PIPELINE = Pipeline(
+    [
+        operators.blur,
+        operators.motion_blur,
+        operators.median_blur,
+        operators.solarize,
+        operators.grid_distort,
+        operators.hue_saturation,
+    ]
+)
+
+
+class ConversionCounter:
+    """Counts PIL to numpy conversions (array interface reads) and numpy to PIL conversions (fromarray)."""
+
+    def __init__(self):
+        self.to_numpy = 0
+        self.to_pil = 0
+
+    def __enter__(self):
+        self._array_interface = Image.Image.__array_interface__
+        self._fromarray = Image.fromarray
+        counter = self
+
+        def array_interface(img):
+            counter.to_numpy += 1
+            return counter._array_interface.fget(img)
+
+        def fromarray(*args, **kwargs):
+            counter.to_pil += 1
+            return counter._fromarray(*args, **kwargs)
+
+        Image.Image.__array_interface__ = property(array_interface)
+        Image.fromarray = fromarray
+        return self
+
+    def __exit__(self, *exc_info):
+        Image.Image.__array_interface__ = self._array_interface
+        Image.fromarray = self._fromarray
+
+
+def run_legacy(img, rng):
+    for stage in LEGACY_STAGES:
+        img = stage(img, rng)
+    return img
+
+
+def run_pipeline(img, rng):
+    return PIPELINE(img, rng)
+
+
+def time_stages(page_img, page_count):
+    """Returns the mean time in ms of each stage of the pipeline, run on the page array."""
+    seconds = np.zeros(len(PIPELINE))
+    for seed in range(page_count):
+        rng = np.random.default_rng(seed)
+        image = np.array(page_img)
+        for index, stage in enumerate(PIPELINE.stages):
+            start = time.perf_counter()
+            image = stage.apply_array(image, rng)
+            seconds[index] += time.perf_counter() - start
+    return seconds / page_count * 1000
+
+
+def main():
+    page_path = (
+        sys.argv[1]
+        if len(sys.argv) > 1
+        else "tests/page_image/data/expected_page_image.png"
+    )
+    page_count = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    page_img = Image.open(page_path).convert("RGB")
+
+    for page in [page_img, page_img.resize(A4_SIZE)]:
+        print(f"{page.width}x{page.height} page")
+        legacy_np = np.array(run_legacy(page, np.random.default_rng(0)))
+        pipeline_np = np.array(run_pipeline(page, np.random.default_rng(0)))
+        assert (legacy_np == pipeline_np).all(), "the chains must give the same image"
+
+        for name, run in [("legacy", run_legacy), ("pipeline", run_pipeline)]:
+            with ConversionCounter() as counter:
+                start = time.perf_counter()
+                for seed in range(page_count):
+                    run(page, np.random.default_rng(seed))
+                elapsed = time.perf_counter() - start
+            print(
+                f"{name:>8}: {elapsed / page_count * 1000:7.1f} ms/page, "
+                f"{counter.to_numpy / page_count:.0f} PIL->numpy and "
+                f"{counter.to_pil / page_count:.0f} numpy->PIL conversions per page"
+            )
+        stage_ms = time_stages(page, page_count)
+        stages = ", ".join(
+            f"{type(stage.get_transform()).__name__} {ms:.1f}"
+            for stage, ms in zip(PIPELINE.stages, stage_ms)
+        )
+        print(f"  stages: {stages} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Compares the PIL and cv2 backends of RotateAugmentation at several page sizes.
+
+Pages are rotated as RGB and as grayscale ("L") images with every interpolation, and the time per page
+includes the conversions between PIL images and numpy arrays of the cv2 backend.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_rotation.py [angle] [repeats]
+"""
+import sys
+import time
+
+from PIL import Image, ImageDraw
+
+from SynthImage.Augmentation.rotate_augmentation import (
+    PIL_RESAMPLINGS,
+    ROTATION_BACKENDS,
+    RotateAugmentation,
+)
+
+# A5, A4 and A3 at 300 dpi
+PAGE_SIZES = [(1748, 2480), (2480, 3508), (3508, 4961)]
+
+
+def get_page(size, mode):
+    """Draws lines of text on a white page, so that the rotation resamples edges as on real pages."""
+    page = Image.new(mode, size, "white")
+    draw = ImageDraw.Draw(page)
+    for y in range(50, size[1] - 50, 40):
+        draw.text((50, y), "synthetic page " * (size[0] // 100), fill="black")
+    return page
+
+
+def time_rotation(page, angle, backend, interpolation, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        RotateAugmentation(page, angle, backend, interpolation).apply_rotate()
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    angle = float(sys.argv[1]) if len(sys.argv) > 1 else 3
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    print(f"{'size':>11} {'mode':>4} {'interpolation':>13}", end="")
+    for backend in ROTATION_BACKENDS:
+        print(f" {backend + ' ms':>8}", end="")
+    print(f" {'speedup':>8}")
+    for size in PAGE_SIZES:
+        for mode in ["RGB", "L"]:
+            page = get_page(size, mode)
+            for interpolation in PIL_RESAMPLINGS:
+                seconds = [
+                    time_rotation(page, angle, backend, interpolation, repeats)
+                    for backend in ROTATION_BACKENDS
+                ]
+                print(
+                    f"{size[0]:>5}x{size[1]:<5} {mode:>4} {interpolation:>13}", end=""
+                )
+                for backend_seconds in seconds:
+                    print(f" {backend_seconds * 1000:>8.1f}", end="")
+                print(f" {seconds[0] / seconds[1]:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
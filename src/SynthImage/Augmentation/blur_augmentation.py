@@ -1,16 +1,18 @@
-import albumentations as A
-import numpy as np
-from PIL import Image
+from SynthImage.Augmentation import operators
 
 
 class BlurAugmentation:
-    def __init__(self, original_img_obj):
+    def __init__(self, original_img_obj, rng=None):
         """Initialize the BlurAugmentation class with an image.
 
         Args:
             original_img_obj (PIL.Image.Image): The input image to be augmented.
+            rng (numpy.random.Generator or int, optional): The random generator the augmentation
+                                                           parameters are drawn from, or its seed.
+                                                           Defaults to None.
         """
         self.original_img_obj = original_img_obj
+        self.rng = rng
 
     def apply_blur(self):
         """Apply a blur effect to the image.
@@ -18,9 +20,7 @@ class BlurAugmentation:
         Returns:
             PIL.Image.Image: The blurred image.
         """
-        aug = A.Blur()
-        aug_img = aug(image=np.array(self.original_img_obj))["image"]
-        return Image.fromarray(aug_img)
+        return operators.blur(self.original_img_obj, self.rng)
 
     def apply_median_blur(self):
         """Apply a median blur effect to the image.
@@ -28,9 +28,7 @@ class BlurAugmentation:
         Returns:
             PIL.Image.Image: The median blurred image.
         """
-        aug = A.MedianBlur()
-        aug_img = aug(image=np.array(self.original_img_obj))["image"]
-        return Image.fromarray(aug_img)
+        return operators.median_blur(self.original_img_obj, self.rng)
 
     def apply_motion_blur(self):
         """Apply a motion blur effect to the image.
@@ -38,6 +36,4 @@ class BlurAugmentation:
         Returns:
             PIL.Image.Image: The motion blurred image.
         """
-        aug = A.MotionBlur()
-        aug_img = aug(image=np.array(self.original_img_obj))["image"]
-        return Image.fromarray(aug_img)
+        return operators.motion_blur(self.original_img_obj, self.rng)
@@ -1,4 +1,4 @@
-from PIL import ImageEnhance
+from SynthImage.Augmentation.photometric import Brightness, PhotometricOperator
 
 
 class BrightnessAugmentation:
@@ -17,11 +17,10 @@ class BrightnessAugmentation:
     def apply_brightness(self):
         """Apply brightness augmentation to the input image.
 
+        The result is the same as ImageEnhance.Brightness, computed with a lookup table, see
+        photometric.PhotometricOperator.
+
         Returns:
            PIL.Image.Image: The augmented image with adjusted brightness.
         """
-        aug_img = self.original_img_obj
-        aug_factor = self.factor
-        enhancer = ImageEnhance.Brightness(aug_img)
-        aug_img = enhancer.enhance(aug_factor)
-        return aug_img
+        return PhotometricOperator([Brightness(self.factor)])(self.original_img_obj)
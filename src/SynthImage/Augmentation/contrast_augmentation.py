@@ -1,4 +1,4 @@
-from PIL import ImageEnhance
+from SynthImage.Augmentation.photometric import Contrast, PhotometricOperator
 
 
 class ContrastAugmentation:
@@ -15,10 +15,10 @@ class ContrastAugmentation:
     def apply_contrast(self):
         """Apply contrast augmentation to the input image.
 
+        The result is the same as ImageEnhance.Contrast, computed with a lookup table, see
+        photometric.PhotometricOperator.
+
         Returns:
             PIL.Image.Image: The image with adjusted contrast.
         """
-        aug_img = self.original_img_obj
-        enhancer = ImageEnhance.Contrast(aug_img)
-        aug_img = enhancer.enhance(self.factor)
-        return aug_img
+        return PhotometricOperator([Contrast(self.factor)])(self.original_img_obj)
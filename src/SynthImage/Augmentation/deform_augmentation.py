@@ -1,64 +1,157 @@
 import math
+from functools import lru_cache
 
+import cv2
 import numpy as np
-from PIL import Image, ImageOps
-
-
-class WaveDeformer:
-    def __init__(self, grid, multiplier, offset) -> None:
-        self.multiplier = multiplier
-        self.offset = offset
-        self.grid = grid
-
-    def transform(self, x, y):
-        """Applies a wave transformation to the y-coordinate based on the x-coordinate.
-
-        Args:
-            x (float): The x-coordinate.
-            y (float): The y-coordinate.
-
-        Returns:
-            tuple: A tuple (x, y) with the transformed coordinates.
-        """
-        y = y + self.multiplier * math.sin(x / self.offset)
-        return x, y
-
-    def transform_rectangle(self, x0, y0, x1, y1):
-        """Transforms the coordinates of a rectangle by applying the wave transformation.
-
-        Args:
-            x0 (float): The x-coordinate of the top-left corner.
-            y0 (float): The y-coordinate of the top-left corner.
-            x1 (float): The x-coordinate of the bottom-right corner.
-            y1 (float): The y-coordinate of the bottom-right corner.
-
-        Returns:
-            tuple: A tuple containing the transformed coordinates of the rectangle.
-        """
-        return (
-            *self.transform(x0, y0),
-            *self.transform(x0, y1),
-            *self.transform(x1, y1),
-            *self.transform(x1, y0),
-        )
-
-    def getmesh(self, img):
-        """Generates a mesh for the image by applying the wave transformation.
-
-        Args:
-            img (PIL.Image.Image): The image for which to generate the mesh.
-
-        Returns:
-            list:A list of tuples where each tuple contains the target and source coordinates for the mesh.
-        """
-        self.w, self.h = img.size
-        gridspace = self.grid
-        target_grid = []
-        for x in range(0, self.w, gridspace):
-            for y in range(0, self.h, gridspace):
-                target_grid.append((x, y, x + gridspace, y + gridspace))
-        source_grid = [self.transform_rectangle(*rect) for rect in target_grid]
-        return [t for t in zip(target_grid, source_grid)]
+from PIL import Image
+
+import SynthImage.config as config
+from SynthImage.Augmentation.geometry import discard_transform
+from SynthImage.Augmentation.utils import image_to_array
+
+
+def get_column_shifts(width, grid, multiplier, offset):
+    """Computes the vertical shift of every column of the wave deformation.
+
+    The shifts reproduce the mesh ImageOps.deform samples: the edges of the grid cells are shifted by
+    multiplier * sin(x / offset) and within each cell the shift is interpolated linearly between the
+    shifts of its left and right edges, taken at the pixel centers.
+
+    Args:
+        width (int): The width of the image.
+        grid (int): The size of the grid for the deformation.
+        multiplier (float): The multiplier for the wave amplitude.
+        offset (float): The offset for the wave frequency.
+
+    Returns:
+        numpy.ndarray: The shift of each column.
+    """
+    x = np.arange(width, dtype=float)
+    cell_x = x // grid * grid
+    shift_left = multiplier * np.sin(cell_x / offset)
+    shift_right = multiplier * np.sin((cell_x + grid) / offset)
+    return shift_left + (shift_right - shift_left) / grid * (x - cell_x + 0.5)
+
+
+def get_margin(multiplier):
+    """Returns the number of rows above and below a row that its deformed pixels are read from."""
+    # The shift is at most the amplitude, and linear interpolation reads one more row
+    return math.ceil(abs(multiplier)) + 2
+
+
+def compute_deform_maps(width, rows, height, grid, multiplier, offset):
+    """Computes the remap maps of the wave deformation for a range of rows.
+
+    Pixels whose source lies outside the image are filled with black.
+
+    Args:
+        width (int): The width of the image.
+        rows (range): The output rows the maps are computed for.
+        height (float): The height of the image, math.inf for rows whose source is always inside it.
+        grid (int): The size of the grid for the deformation.
+        multiplier (float): The multiplier for the wave amplitude.
+        offset (float): The offset for the wave frequency.
+
+    Returns:
+        tuple: The fixed-point maps for cv2.remap, as returned by cv2.convertMaps.
+    """
+    shift = get_column_shifts(width, grid, multiplier, offset)
+    source_y = np.arange(rows.start, rows.stop, dtype=float)[:, None] + shift[None, :]
+    outside = (source_y < -0.5) | (source_y >= height - 0.5)
+    # Rows just past the edges repeat the edge row, the rest are sent far outside to be filled
+    map_y = np.clip(source_y, 0, height - 1).astype(np.float32)
+    map_y[outside] = -2
+    map_x = np.broadcast_to(np.arange(width, dtype=np.float32), map_y.shape)
+    return cv2.convertMaps(map_x, map_y, cv2.CV_16SC2)
+
+
+@lru_cache(maxsize=config.DEFORM_MAP_CACHE_SIZE)
+def get_strip_maps(map_width, grid, multiplier, offset):
+    """Computes the remap maps of a strip of config.DEFORM_STRIP_HEIGHT rows inside the image.
+
+    Away from the top and bottom edges, the deformation of a row only depends on the rows around it.
+    The maps read the strip from an image slice that starts get_margin(multiplier) rows above it, so
+    the same maps deform every strip of every page of up to map_width columns.
+
+    Args:
+        map_width (int): The width of the maps.
+        grid (int): The size of the grid for the deformation.
+        multiplier (float): The multiplier for the wave amplitude.
+        offset (float): The offset for the wave frequency.
+
+    Returns:
+        tuple: The fixed-point maps for cv2.remap.
+    """
+    margin = get_margin(multiplier)
+    rows = range(margin, margin + config.DEFORM_STRIP_HEIGHT)
+    return compute_deform_maps(map_width, rows, math.inf, grid, multiplier, offset)
+
+
+def get_deform_maps(width, grid, multiplier, offset):
+    """Returns the cached strip maps of the wave deformation for images of a width.
+
+    The maps are shared by the widths that round up to the same multiple of config.DEFORM_MAP_WIDTH_STEP
+    and by images of any height, see get_strip_maps.
+
+    Args:
+        width (int): The width of the image.
+        grid (int): The size of the grid for the deformation.
+        multiplier (float): The multiplier for the wave amplitude.
+        offset (float): The offset for the wave frequency.
+
+    Returns:
+        tuple: The fixed-point maps for cv2.remap, at least width columns wide.
+    """
+    step = config.DEFORM_MAP_WIDTH_STEP
+    return get_strip_maps(-(-width // step) * step, grid, multiplier, offset)
+
+
+def remap_rows(image, maps, source_top):
+    """Remaps rows of an image from the image rows starting at source_top."""
+    map1, map2 = maps
+    return cv2.remap(
+        image[source_top:],
+        map1,
+        map2,
+        cv2.INTER_LINEAR,
+        borderMode=cv2.BORDER_CONSTANT,
+        borderValue=0,
+    )
+
+
+def deform_array(image, grid, multiplier, offset):
+    """Applies the wave deformation to an image array.
+
+    The rows inside the image are remapped strip by strip with the cached maps of get_deform_maps, the
+    rows along the top and bottom edges, whose pixels can come from outside the image, with maps
+    computed for them.
+
+    Args:
+        image (numpy.ndarray): A uint8 array of shape (height, width) or (height, width, channels).
+        grid (int): The size of the grid for the deformation.
+        multiplier (float): The multiplier for the wave amplitude.
+        offset (float): The offset for the wave frequency.
+
+    Returns:
+        numpy.ndarray: The deformed array.
+    """
+    height, width = image.shape[:2]
+    margin = get_margin(multiplier)
+    inner_rows = range(margin, max(height - margin, margin))
+    edge_rows = [range(0, min(margin, height)), range(inner_rows.stop, height)]
+    deformed = np.empty_like(image)
+    for rows in edge_rows:
+        if len(rows) > 0:
+            maps = compute_deform_maps(width, rows, height, grid, multiplier, offset)
+            edge = slice(rows.start, rows.stop)
+            deformed[edge] = remap_rows(image, maps, 0)
+
+    map1, map2 = get_deform_maps(width, grid, multiplier, offset)
+    for top in range(inner_rows.start, inner_rows.stop, config.DEFORM_STRIP_HEIGHT):
+        bottom = min(top + config.DEFORM_STRIP_HEIGHT, inner_rows.stop)
+        maps = (map1[: bottom - top, :width], map2[: bottom - top, :width])
+        deformed[top:bottom] = remap_rows(image, maps, top - margin)
+    return deformed
 
 
 class DeformAugmentation:
@@ -81,15 +174,13 @@ class DeformAugmentation:
     def apply_deform(self):
         """Applies a wave-like deformation to the given image.
 
+        The deformation is not affine, so no geometric transform is recorded on the result.
+
         Returns:
             PIL.Image.Image: The deformed image as a PIL Image.
         """
-        aug_img = self.original_img_obj
-        page_img_np = np.array(aug_img)
-        deformer = WaveDeformer(
-            grid=self.grid, multiplier=self.multiplier, offset=self.offset
+        page_img_np = image_to_array(self.original_img_obj)
+        deformed_page_img = deform_array(
+            page_img_np, self.grid, self.multiplier, self.offset
         )
-        pil_image = Image.fromarray(page_img_np)
-        deformed_img = ImageOps.deform(pil_image, deformer)
-        deformed_page_img = np.array(deformed_img)
-        return Image.fromarray(deformed_page_img)
+        return discard_transform(Image.fromarray(deformed_page_img))
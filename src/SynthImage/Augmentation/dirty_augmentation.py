@@ -1,11 +1,33 @@
-import random
+from functools import lru_cache
 
 import numpy as np
 from PIL import Image, ImageDraw
 
+from SynthImage.Augmentation.geometry import keep_transform
+from SynthImage.Augmentation.utils import get_rng, image_to_array
+
+
+@lru_cache(maxsize=1024)
+def get_spot_mask(ellipse_width, ellipse_height):
+    """Draws the mask of an elliptical dirty spot, once per spot size.
+
+    Args:
+        ellipse_width (int): The width of the spot.
+        ellipse_height (int): The height of the spot.
+
+    Returns:
+        numpy.ndarray: The read-only boolean mask of shape (ellipse_height, ellipse_width).
+    """
+    dirty_spot = Image.new("L", (ellipse_width, ellipse_height), 0)
+    draw = ImageDraw.Draw(dirty_spot)
+    draw.ellipse((0, 0, ellipse_width, ellipse_height), fill=255)
+    dirty_spot_np = np.array(dirty_spot) > 0
+    dirty_spot_np.flags.writeable = False
+    return dirty_spot_np
+
 
 class DirtySpotAugmentation:
-    def __init__(self, original_img_obj, dirty_spots):
+    def __init__(self, original_img_obj, dirty_spots, rng=None):
         """Initialize the DirtySpotAugmentation object.
 
         Args:
@@ -13,9 +35,13 @@ class DirtySpotAugmentation:
             dirty_spots (list of tuples, optional): List of tuples specifying dirty spots.
                                                     Each tuple should contain (x, y, size).
                                                     Defaults to None.
+            rng (numpy.random.Generator or int, optional): The random generator the spot sizes are drawn
+                                                           from, or its seed. Defaults to None, see
+                                                           utils.get_rng.
         """
         self.original_img_obj = original_img_obj
         self.dirty_spots = dirty_spots
+        self.rng = rng
 
     def apply_dirty(self):
         """Apply dirty spot augmentation to the input image.
@@ -23,9 +49,12 @@ class DirtySpotAugmentation:
         Returns:
             PIL.Image.Image: The augmented image with dirty spots.
         """
-        img_np = np.array(self.original_img_obj)
-        height, width, _ = img_np.shape
+        img_np = image_to_array(self.original_img_obj)
+        height, width = img_np.shape[:2]
+        rng = get_rng(self.rng)
 
+        # All spots are drawn into one mask, each only within its own region
+        mask = np.zeros((height, width), dtype=bool)
         for spot in self.dirty_spots:
             x, y, size = spot
             # Ensure the spot's position and size are within the image bounds
@@ -33,16 +62,9 @@ class DirtySpotAugmentation:
             y = min(max(y, 0), height - 1)
             size = min(max(size, 1), min(height, width))
 
-            ellipse_width = random.randint(size // 2, size)
-            ellipse_height = random.randint(size // 2, size)
-
-            # Create an image with the dirty spot
-            dirty_spot = Image.new("L", (ellipse_width, ellipse_height), 0)
-            draw = ImageDraw.Draw(dirty_spot)
-            draw.ellipse((0, 0, ellipse_width, ellipse_height), fill=255)
-
-            # Convert to numpy array
-            dirty_spot_np = np.array(dirty_spot)
+            ellipse_width = int(rng.integers(size // 2, size, endpoint=True))
+            ellipse_height = int(rng.integers(size // 2, size, endpoint=True))
+            dirty_spot_np = get_spot_mask(ellipse_width, ellipse_height)
 
             # Define region of interest in the original image
             x1 = max(0, x - ellipse_width // 2)
@@ -56,21 +78,10 @@ class DirtySpotAugmentation:
             spot_x2 = spot_x1 + (x2 - x1)
             spot_y2 = spot_y1 + (y2 - y1)
 
-            # Create a mask for the dirty spot
-            mask = np.zeros((height, width), dtype=np.uint8)
             if (y2 - y1) > 0 and (x2 - x1) > 0:
-                dirty_spot_region = dirty_spot_np[spot_y1:spot_y2, spot_x1:spot_x2]
-                mask[y1:y2, x1:x2] = dirty_spot_region
-
-            # Apply the dirty spot to the image
-            img_np[:, :, 0] = np.where(
-                mask > 0, 0, img_np[:, :, 0]
-            )  # Apply dirty spot to Red channel
-            img_np[:, :, 1] = np.where(
-                mask > 0, 0, img_np[:, :, 1]
-            )  # Apply dirty spot to Green channel
-            img_np[:, :, 2] = np.where(
-                mask > 0, 0, img_np[:, :, 2]
-            )  # Apply dirty spot to Blue channel
-
-        return Image.fromarray(img_np)
+                mask[y1:y2, x1:x2] |= dirty_spot_np[spot_y1:spot_y2, spot_x1:spot_x2]
+
+        # Apply the dirty spots to every channel of the image in one pass
+        img_np[mask] = 0
+
+        return keep_transform(self.original_img_obj, Image.fromarray(img_np))
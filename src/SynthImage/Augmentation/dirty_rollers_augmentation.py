@@ -1,16 +1,18 @@
-import numpy as np
-from augraphy.augmentations import DirtyRollers
-from PIL import Image
+from SynthImage.Augmentation import operators
 
 
 class DirtyRollersAugmentation:
-    def __init__(self, original_img_obj):
+    def __init__(self, original_img_obj, rng=None):
         """Initialize the DirtyRollersAugmentation class with an image.
 
         Args:
             original_img_obj (PIL.Image.Image): The input image to be augmented.
+            rng (numpy.random.Generator or int, optional): The random generator the augmentation
+                                                           parameters are drawn from, or its seed.
+                                                           Defaults to None.
         """
         self.original_img_obj = original_img_obj
+        self.rng = rng
 
     def apply_dirty_rollers(self):
         """Apply a dirty rollers effect to the image.
@@ -18,10 +20,4 @@ class DirtyRollersAugmentation:
         Returns:
             PIL.Image.Image: The dirty rollers image.
         """
-        aug = DirtyRollers()
-        image_array = np.array(self.original_img_obj)
-
-        # Apply augmentation
-        aug_img = aug(image=image_array)
-
-        return Image.fromarray(aug_img)
+        return operators.dirty_rollers(self.original_img_obj, self.rng)
@@ -4,6 +4,9 @@ import cv2
 import numpy as np
 from PIL import Image
 
+from SynthImage.Augmentation.geometry import keep_transform
+from SynthImage.Augmentation.utils import image_to_array
+
 
 class DistortionMode(Enum):
     """A simple selection for the mode used for font contour distortion"""
@@ -26,7 +29,7 @@ class DistortAugmentation:
         """Initializes the DistortAugmentation class with the given parameters.
 
         Args:
-            original_img_obj (PIL.Image.Image): The input image to be distorted.
+            original_img_obj (PIL.Image.Image or numpy.ndarray): The input image to be distorted.
             mode (DistortionMode, optional): The distortion mode, either additive or subtractive. Defaults to DistortionMode.additive.
             edge_tresh1 (int, optional): The first threshold for the hysteresis procedure in the Canny edge detection. Defaults to 100.
             edge_tresh2 (int, optional): The second threshold for the hysteresis procedure in the Canny edge detection. Defaults to 200.
@@ -42,25 +45,37 @@ class DistortAugmentation:
         self.kernel_height = kernel_height
         self.kernel_iterations = kernel_iterations
 
-    def apply_distort(self):
-        """Applies a distortion effect to the given image using edge detection and morphological transformations.
+    def distort_array(self, page_img_np):
+        """Applies the distortion to an image array in place.
+
+        The edges are detected, eroded and dilated as a single-channel map, whatever the number of
+        channels of the image, and the image is then updated through a boolean mask.
+
+        Args:
+            page_img_np (numpy.ndarray): A uint8 array of shape (height, width) or (height, width, 3).
 
         Returns:
-            PIL.Image.Image: The distorted image as a PIL Image.
+            numpy.ndarray: The distorted array, the input array itself.
         """
-        if type(self.original_img_obj) is not np.array:
-            page_img_np = np.array(self.original_img_obj)
         edges = cv2.Canny(page_img_np, self.edge_tresh1, self.edge_tresh2)
-        if edges is None:
-            return page_img_np
-        edges = cv2.cvtColor(edges, cv2.COLOR_GRAY2RGB)
         kernel = np.ones((self.kernel_width, self.kernel_height), np.uint8)
         edges = cv2.erode(edges, kernel, iterations=self.kernel_iterations)
         edges = cv2.dilate(edges, kernel, iterations=self.kernel_iterations)
-        indices = np.where(edges[:, :] == 255)
-        cv_image_added = page_img_np.copy()
         if self.mode == DistortionMode.additive:
-            cv_image_added[indices[0], indices[1], :] = [0]
+            page_img_np[edges == 255] = 0
         else:
-            cv_image_added[indices[0], indices[1], :] = [255]
-        return Image.fromarray(cv_image_added)
+            page_img_np[edges == 255] = 255
+        return page_img_np
+
+    def apply_distort(self):
+        """Applies a distortion effect to the given image using edge detection and morphological transformations.
+
+        Returns:
+            PIL.Image.Image or numpy.ndarray: The distorted image, as a numpy array when the input image is
+            one. The input image is left unchanged.
+        """  # noqa
+        if isinstance(self.original_img_obj, np.ndarray):
+            return self.distort_array(self.original_img_obj.copy())
+        page_img_np = image_to_array(self.original_img_obj)
+        distorted_img = Image.fromarray(self.distort_array(page_img_np))
+        return keep_transform(self.original_img_obj, distorted_img)
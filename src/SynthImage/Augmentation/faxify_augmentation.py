@@ -1,16 +1,18 @@
-import numpy as np
-from augraphy.augmentations import Faxify
-from PIL import Image
+from SynthImage.Augmentation import operators
 
 
 class FaxifyAugmentation:
-    def __init__(self, original_img_obj):
+    def __init__(self, original_img_obj, rng=None):
         """Initialize the FaxifyAugmentation class with an image.
 
         Args:
             original_img_obj (PIL.Image.Image): The input image to be augmented.
+            rng (numpy.random.Generator or int, optional): The random generator the augmentation
+                                                           parameters are drawn from, or its seed.
+                                                           Defaults to None.
         """
         self.original_img_obj = original_img_obj
+        self.rng = rng
 
     def apply_faxify(self):
         """Apply the faxify effect to the image.
@@ -18,10 +20,4 @@ class FaxifyAugmentation:
         Returns:
             PIL.Image.Image: The faxified image.
         """
-        aug = Faxify()
-        image_array = np.array(self.original_img_obj)
-
-        # Apply augmentation
-        aug_img = aug(image=image_array)
-
-        return Image.fromarray(aug_img)
+        return operators.faxify(self.original_img_obj, self.rng)
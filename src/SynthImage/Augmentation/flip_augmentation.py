@@ -1,33 +1,35 @@
-import albumentations as A
-import numpy as np
-from PIL import Image
+from SynthImage.Augmentation import operators
 
 
 class FlipAugmentation:
-    def __init__(self, original_img_obj):
+    def __init__(self, original_img_obj, rng=None):
         """Initialize the FlipAugmentation class with an image.
 
         Args:
             original_img_obj (PIL.Image.Image): The input image to be augmented.
+            rng (numpy.random.Generator or int, optional): The random generator the augmentation
+                                                           parameters are drawn from, or its seed.
+                                                           Defaults to None.
         """
         self.original_img_obj = original_img_obj
+        self.rng = rng
 
     def apply_vertical_flip(self):
         """Apply vertical flip to the image.
 
+        The geometric transform is recorded on the result, see geometry.record_transform.
+
         Returns:
             PIL.Image.Image: The vertical flip applied image.
         """
-        aug = A.VerticalFlip()
-        aug_img = aug(image=np.array(self.original_img_obj))["image"]
-        return Image.fromarray(aug_img)
+        return operators.vertical_flip(self.original_img_obj, self.rng)
 
     def apply_horizontal_flip(self):
         """Apply horizontal flip to the image.
 
+        The geometric transform is recorded on the result, see geometry.record_transform.
+
         Returns:
             PIL.Image.Image: The horizontal flip applied image.
         """
-        aug = A.HorizontalFlip()
-        aug_img = aug(image=np.array(self.original_img_obj))["image"]
-        return Image.fromarray(aug_img)
+        return operators.horizontal_flip(self.original_img_obj, self.rng)
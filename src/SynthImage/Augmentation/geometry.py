@@ -0,0 +1,253 @@
+import math
+
+import albumentations as A
+import cv2
+import numpy as np
+
+TRANSFORM_KEY = "transform"
+
+WARP_INTERPOLATIONS = {
+    "nearest": cv2.INTER_NEAREST,
+    "bilinear": cv2.INTER_LINEAR,
+    "bicubic": cv2.INTER_CUBIC,
+}
+
+
+def translation_matrix(dx, dy):
+    """Return the 3x3 matrix that moves points by (dx, dy).
+
+    Args:
+        dx (float): The horizontal shift.
+        dy (float): The vertical shift.
+
+    Returns:
+        numpy.ndarray: The translation matrix.
+    """
+    return np.array([[1.0, 0.0, dx], [0.0, 1.0, dy], [0.0, 0.0, 1.0]])
+
+
+def rotation_matrix(size, angle, expand=True):
+    """Return the matrix of a rotation done with PIL's Image.rotate around the image center.
+
+    Matrices in this module map pixel coordinates of the input image to pixel coordinates of the output
+    image, with the center of the top-left pixel at (0, 0), as in OpenCV.
+
+    Args:
+        size (tuple): The (width, height) of the image.
+        angle (float): The counter clockwise rotation angle in degrees.
+        expand (bool, optional): Whether the output image is enlarged to hold the whole rotated image.
+                                 Defaults to True.
+
+    Returns:
+        tuple: The 3x3 rotation matrix and the (width, height) of the rotated image.
+    """
+    width, height = size
+    # The same inverse matrix, from output to input coordinates, as Image.rotate computes, with the
+    # center of the top-left pixel at (0.5, 0.5)
+    radians = -math.radians(angle)
+    cos, sin = round(math.cos(radians), 15), round(math.sin(radians), 15)
+    center_x, center_y = width / 2, height / 2
+    inverse = np.array(
+        [
+            [cos, sin, center_x - cos * center_x - sin * center_y],
+            [-sin, cos, center_y + sin * center_x - cos * center_y],
+            [0.0, 0.0, 1.0],
+        ]
+    )
+    output_size = (width, height)
+    if expand:
+        corners = transform_points(
+            inverse, [(0, 0), (width, 0), (width, height), (0, height)]
+        )
+        output_size = (
+            math.ceil(corners[:, 0].max()) - math.floor(corners[:, 0].min()),
+            math.ceil(corners[:, 1].max()) - math.floor(corners[:, 1].min()),
+        )
+        shift = translation_matrix(
+            -(output_size[0] - width) / 2, -(output_size[1] - height) / 2
+        )
+        inverse = inverse @ shift
+    inverse = translation_matrix(-0.5, -0.5) @ inverse @ translation_matrix(0.5, 0.5)
+    return np.linalg.inv(inverse), output_size
+
+
+def rotate_array(image, angle, interpolation="nearest", fill=255):
+    """Rotate an image array around its center, enlarged to hold the whole rotated image.
+
+    The output canvas is computed once from rotation_matrix and the image is resampled by a single
+    cv2.warpAffine, on one channel for grayscale arrays. The values are resampled as gray levels or
+    colors, so palette images must be converted to colors first.
+
+    Args:
+        image (numpy.ndarray): A uint8 array of shape (height, width) or (height, width, channels).
+        angle (float): The counter clockwise rotation angle in degrees.
+        interpolation (str, optional): One of WARP_INTERPOLATIONS. Defaults to "nearest".
+        fill (int, optional): The gray level of the area outside the input image. Defaults to 255.
+
+    Returns:
+        tuple: The rotated uint8 array and the 3x3 matrix that maps the input image to it.
+    """
+    if interpolation not in WARP_INTERPOLATIONS:
+        raise ValueError(
+            f"interpolation must be one of {tuple(WARP_INTERPOLATIONS)}, got {interpolation!r}"
+        )
+    height, width = image.shape[:2]
+    matrix, output_size = rotation_matrix((width, height), angle)
+    aug_img = cv2.warpAffine(
+        image,
+        matrix[:2],
+        output_size,
+        flags=WARP_INTERPOLATIONS[interpolation],
+        borderMode=cv2.BORDER_CONSTANT,
+        borderValue=(fill,) * 4,
+    )
+    return aug_img, matrix
+
+
+def homography_from_points(src_points, dst_points):
+    """Return the homography that maps four source points onto four destination points.
+
+    Args:
+        src_points (array-like): The four (x, y) source points.
+        dst_points (array-like): The four (x, y) destination points.
+
+    Returns:
+        numpy.ndarray: The 3x3 homography matrix.
+    """
+    return cv2.getPerspectiveTransform(
+        np.asarray(src_points, dtype=np.float32),
+        np.asarray(dst_points, dtype=np.float32),
+    ).astype(float)
+
+
+def transform_points(matrix, points):
+    """Map points through a 3x3 affine or homography matrix.
+
+    Args:
+        matrix (numpy.ndarray): The 3x3 matrix.
+        points (array-like): The (x, y) points, of shape (n, 2).
+
+    Returns:
+        numpy.ndarray: The mapped points, of shape (n, 2).
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    mapped = np.hstack([points, np.ones((len(points), 1))]) @ matrix.T
+    return mapped[:, :2] / mapped[:, 2:]
+
+
+def get_transform(img):
+    """Return the geometric transform recorded on an augmented image.
+
+    Args:
+        img (PIL.Image.Image): The image.
+
+    Returns:
+        numpy.ndarray: The 3x3 matrix that maps pixel coordinates of the original page to the image,
+        the identity when no transform was recorded.
+    """
+    transform = img.info.get(TRANSFORM_KEY)
+    if transform is None:
+        return np.eye(3)
+    return transform
+
+
+def record_transform(original_img, aug_img, matrix):
+    """Record the geometric transform of an augmentation on its result.
+
+    The matrix is composed with any transform already recorded on the input image, so the recorded
+    transform always maps the original page to the augmented image.
+
+    Args:
+        original_img (PIL.Image.Image): The input of the augmentation.
+        aug_img (PIL.Image.Image): The result of the augmentation, which is updated in place.
+        matrix (numpy.ndarray): The 3x3 matrix that maps the input image to the result.
+
+    Returns:
+        PIL.Image.Image: The augmented image.
+    """
+    aug_img.info[TRANSFORM_KEY] = matrix @ get_transform(original_img)
+    return aug_img
+
+
+def keep_transform(original_img, aug_img):
+    """Carry the transform recorded on the input of a non-geometric augmentation over to its result.
+
+    Non-geometric augmentations leave the page where it is, so their result maps to the original page
+    with the same transform as their input. Nothing is recorded when the input has no transform.
+
+    Args:
+        original_img (PIL.Image.Image): The input of the augmentation.
+        aug_img (PIL.Image.Image): The result of the augmentation, which is updated in place.
+
+    Returns:
+        PIL.Image.Image: The augmented image.
+    """
+    transform = original_img.info.get(TRANSFORM_KEY)
+    if transform is not None:
+        aug_img.info[TRANSFORM_KEY] = transform
+    return aug_img
+
+
+def discard_transform(aug_img):
+    """Remove the recorded transform from the result of a non-affine warp.
+
+    Local warps such as the wave deformation or a grid distortion move each part of the page
+    differently, so no matrix maps the original page to their result. Line extraction then falls back
+    to locating the lines without a transform.
+
+    Args:
+        aug_img (PIL.Image.Image): The result of the warp, which is updated in place.
+
+    Returns:
+        PIL.Image.Image: The augmented image.
+    """
+    aug_img.info.pop(TRANSFORM_KEY, None)
+    return aug_img
+
+
+def keypoint_compose(aug):
+    """Wrap an albumentations transform so that it also maps keypoints given in pixel coordinates.
+
+    Args:
+        aug (albumentations.BasicTransform): The geometric augmentation.
+
+    Returns:
+        albumentations.Compose: The wrapped augmentation.
+    """
+    return A.Compose(
+        [aug], keypoint_params=A.KeypointParams(format="xy", remove_invisible=False)
+    )
+
+
+def apply_keypoint_compose(compose, image):
+    """Apply an augmentation wrapped by keypoint_compose and recover its geometric transform.
+
+    The image corners are sent through the augmentation as keypoints, and the homography between the
+    corners before and after gives the transform, also for randomly parametrized augmentations.
+
+    Args:
+        compose (albumentations.Compose): The wrapped geometric augmentation.
+        image (numpy.ndarray): The image to augment.
+
+    Returns:
+        tuple: The augmented image and the 3x3 matrix that maps the input image to it.
+    """
+    height, width = image.shape[:2]
+    corners = [(0, 0), (width - 1, 0), (width - 1, height - 1), (0, height - 1)]
+    result = compose(image=image, keypoints=corners)
+    if width < 2 or height < 2:
+        return result["image"], np.eye(3)
+    return result["image"], homography_from_points(corners, result["keypoints"])
+
+
+def apply_with_transform(aug, image):
+    """Apply an albumentations transform to an image and recover its geometric transform.
+
+    Args:
+        aug (albumentations.BasicTransform): The geometric augmentation.
+        image (numpy.ndarray): The image to augment.
+
+    Returns:
+        tuple: The augmented image and the 3x3 matrix that maps the input image to it.
+    """
+    return apply_keypoint_compose(keypoint_compose(aug), image)
@@ -1,16 +1,18 @@
-import albumentations as A
-import numpy as np
-from PIL import Image
+from SynthImage.Augmentation import operators
 
 
 class GridDistortAugmentation:
-    def __init__(self, original_img_obj):
+    def __init__(self, original_img_obj, rng=None):
         """Initialize the GridDistortAugmentation class with an image.
 
         Args:
             original_img_obj (PIL.Image.Image): The input image to be augmented.
+            rng (numpy.random.Generator or int, optional): The random generator the augmentation
+                                                           parameters are drawn from, or its seed.
+                                                           Defaults to None.
         """
         self.original_img_obj = original_img_obj
+        self.rng = rng
 
     def apply_grid_distort(self):
         """Apply grid distortion to the image.
@@ -18,6 +20,4 @@ class GridDistortAugmentation:
         Returns:
             PIL.Image.Image: The grid distorted image.
         """
-        aug = A.GridDistortion()
-        aug_img = aug(image=np.array(self.original_img_obj))["image"]
-        return Image.fromarray(aug_img)
+        return operators.grid_distort(self.original_img_obj, self.rng)
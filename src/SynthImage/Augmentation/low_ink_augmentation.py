@@ -1,16 +1,18 @@
-import numpy as np
-from augraphy.augmentations import LowInkPeriodicLines
-from PIL import Image
+from SynthImage.Augmentation import operators
 
 
 class LowInkPeriodicLinesAugmentation:
-    def __init__(self, original_img_obj):
+    def __init__(self, original_img_obj, rng=None):
         """Initialize the LowInkPeriodicLinesAugmentation class with an image.
 
         Args:
             original_img_obj (PIL.Image.Image): The input image to be augmented.
+            rng (numpy.random.Generator or int, optional): The random generator the augmentation
+                                                           parameters are drawn from, or its seed.
+                                                           Defaults to None.
         """
         self.original_img_obj = original_img_obj
+        self.rng = rng
 
     def apply_low_ink_periodic_lines(self):
         """Apply a low ink periodic lines effect to the image.
@@ -18,10 +20,4 @@ class LowInkPeriodicLinesAugmentation:
         Returns:
             PIL.Image.Image: The low ink periodic lines image.
         """
-        aug = LowInkPeriodicLines()
-        image_array = np.array(self.original_img_obj)
-
-        # Apply augmentation
-        aug_img = aug(image=image_array)
-
-        return Image.fromarray(aug_img)
+        return operators.low_ink_periodic_lines(self.original_img_obj, self.rng)
@@ -0,0 +1,291 @@
+import threading
+from abc import ABC, abstractmethod
+from functools import lru_cache, partial
+
+import albumentations as A
+import numpy as np
+from augraphy.augmentations import (
+    BadPhotoCopy,
+    DirtyRollers,
+    Faxify,
+    InkBleed,
+    LowInkPeriodicLines,
+    Scribbles,
+    WaterMark,
+)
+from PIL import Image
+
+import SynthImage.config as config
+from SynthImage.Augmentation.geometry import (
+    apply_keypoint_compose,
+    discard_transform,
+    keep_transform,
+    keypoint_compose,
+    record_transform,
+)
+from SynthImage.Augmentation.utils import (
+    draw_seed,
+    image_to_array,
+    seeded_global_random,
+)
+
+
+class Operator(ABC):
+    def __init__(self, factory, rgb=False):
+        """Initialize the Operator object.
+
+        An operator holds an augmentation configuration and can be called on any number of images,
+        op(img, rng). The library transform is built by the factory once per thread and then reused, so
+        an operator can be shared between threads. Operators are picklable when the factory is, e.g. a
+        class or a functools.partial of one.
+
+        Args:
+            factory (callable): Builds the library transform, called without arguments.
+            rgb (bool, optional): Convert the images to RGB first, for transforms that only work on color
+                                  images. Defaults to False.
+        """
+        self.factory = factory
+        self.rgb = rgb
+        self._local = threading.local()
+
+    def get_transform(self):
+        """Return the library transform of the calling thread, building it on first use.
+
+        Returns:
+            The albumentations or augraphy transform.
+        """
+        transform = getattr(self._local, "transform", None)
+        if transform is None:
+            transform = self.factory()
+            self._local.transform = transform
+        return transform
+
+    @abstractmethod
+    def apply_array(self, image, rng=None):
+        """Augment an image array.
+
+        Args:
+            image (numpy.ndarray): A uint8 array of shape (height, width) or (height, width, channels).
+            rng (numpy.random.Generator or int, optional): The random generator the augmentation
+                                                           parameters are drawn from, or its seed.
+                                                           Defaults to None, the transform's own random
+                                                           state.
+
+        Returns:
+            numpy.ndarray: The augmented uint8 array.
+        """
+
+    def __call__(self, img, rng=None):
+        """Augment an image.
+
+        Args:
+            img (PIL.Image.Image): The input image.
+            rng (numpy.random.Generator or int, optional): The random generator the augmentation
+                                                           parameters are drawn from, or its seed.
+                                                           Defaults to None.
+
+        Returns:
+            PIL.Image.Image: The augmented image, with the geometric transform of the input image.
+        """
+        aug_img = Image.fromarray(
+            self.apply_array(image_to_array(img, rgb=self.rgb), rng)
+        )
+        return keep_transform(img, aug_img)
+
+    def __getstate__(self):
+        # Transforms are per thread, each process builds its own
+        return {"factory": self.factory, "rgb": self.rgb}
+
+    def __setstate__(self, state):
+        self.__init__(state["factory"], state["rgb"])
+
+
+class AlbumentationsOperator(Operator):
+    def apply_array(self, image, rng=None):
+        transform = self.get_transform()
+        if rng is not None:
+            transform.set_random_seed(draw_seed(rng))
+        return transform(image=image)["image"]
+
+
+class WarpOperator(AlbumentationsOperator):
+    # Local warps move each part of the page differently, no matrix maps the page to their result
+    warps = True
+
+    def __call__(self, img, rng=None):
+        aug_img = Image.fromarray(
+            self.apply_array(image_to_array(img, rgb=self.rgb), rng)
+        )
+        return discard_transform(aug_img)
+
+
+class AugraphyOperator(Operator):
+    def apply_array(self, image, rng=None):
+        transform = self.get_transform()
+        with seeded_global_random(rng):
+            aug_img = transform(image=image)
+        if aug_img.dtype != np.uint8:
+            aug_img = np.clip(aug_img, 0, 255).astype(np.uint8)
+        return aug_img
+
+
+class GeometricOperator(AlbumentationsOperator):
+    def apply_array(self, image, rng=None):
+        aug_img, _ = self.apply_array_with_transform(image, rng)
+        return aug_img
+
+    def apply_array_with_transform(self, image, rng=None):
+        """Augment an image array and return the geometric transform of the augmentation.
+
+        Args:
+            image (numpy.ndarray): A uint8 array of shape (height, width) or (height, width, channels).
+            rng (numpy.random.Generator or int, optional): The random generator the augmentation
+                                                           parameters are drawn from, or its seed.
+                                                           Defaults to None.
+
+        Returns:
+            tuple: The augmented uint8 array and the 3x3 matrix that maps the input to it.
+        """
+        transform = self.get_transform()
+        if rng is not None:
+            transform.set_random_seed(draw_seed(rng))
+        return apply_keypoint_compose(transform, image)
+
+    def get_transform(self):
+        transform = getattr(self._local, "transform", None)
+        if transform is None:
+            # The image corners go through the transform as keypoints to recover its matrix
+            transform = keypoint_compose(self.factory())
+            self._local.transform = transform
+        return transform
+
+    def __call__(self, img, rng=None):
+        aug_img, matrix = self.apply_array_with_transform(
+            image_to_array(img, rgb=self.rgb), rng
+        )
+        return record_transform(img, Image.fromarray(aug_img), matrix)
+
+
+def build_rusting_transform(
+    gauss_noise_var_limit,
+    ison_noise_color_shift,
+    ison_noise_intensity,
+    multiplicative_noise_multiplier,
+    random_fog_coef_range,
+    random_fog_alpha_coef,
+    hue_shift_limit,
+    sat_shift_limit,
+    val_shift_limit,
+    brightness_limit,
+    contrast_limit,
+):
+    """Builds the transforms that simulate rust, see RustingAugmentation for the parameters."""
+    return A.Compose(
+        [
+            A.OneOf(
+                [
+                    A.GaussNoise(
+                        var_limit=gauss_noise_var_limit, p=0.5
+                    ),  # Add noise to simulate rust particles
+                    A.ISONoise(
+                        color_shift=ison_noise_color_shift,
+                        intensity=ison_noise_intensity,
+                        p=0.5,
+                    ),
+                ],
+                p=0.5,
+            ),
+            A.OneOf(
+                [
+                    A.MultiplicativeNoise(
+                        multiplier=multiplicative_noise_multiplier,
+                        per_channel=True,
+                        elementwise=True,
+                        p=0.5,
+                    ),
+                    A.RandomFog(
+                        fog_coef_range=random_fog_coef_range,
+                        alpha_coef=random_fog_alpha_coef,
+                        p=0.5,
+                    ),
+                ],
+                p=0.5,
+            ),
+            A.HueSaturationValue(
+                hue_shift_limit=hue_shift_limit,
+                sat_shift_limit=sat_shift_limit,
+                val_shift_limit=val_shift_limit,
+                p=0.5,
+            ),  # Adjust colors to create rust-like hues
+            A.RandomBrightnessContrast(
+                brightness_limit=brightness_limit,
+                contrast_limit=contrast_limit,
+                p=0.5,
+            ),  # Adjust brightness and contrast to simulate rust
+        ],
+        p=1,
+    )
+
+
+@lru_cache(maxsize=config.RUSTING_OPERATOR_CACHE_SIZE)
+def get_rusting_operator(
+    gauss_noise_var_limit=(10.0, 50.0),
+    ison_noise_color_shift=(0.01, 0.05),
+    ison_noise_intensity=(0.1, 0.5),
+    multiplicative_noise_multiplier=(0.9, 1.1),
+    random_fog_coef_range=(0.1, 0.3),
+    random_fog_alpha_coef=0.1,
+    hue_shift_limit=20,
+    sat_shift_limit=30,
+    val_shift_limit=20,
+    brightness_limit=0.2,
+    contrast_limit=0.2,
+):
+    """Return the rusting operator for a set of parameters, building it only once per set.
+
+    The parameters are the same as RustingAugmentation's and must be hashable. The operators of the
+    config.RUSTING_OPERATOR_CACHE_SIZE most recently used sets are kept.
+
+    Returns:
+        AlbumentationsOperator: The rusting operator.
+    """
+    factory = partial(
+        build_rusting_transform,
+        gauss_noise_var_limit,
+        ison_noise_color_shift,
+        ison_noise_intensity,
+        multiplicative_noise_multiplier,
+        random_fog_coef_range,
+        random_fog_alpha_coef,
+        hue_shift_limit,
+        sat_shift_limit,
+        val_shift_limit,
+        brightness_limit,
+        contrast_limit,
+    )
+    return AlbumentationsOperator(factory, rgb=True)
+
+
+blur = AlbumentationsOperator(A.Blur)
+median_blur = AlbumentationsOperator(A.MedianBlur)
+motion_blur = AlbumentationsOperator(A.MotionBlur)
+hue_saturation = AlbumentationsOperator(A.HueSaturationValue, rgb=True)
+random_rain = AlbumentationsOperator(A.RandomRain, rgb=True)
+random_shadow = AlbumentationsOperator(A.RandomShadow, rgb=True)
+solarize = AlbumentationsOperator(A.Solarize)
+sun_flare = AlbumentationsOperator(A.RandomSunFlare, rgb=True)
+
+vertical_flip = GeometricOperator(A.VerticalFlip)
+horizontal_flip = GeometricOperator(A.HorizontalFlip)
+perspective = GeometricOperator(A.Perspective)
+transpose = GeometricOperator(A.Transpose)
+
+grid_distort = WarpOperator(A.GridDistortion)
+
+bad_photocopy = AugraphyOperator(BadPhotoCopy)
+dirty_rollers = AugraphyOperator(DirtyRollers)
+faxify = AugraphyOperator(Faxify)
+ink_bleed = AugraphyOperator(InkBleed)
+low_ink_periodic_lines = AugraphyOperator(LowInkPeriodicLines)
+scribbles = AugraphyOperator(Scribbles)
+water_mark = AugraphyOperator(WaterMark)
@@ -1,7 +1,51 @@
+from functools import partial
+
 import numpy as np
 from augraphy import TextureGenerator
 from PIL import Image
 
+from SynthImage.Augmentation.geometry import keep_transform
+from SynthImage.Augmentation.utils import image_to_array, seeded_global_random
+
+# The blend weights are fixed-point numbers with this many fractional bits
+BLEND_FRACTION_BITS = 8
+
+
+def blend_texture(image, texture, alpha, beta, out=None):
+    """Blends a texture into an image, image * alpha + texture * beta, in fixed-point integer arithmetic.
+
+    The result is within 1 of the floating point blend. A single-channel texture is applied to every
+    channel of a color image without being copied, and values above 255 are clipped.
+
+    Args:
+        image (numpy.ndarray): A uint8 array of shape (height, width) or (height, width, channels).
+        texture (numpy.ndarray): A uint8 array of shape (height, width) or the shape of the image.
+        alpha (float): Blending coefficient for the image.
+        beta (float): Blending coefficient for the texture.
+        out (numpy.ndarray, optional): A uint8 array with the shape of the image the result is written to.
+                                       It may be the image itself. Defaults to None, a new array.
+
+    Returns:
+        numpy.ndarray: The blended uint8 array.
+    """
+    alpha = round(alpha * (1 << BLEND_FRACTION_BITS))
+    beta = round(beta * (1 << BLEND_FRACTION_BITS))
+    # 16 bits hold the weighted sum as long as the weights add up to at most 1
+    dtype = np.uint16 if alpha + beta <= 1 << BLEND_FRACTION_BITS else np.uint32
+    if texture.ndim == 2 and image.ndim == 3:
+        texture = texture[..., np.newaxis]
+
+    blended = np.multiply(image, alpha, dtype=dtype)
+    weighted_texture = np.multiply(texture, beta, dtype=dtype)
+    blended += weighted_texture
+    blended >>= BLEND_FRACTION_BITS
+    if dtype is np.uint32:
+        np.minimum(blended, 255, out=blended)
+    if out is None:
+        return blended.astype(np.uint8)
+    np.copyto(out, blended, casting="unsafe")
+    return out
+
 
 class PaperTextureAugmentation:
     def __init__(
@@ -14,6 +58,8 @@ class PaperTextureAugmentation:
         alpha=0.7,
         beta=0.3,
         num_channels=3,
+        texture_bank=None,
+        rng=None,
     ):
         """Initialize the PaperTextureAugmentation class with an image and parameters.
 
@@ -25,7 +71,13 @@ class PaperTextureAugmentation:
             quilt_texture (int): Quilt texture setting.
             alpha (float): Blending coefficient for the original image.
             beta (float): Blending coefficient for the texture.
-            num_channels (int): Number of channels to expand the texture to (e.g., 3 for RGB).
+            num_channels (int): Number of channels of the image (e.g., 3 for RGB). The texture is applied to
+                                every channel of color images.
+            texture_bank (TextureBank, optional): Take the texture from a bank of pregenerated textures
+                                                  instead of generating it. Defaults to None.
+            rng (numpy.random.Generator or int, optional): The random generator the texture is drawn from,
+                                                           or its seed. Defaults to None, the global random
+                                                           states for generated textures.
         """
         self.original_img_obj = original_img_obj
         self.texture_type = texture_type
@@ -35,6 +87,8 @@ class PaperTextureAugmentation:
         self.alpha = alpha
         self.beta = beta
         self.num_channels = num_channels
+        self.texture_bank = texture_bank
+        self.rng = rng
 
     def apply_paper_texture(self):
         """Apply a paper texture effect to the image.
@@ -42,26 +96,32 @@ class PaperTextureAugmentation:
         Returns:
             PIL.Image.Image: The paper texture image.
         """
-        # Create a TextureGenerator object
-        texture_generator = TextureGenerator()
-
         # Convert the original image to a numpy array
-        image_array = np.array(self.original_img_obj)
-
-        # Generate the texture
-        texture = texture_generator(
-            texture_type=self.texture_type,
-            texture_width=self.texture_width or image_array.shape[1],
-            texture_height=self.texture_height or image_array.shape[0],
-            quilt_texture=self.quilt_texture,
-        )
+        image_array = image_to_array(self.original_img_obj)
+        texture_width = self.texture_width or image_array.shape[1]
+        texture_height = self.texture_height or image_array.shape[0]
 
-        # Expand the texture to the specified number of channels
-        if self.num_channels > 1:
-            texture = np.stack([texture] * self.num_channels, axis=-1)
+        if self.texture_bank is not None:
+            # Crop the texture from a pregenerated one
+            texture = self.texture_bank.sample(
+                self.texture_type, (texture_width, texture_height), self.rng
+            )
+        else:
+            # Generate the texture, the generator draws from the global random states
+            generate_texture = partial(
+                TextureGenerator(),
+                texture_type=self.texture_type,
+                texture_width=texture_width,
+                texture_height=texture_height,
+                quilt_texture=self.quilt_texture,
+            )
+            with seeded_global_random(self.rng):
+                texture = generate_texture()
 
-        # Combine the texture with the image (blending)
-        combined = (image_array * self.alpha + texture * self.beta).astype(np.uint8)
+        # Combine the texture with the image (blending), in place
+        combined = blend_texture(
+            image_array, texture, self.alpha, self.beta, out=image_array
+        )
 
         # Convert the augmented image back to a PIL image
-        return Image.fromarray(combined)
+        return keep_transform(self.original_img_obj, Image.fromarray(combined))
@@ -1,23 +1,25 @@
-import albumentations as A
-import numpy as np
-from PIL import Image
+from SynthImage.Augmentation import operators
 
 
 class PerspectiveAugmentation:
-    def __init__(self, original_img_obj):
+    def __init__(self, original_img_obj, rng=None):
         """Initialize the PerspectiveAugmentation class with an image.
 
         Args:
             original_img_obj (PIL.Image.Image): The input image to be augmented.
+            rng (numpy.random.Generator or int, optional): The random generator the augmentation
+                                                           parameters are drawn from, or its seed.
+                                                           Defaults to None.
         """
         self.original_img_obj = original_img_obj
+        self.rng = rng
 
     def apply_perspective(self):
         """Apply perspective to the image.
 
+        The geometric transform is recorded on the result, see geometry.record_transform.
+
         Returns:
             PIL.Image.Image: The perspective applied to the image
         """
-        aug = A.Perspective()
-        aug_img = aug(image=np.array(self.original_img_obj))["image"]
-        return Image.fromarray(aug_img)
+        return operators.perspective(self.original_img_obj, self.rng)
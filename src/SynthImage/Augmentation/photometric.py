@@ -0,0 +1,291 @@
+from abc import ABC, abstractmethod
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from SynthImage.Augmentation.geometry import keep_transform
+from SynthImage.Augmentation.utils import ensure_8bit, get_rng
+
+# The weights of Image.convert("L"), for the mean gray level of color images
+LUMA_WEIGHTS = (0.299, 0.587, 0.114)
+
+LEVELS = np.arange(256)
+
+
+def sample_value(value, rng):
+    """Returns a fixed parameter as is, or draws it uniformly from a (low, high) range."""
+    if isinstance(value, tuple):
+        return rng.uniform(*value)
+    return value
+
+
+def blend_table(degenerate, factor):
+    """Returns the table of Image.blend(degenerate, image, factor) for a uniform degenerate image.
+
+    The table is computed in float32 and truncated, as Image.blend does, so that it gives the same
+    images as ImageEnhance.
+    """
+    offsets = (LEVELS - degenerate).astype(np.float32)
+    table = np.float32(degenerate) + np.float32(factor) * offsets
+    return np.clip(table, 0, 255).astype(np.uint8)
+
+
+class PointOp(ABC):
+    """A point operation, which maps every gray level of a color channel to a new level.
+
+    needs_mean is set by operations that depend on the mean gray level of the image they are applied to.
+    """
+
+    needs_mean = False
+
+    @property
+    def is_random(self):
+        """Whether a parameter of the operation is a (low, high) range drawn from the random generator."""
+        return any(isinstance(value, tuple) for value in vars(self).values())
+
+    @abstractmethod
+    def get_table(self, rng, mean=None):
+        """Returns the 256-entry table of the operation.
+
+        Args:
+            rng (numpy.random.Generator): The random generator the parameters are drawn from, None when
+                                          the operation has no random parameter.
+            mean (float, optional): The mean gray level of the image, for operations with needs_mean.
+                                    Defaults to None.
+
+        Returns:
+            numpy.ndarray: The uint8 table.
+        """
+
+
+class Brightness(PointOp):
+    def __init__(self, factor=1.1):
+        """Initialize the Brightness operation, the table of ImageEnhance.Brightness.
+
+        Args:
+            factor (float or tuple, optional): The brightness factor, 1.0 keeps the image, or a
+                                               (low, high) range it is drawn from. Defaults to 1.1.
+        """
+        self.factor = factor
+
+    def get_table(self, rng, mean=None):
+        return blend_table(0, sample_value(self.factor, rng))
+
+
+class Contrast(PointOp):
+    needs_mean = True
+
+    def __init__(self, factor=1.1):
+        """Initialize the Contrast operation, the table of ImageEnhance.Contrast.
+
+        Args:
+            factor (float or tuple, optional): The contrast factor, 1.0 keeps the image, or a (low, high)
+                                               range it is drawn from. Defaults to 1.1.
+        """
+        self.factor = factor
+
+    def get_table(self, rng, mean=None):
+        return blend_table(int(mean + 0.5), sample_value(self.factor, rng))
+
+
+class Gamma(PointOp):
+    def __init__(self, gamma=1.2):
+        """Initialize the Gamma operation.
+
+        Args:
+            gamma (float or tuple, optional): The gamma, above 1.0 darkens the image, or a (low, high)
+                                              range it is drawn from. Defaults to 1.2.
+        """
+        self.gamma = gamma
+
+    def get_table(self, rng, mean=None):
+        table = 255 * (LEVELS / 255) ** sample_value(self.gamma, rng)
+        return np.round(table).astype(np.uint8)
+
+
+class Solarize(PointOp):
+    def __init__(self, threshold=128):
+        """Initialize the Solarize operation, the table of ImageOps.solarize.
+
+        Args:
+            threshold (int or tuple, optional): The levels from the threshold up are inverted, or a
+                                                (low, high) range it is drawn from. Defaults to 128.
+        """
+        self.threshold = threshold
+
+    def get_table(self, rng, mean=None):
+        threshold = sample_value(self.threshold, rng)
+        return np.where(LEVELS < threshold, LEVELS, 255 - LEVELS).astype(np.uint8)
+
+
+class Invert(PointOp):
+    def get_table(self, rng, mean=None):
+        return (255 - LEVELS).astype(np.uint8)
+
+
+def get_color_channels(channels):
+    """Returns the number of color channels of an image, the alpha channel of "LA" and "RGBA" excluded."""
+    return 1 if channels <= 2 else 3
+
+
+def get_gray_mean(lut, histograms):
+    """Returns the mean gray level of an image after a lookup table, from the histograms of the image.
+
+    For color images, the mean is the weighted mean of the channel means. Image.convert("L") rounds every
+    pixel, so the mean of the "L" image, which ImageEnhance.Contrast uses, can differ slightly.
+
+    Args:
+        lut (numpy.ndarray): The uint8 table of each color channel, of shape (color channels, 256).
+        histograms (numpy.ndarray): The histogram of each color channel, of shape (color channels, 256).
+
+    Returns:
+        float: The mean gray level.
+    """
+    channel_means = (histograms * lut).sum(axis=1) / max(histograms[0].sum(), 1)
+    if len(channel_means) == 1:
+        return channel_means[0]
+    return float(np.dot(channel_means, LUMA_WEIGHTS))
+
+
+def get_histograms(img):
+    """Returns the histogram of each color channel of an image, computed by PIL in one pass.
+
+    Args:
+        img (PIL.Image.Image): The image, in "L", "LA", "RGB" or "RGBA" mode.
+
+    Returns:
+        numpy.ndarray: The histograms, of shape (color channels, 256).
+    """
+    channels = len(img.getbands())
+    histograms = np.reshape(img.histogram(), (channels, 256))
+    return histograms[: get_color_channels(channels)]
+
+
+def apply_lut(image, lut):
+    """Maps an image array through a lookup table in a single pass.
+
+    Args:
+        image (numpy.ndarray): A uint8 array of shape (height, width) or (height, width, channels).
+        lut (numpy.ndarray): The uint8 table of each channel, of shape (channels, 256).
+
+    Returns:
+        numpy.ndarray: The mapped uint8 array.
+    """
+    if image.ndim == 2 or (lut == lut[0]).all():
+        return cv2.LUT(image, lut[0])
+    # A 256x1 table with one channel per image channel
+    return cv2.LUT(image, np.ascontiguousarray(lut.T).reshape(256, 1, -1))
+
+
+class PhotometricOperator:
+    def __init__(self, ops):
+        """Initialize the PhotometricOperator object.
+
+        The point operations are composed into a single 256-entry lookup table per channel, which is
+        applied to the image in one pass instead of one pass per operation. The mean gray level that
+        contrast depends on is computed from the histograms of the image, mapped through the operations
+        that come before it. A contrast that comes first uses the mean of the "L" image, as
+        ImageEnhance.Contrast does, and gives the same image. After other operations, the mean of a
+        color image is estimated from its channels and can be one level off the mean of its "L" image,
+        which moves the result by at most abs(1 - factor) levels. Alpha channels are kept as is.
+        Neighbourhood operations such as sharpness are not point operations and stay separate stages of
+        a Pipeline.
+
+        Args:
+            ops (list of PointOp): The point operations, in order.
+        """
+        self.ops = list(ops)
+        self.rgb = False
+
+    def get_lut(self, channels, histograms=None, rng=None, input_mean=None):
+        """Composes the point operations into a lookup table.
+
+        Args:
+            channels (int): The number of channels of the image.
+            histograms (numpy.ndarray, optional): The histogram of each color channel, of shape
+                                                  (color channels, 256). Required when an operation
+                                                  needs the mean gray level. Defaults to None.
+            rng (numpy.random.Generator or int, optional): The random generator the parameters are drawn
+                                                           from, or its seed. Defaults to None.
+            input_mean (float, optional): The exact mean gray level of the image, used while the table
+                                          is still the identity. Defaults to None, the mean is computed
+                                          from the histograms.
+
+        Returns:
+            numpy.ndarray: The uint8 table of each channel, of shape (channels, 256).
+        """
+        if any(op.is_random for op in self.ops):
+            # Fixed operations leave the random states untouched
+            rng = get_rng(rng)
+        color_channels = get_color_channels(channels)
+        lut = np.tile(LEVELS.astype(np.uint8), (channels, 1))
+        color_lut = lut[:color_channels]
+        for op in self.ops:
+            mean = None
+            if op.needs_mean:
+                if input_mean is not None and (color_lut == LEVELS).all():
+                    mean = input_mean
+                else:
+                    mean = get_gray_mean(color_lut, histograms)
+            color_lut = op.get_table(rng, mean)[color_lut]
+        lut[:color_channels] = color_lut
+        return lut
+
+    @property
+    def needs_histograms(self):
+        return any(op.needs_mean for op in self.ops)
+
+    def get_statistics(self, img):
+        """Returns the histograms and, for a leading contrast, the exact mean gray level of an image.
+
+        Args:
+            img (PIL.Image.Image): The image, in "L", "LA", "RGB" or "RGBA" mode.
+
+        Returns:
+            tuple: The histograms of the color channels, or None when no operation needs them, and the
+            mean gray level of the "L" image, or None when it is not needed.
+        """
+        if not self.needs_histograms:
+            return None, None
+        histograms = get_histograms(img)
+        input_mean = None
+        if len(histograms) > 1 and self.ops[0].needs_mean:
+            # The rounded "L" pixels ImageEnhance.Contrast averages, not the mean of the channels
+            gray_histogram = np.array(img.convert("L").histogram())
+            input_mean = float(np.dot(gray_histogram, LEVELS)) / max(
+                gray_histogram.sum(), 1
+            )
+        return histograms, input_mean
+
+    def apply_array(self, image, rng=None):
+        """Augment an image array.
+
+        Args:
+            image (numpy.ndarray): A uint8 array of shape (height, width) or (height, width, channels).
+            rng (numpy.random.Generator or int, optional): The random generator the parameters are drawn
+                                                           from, or its seed. Defaults to None.
+
+        Returns:
+            numpy.ndarray: The augmented uint8 array.
+        """
+        channels = 1 if image.ndim == 2 else image.shape[2]
+        histograms, input_mean = self.get_statistics(Image.fromarray(image))
+        return apply_lut(image, self.get_lut(channels, histograms, rng, input_mean))
+
+    def __call__(self, img, rng=None):
+        """Augment an image, with Image.point so that the image is not converted to numpy.
+
+        Args:
+            img (PIL.Image.Image): The input image, in "1", "L", "LA", "RGB" or "RGBA" mode.
+            rng (numpy.random.Generator or int, optional): The random generator the parameters are drawn
+                                                           from, or its seed. Defaults to None.
+
+        Returns:
+            PIL.Image.Image: The augmented image, with the geometric transform of the input image.
+        """
+        page_img = ensure_8bit(img)
+        channels = len(page_img.getbands())
+        histograms, input_mean = self.get_statistics(page_img)
+        lut = self.get_lut(channels, histograms, rng, input_mean)
+        return keep_transform(img, page_img.point(lut.ravel().tolist()))
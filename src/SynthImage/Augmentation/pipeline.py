@@ -0,0 +1,74 @@
+import cv2
+import numpy as np
+from PIL import Image
+
+from SynthImage.Augmentation.geometry import record_transform
+from SynthImage.Augmentation.utils import image_to_array
+
+
+class Pipeline:
+    def __init__(self, stages):
+        """Initialize the Pipeline object.
+
+        The pipeline converts the input image to a numpy array once, passes that array through every
+        stage and converts the result back to PIL once, instead of every augmentation converting to
+        numpy and back.
+
+        Args:
+            stages (list): The augmentations, in order. Each stage is an operator from
+                           SynthImage.Augmentation.operators or any callable stage(array, rng) that returns
+                           the augmented array. Stages with an apply_array_with_transform method also
+                           report their geometric transform, which is recorded on the result. After a
+                           stage with a true warps attribute, a non-affine warp, no transform is recorded.
+        """
+        self.stages = list(stages)
+        # The buffer is RGB throughout when any stage only works on color images
+        self.rgb = any(getattr(stage, "rgb", False) for stage in self.stages)
+
+    def apply_array(self, image, rng=None):
+        """Run the stages on an image array.
+
+        Args:
+            image (numpy.ndarray): A uint8 array of shape (height, width) or (height, width, 3).
+            rng (numpy.random.Generator, optional): The random generator passed to every stage.
+                                                    Defaults to None.
+
+        Returns:
+            tuple: The augmented array and the 3x3 matrix of the geometric transforms of the stages, None
+            after a non-affine warp.
+        """
+        if self.rgb and image.ndim == 2:
+            image = cv2.cvtColor(image, cv2.COLOR_GRAY2RGB)
+        matrix = np.eye(3)
+        for stage in self.stages:
+            if hasattr(stage, "apply_array_with_transform"):
+                image, stage_matrix = stage.apply_array_with_transform(image, rng)
+                if matrix is not None:
+                    matrix = stage_matrix @ matrix
+            elif hasattr(stage, "apply_array"):
+                image = stage.apply_array(image, rng)
+            else:
+                image = stage(image, rng)
+            if getattr(stage, "warps", False):
+                matrix = None
+        return image, matrix
+
+    def __call__(self, img, rng=None):
+        """Run the stages on an image.
+
+        Args:
+            img (PIL.Image.Image): The input image.
+            rng (numpy.random.Generator, optional): The random generator passed to every stage.
+                                                    Defaults to None.
+
+        Returns:
+            PIL.Image.Image: The augmented image, with the geometric transform of the stages recorded,
+            none after a non-affine warp.
+        """
+        aug_img, matrix = self.apply_array(image_to_array(img, rgb=self.rgb), rng)
+        if matrix is None:
+            return Image.fromarray(aug_img)
+        return record_transform(img, Image.fromarray(aug_img), matrix)
+
+    def __len__(self):
+        return len(self.stages)
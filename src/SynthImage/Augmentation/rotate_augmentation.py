@@ -1,20 +1,90 @@
+import numpy as np
+from PIL import Image
+
+import SynthImage.config as config
+from SynthImage.Augmentation.geometry import (
+    record_transform,
+    rotate_array,
+    rotation_matrix,
+)
+from SynthImage.Augmentation.utils import ensure_8bit
+
+ROTATION_BACKENDS = ("pil", "cv2")
+
+# The modes the cv2 backend rotates, the others, such as palette images, are rotated by PIL
+CV2_ROTATION_MODES = ("1", "L", "LA", "RGB", "RGBA")
+
+PIL_RESAMPLINGS = {
+    "nearest": Image.Resampling.NEAREST,
+    "bilinear": Image.Resampling.BILINEAR,
+    "bicubic": Image.Resampling.BICUBIC,
+}
+
+
 class RotateAugmentation:
-    def __init__(self, original_img_obj, angle: float = 4):
+    def __init__(
+        self,
+        original_img_obj,
+        angle: float = 4,
+        backend=config.ROTATION_BACKEND,
+        interpolation=config.ROTATION_INTERPOLATION,
+    ):
         """Initialize the RotateAugmentation object.
         Args:
             original_img_obj (PIL.Image.Image): The input image to be augmented.
             angle (float, optional):  The angle by which to rotate the image.  Defaults to None.
+            backend (str, optional): "pil" rotates with Image.rotate, "cv2" with a single cv2.warpAffine on
+                                     the expanded canvas, which is faster, on one channel for grayscale
+                                     ("L" or "1") pages. Pages in other modes than CV2_ROTATION_MODES are
+                                     rotated with Image.rotate. Defaults to config.ROTATION_BACKEND.
+            interpolation (str, optional): "nearest", "bilinear" or "bicubic". Bilevel ("1") and palette
+                                           ("P") pages are always rotated with "nearest" and keep their
+                                           mode, as with Image.rotate.
+                                           Defaults to config.ROTATION_INTERPOLATION.
         """
+        if backend not in ROTATION_BACKENDS:
+            raise ValueError(
+                f"backend must be one of {ROTATION_BACKENDS}, got {backend!r}"
+            )
+        if interpolation not in PIL_RESAMPLINGS:
+            raise ValueError(
+                f"interpolation must be one of {tuple(PIL_RESAMPLINGS)}, got {interpolation!r}"
+            )
         self.original_img_obj = original_img_obj
         self.angle = angle
+        self.backend = backend
+        self.interpolation = interpolation
 
     def apply_rotate(self):
         """Apply rotation augmentation to the input image.
 
+        The geometric transform is recorded on the result, see geometry.record_transform.
+
 
         Returns:
             PIL.Image.Image: The rotated image
         """
-        aug_img = self.original_img_obj
-        aug_img = aug_img.rotate(self.angle, expand=True, fillcolor=(255, 255, 255))
+        mode = self.original_img_obj.mode
+        if self.backend == "cv2" and mode in CV2_ROTATION_MODES:
+            # Interpolated levels would not be bilevel
+            interpolation = "nearest" if mode == "1" else self.interpolation
+            # The warp only reads the page, so the read-only array view saves a copy
+            aug_img, matrix = rotate_array(
+                np.asarray(ensure_8bit(self.original_img_obj)),
+                self.angle,
+                interpolation,
+            )
+            aug_img = Image.fromarray(aug_img)
+            if mode == "1":
+                aug_img = aug_img.convert("1", dither=Image.Dither.NONE)
+        else:
+            aug_img = self.original_img_obj
+            aug_img = aug_img.rotate(
+                self.angle,
+                resample=PIL_RESAMPLINGS[self.interpolation],
+                expand=True,
+                fillcolor="white",
+            )
+            matrix, _ = rotation_matrix(self.original_img_obj.size, self.angle)
+        record_transform(self.original_img_obj, aug_img, matrix)
         return aug_img, self.angle
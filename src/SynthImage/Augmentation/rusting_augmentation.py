@@ -1,6 +1,4 @@
-import albumentations as A
-import numpy as np
-from PIL import Image
+from SynthImage.Augmentation import operators
 
 
 class RustingAugmentation:
@@ -18,6 +16,7 @@ class RustingAugmentation:
         val_shift_limit=20,
         brightness_limit=0.2,
         contrast_limit=0.2,
+        rng=None,
     ):
         """Initialize the RustingAugmentation class with an image and parameters.
 
@@ -34,6 +33,9 @@ class RustingAugmentation:
             val_shift_limit (int): Value shift limit for color adjustment.
             brightness_limit (float): Brightness limit for random brightness contrast.
             contrast_limit (float): Contrast limit for random brightness contrast.
+            rng (numpy.random.Generator or int, optional): The random generator the augmentation
+                                                           parameters are drawn from, or its seed.
+                                                           Defaults to None.
         """
         self.original_img_obj = original_img_obj
         self.gauss_noise_var_limit = gauss_noise_var_limit
@@ -47,6 +49,7 @@ class RustingAugmentation:
         self.val_shift_limit = val_shift_limit
         self.brightness_limit = brightness_limit
         self.contrast_limit = contrast_limit
+        self.rng = rng
 
     def apply_rusting(self):
         """
@@ -55,52 +58,21 @@ class RustingAugmentation:
         Returns:
             PIL.Image.Image: Augmented image with rusting effect.
         """
-        # Combine various transformations to simulate rust
-        aug = A.Compose(
-            [
-                A.OneOf(
-                    [
-                        A.GaussNoise(
-                            var_limit=self.gauss_noise_var_limit, p=0.5
-                        ),  # Add noise to simulate rust particles
-                        A.ISONoise(
-                            color_shift=self.ison_noise_color_shift,
-                            intensity=self.ison_noise_intensity,
-                            p=0.5,
-                        ),
-                    ],
-                    p=0.5,
-                ),
-                A.OneOf(
-                    [
-                        A.MultiplicativeNoise(
-                            multiplier=self.multiplicative_noise_multiplier,
-                            per_channel=True,
-                            elementwise=True,
-                            p=0.5,
-                        ),
-                        A.RandomFog(
-                            fog_coef_range=self.random_fog_coef_range,
-                            alpha_coef=self.random_fog_alpha_coef,
-                            p=0.5,
-                        ),
-                    ],
-                    p=0.5,
-                ),
-                A.HueSaturationValue(
-                    hue_shift_limit=self.hue_shift_limit,
-                    sat_shift_limit=self.sat_shift_limit,
-                    val_shift_limit=self.val_shift_limit,
-                    p=0.5,
-                ),  # Adjust colors to create rust-like hues
-                A.RandomBrightnessContrast(
-                    brightness_limit=self.brightness_limit,
-                    contrast_limit=self.contrast_limit,
-                    p=0.5,
-                ),  # Adjust brightness and contrast to simulate rust
-            ],
-            p=1,
-        )
-
-        aug_img = aug(image=np.array(self.original_img_obj))["image"]
-        return Image.fromarray(aug_img)
+        # The combined transformations are built once per set of parameters and reused
+        params = [
+            self.gauss_noise_var_limit,
+            self.ison_noise_color_shift,
+            self.ison_noise_intensity,
+            self.multiplicative_noise_multiplier,
+            self.random_fog_coef_range,
+            self.random_fog_alpha_coef,
+            self.hue_shift_limit,
+            self.sat_shift_limit,
+            self.val_shift_limit,
+            self.brightness_limit,
+            self.contrast_limit,
+        ]
+        params = [
+            tuple(param) if isinstance(param, list) else param for param in params
+        ]
+        return operators.get_rusting_operator(*params)(self.original_img_obj, self.rng)
@@ -1,5 +1,8 @@
 from PIL import ImageEnhance
 
+from SynthImage.Augmentation.geometry import keep_transform
+from SynthImage.Augmentation.utils import ensure_8bit
+
 
 class SharpnessAugmentation:
     def __init__(self, original_img_obj, factor: float = 1.1):
@@ -20,7 +23,7 @@ class SharpnessAugmentation:
         Returns:
             PIL.Image.Image: The image with adjusted sharpness.
         """
-        aug_img = self.original_img_obj
+        aug_img = ensure_8bit(self.original_img_obj)
         enhancer = ImageEnhance.Sharpness(aug_img)
         aug_img = enhancer.enhance(self.factor)
-        return aug_img
+        return keep_transform(self.original_img_obj, aug_img)
@@ -0,0 +1,203 @@
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+import numpy as np
+from augraphy import TextureGenerator
+
+import SynthImage.config as config
+from SynthImage.Augmentation.utils import get_rng
+
+TEXTURE_FILE_SUFFIX = ".u8"
+
+
+def reflect_indices(start, length, period):
+    """Returns indices that walk over an axis and reflect at its ends, so that repeats have no seams.
+
+    Args:
+        start (int): The first position, in [0, 2 * period).
+        length (int): The number of indices.
+        period (int): The length of the axis.
+
+    Returns:
+        numpy.ndarray: The indices, in [0, period).
+    """
+    positions = (start + np.arange(length)) % (2 * period)
+    return np.where(positions < period, positions, 2 * period - 1 - positions)
+
+
+class TextureBank:
+    def __init__(
+        self,
+        bank_dir,
+        texture_size=config.TEXTURE_BANK_SIZE,
+        textures_per_type=config.TEXTURE_BANK_COUNT,
+        max_bytes=config.TEXTURE_BANK_MAX_BYTES,
+        quilt_texture=0,
+    ):
+        """Initialize the TextureBank object.
+
+        The bank generates textures_per_type paper textures of each texture type once, stores them in a
+        raw file of contiguous uint8 textures and memory-maps it. Pages then take a random crop of a
+        random texture, flipped at random, instead of generating a texture of their own. The files are
+        named after the texture type, size and quilting, so a bank directory is reused across runs and
+        can hold textures of several sizes.
+
+        Args:
+            bank_dir (str or os.PathLike): The directory the textures are stored in.
+            texture_size (tuple, optional): The (width, height) of the stored textures.
+                                            Defaults to config.TEXTURE_BANK_SIZE.
+            textures_per_type (int, optional): The number of textures generated per texture type.
+                                               Defaults to config.TEXTURE_BANK_COUNT.
+            max_bytes (int, optional): The maximum total size of the texture files in the directory. Fewer
+                                       textures are generated for a type when the full set does not fit.
+                                       Defaults to config.TEXTURE_BANK_MAX_BYTES.
+            quilt_texture (int, optional): The quilt texture setting of the TextureGenerator. Defaults to 0.
+        """
+        self.bank_dir = Path(bank_dir)
+        self.bank_dir.mkdir(parents=True, exist_ok=True)
+        self.texture_size = tuple(texture_size)
+        self.textures_per_type = textures_per_type
+        self.max_bytes = max_bytes
+        self.quilt_texture = quilt_texture
+        self._arrays = {}
+        self._lock = threading.Lock()
+
+    def get_texture_path(self, texture_type):
+        width, height = self.texture_size
+        file_name = f"{texture_type}_{width}x{height}_q{self.quilt_texture}{TEXTURE_FILE_SUFFIX}"
+        return self.bank_dir / file_name
+
+    def get_nbytes(self):
+        """Return the total size of the texture files in the bank directory."""
+        return sum(
+            path.stat().st_size
+            for path in self.bank_dir.glob(f"*{TEXTURE_FILE_SUFFIX}")
+        )
+
+    def has_textures(self, texture_type):
+        return self.get_texture_path(texture_type).exists()
+
+    def generate_textures(self, texture_type):
+        """Generates the textures of a texture type and stores them.
+
+        The textures are written to a temporary file that is then renamed, so concurrent processes
+        never read a partially written file.
+
+        Args:
+            texture_type (str): The texture type of augraphy's TextureGenerator, e.g. "rough_stains".
+
+        Raises:
+            ValueError: If not even one texture fits in the size cap of the bank.
+        """
+        width, height = self.texture_size
+        texture_nbytes = width * height
+        count = min(
+            self.textures_per_type,
+            (self.max_bytes - self.get_nbytes()) // texture_nbytes,
+        )
+        if count < 1:
+            raise ValueError(
+                f"The texture bank in {self.bank_dir} is full, no {texture_type} texture fits in "
+                f"{self.max_bytes} bytes"
+            )
+
+        texture_generator = TextureGenerator()
+        file_descriptor, temp_path = tempfile.mkstemp(suffix=".tmp", dir=self.bank_dir)
+        try:
+            with os.fdopen(file_descriptor, "wb") as texture_file:
+                for _ in range(count):
+                    texture = texture_generator(
+                        texture_type=texture_type,
+                        texture_width=width,
+                        texture_height=height,
+                        quilt_texture=self.quilt_texture,
+                    )
+                    texture_file.write(
+                        np.ascontiguousarray(texture, np.uint8).tobytes()
+                    )
+            os.replace(temp_path, self.get_texture_path(texture_type))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def warm_up(self, texture_types):
+        """Generates the textures of every texture type that is not stored yet.
+
+        Args:
+            texture_types (iterable of str): The texture types.
+        """
+        for texture_type in texture_types:
+            self.get_textures(texture_type)
+
+    def get_textures(self, texture_type):
+        """Memory-maps the textures of a texture type, generating them on first use.
+
+        Args:
+            texture_type (str): The texture type.
+
+        Returns:
+            numpy.memmap: The read-only textures, of shape (number of textures, height, width).
+        """
+        array = self._arrays.get(texture_type)
+        if array is not None:
+            return array
+        with self._lock:
+            array = self._arrays.get(texture_type)
+            if array is None:
+                if not self.has_textures(texture_type):
+                    self.generate_textures(texture_type)
+                width, height = self.texture_size
+                array = np.memmap(
+                    self.get_texture_path(texture_type), dtype=np.uint8, mode="r"
+                ).reshape(-1, height, width)
+                self._arrays[texture_type] = array
+        return array
+
+    def sample(self, texture_type, size, rng=None):
+        """Takes a random crop of a random texture, flipped at random.
+
+        Crops larger than the stored textures repeat the texture mirrored, so there are no seams.
+
+        Args:
+            texture_type (str): The texture type.
+            size (tuple): The (width, height) of the crop.
+            rng (numpy.random.Generator or int, optional): The random generator, or its seed.
+                                                           Defaults to None, see utils.get_rng.
+
+        Returns:
+            numpy.ndarray: The uint8 texture of shape (height, width). It may be a read-only view of the
+            bank.
+        """
+        rng = get_rng(rng)
+        width, height = size
+        textures = self.get_textures(texture_type)
+        texture = textures[rng.integers(len(textures))]
+        if rng.random() < 0.5:
+            texture = texture[::-1]
+        if rng.random() < 0.5:
+            texture = texture[:, ::-1]
+
+        texture_height, texture_width = texture.shape
+        if width <= texture_width and height <= texture_height:
+            left = rng.integers(texture_width - width + 1)
+            top = rng.integers(texture_height - height + 1)
+            right, bottom = left + width, top + height
+            return texture[top:bottom, left:right]
+        rows = reflect_indices(rng.integers(2 * texture_height), height, texture_height)
+        columns = reflect_indices(rng.integers(2 * texture_width), width, texture_width)
+        return texture[rows[:, np.newaxis], columns]
+
+    def __getstate__(self):
+        # The memory maps are not sent to worker processes, each worker maps the files itself
+        return {
+            "bank_dir": self.bank_dir,
+            "texture_size": self.texture_size,
+            "textures_per_type": self.textures_per_type,
+            "max_bytes": self.max_bytes,
+            "quilt_texture": self.quilt_texture,
+        }
+
+    def __setstate__(self, state):
+        self.__init__(**state)
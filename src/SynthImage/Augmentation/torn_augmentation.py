@@ -1,7 +1,118 @@
-import random
+from functools import lru_cache
 
+import numpy as np
 from PIL import Image, ImageDraw
 
+import SynthImage.config as config
+from SynthImage.Augmentation.utils import ensure_8bit, get_rng
+
+TORN_OUTPUTS = ("rgba", "fill", "mask")
+
+
+def generate_jagged_lines(
+    size, num_tears, tear_size, jagged_step, jagged_variability, rng
+):
+    """Generates the jagged lines along which the page is torn.
+
+    Each tear starts at a random position of a random page edge and runs along it.
+
+    Args:
+        size (tuple): The (width, height) of the page.
+        num_tears (int): The number of tears.
+        tear_size (int): The size of each tear in pixels.
+        jagged_step (int): The step size for jagged line creation.
+        jagged_variability (int): The variability in jagged line positioning.
+        rng (numpy.random.Generator): The random generator.
+
+    Returns:
+        numpy.ndarray: The (x, y) points of the lines, of shape (num_tears, points per line, 2).
+    """
+    width, height = size
+    # 0: top, 1: bottom, 2: left, 3: right
+    edges = rng.integers(4, size=num_tears)
+    horizontal = edges < 2
+    along = rng.integers(
+        0, np.where(horizontal, width, height) - tear_size, endpoint=True
+    )
+    starts = np.zeros((num_tears, 2), dtype=int)
+    starts[:, 0] = np.where(horizontal, along, 0)
+    starts[:, 1] = np.where(horizontal, 0, along)
+    starts[edges == 1, 1] = height - tear_size
+    starts[edges == 3, 0] = width - tear_size
+
+    steps = np.arange(0, tear_size, jagged_step)
+    points = starts[:, np.newaxis, :] + rng.integers(
+        -jagged_variability,
+        jagged_variability,
+        size=(num_tears, len(steps), 2),
+        endpoint=True,
+    )
+    # The lines run along the x axis on the top and bottom edges, along the y axis on the others
+    points[horizontal, :, 0] += steps
+    points[~horizontal, :, 1] += steps
+    return points
+
+
+def generate_torn_mask(
+    size, num_tears, tear_size, jagged_step, jagged_variability, rng
+):
+    """Draws the torn areas of a page.
+
+    Args:
+        size (tuple): The (width, height) of the page.
+        num_tears (int): The number of tears.
+        tear_size (int): The size of each tear in pixels.
+        jagged_step (int): The step size for jagged line creation.
+        jagged_variability (int): The variability in jagged line positioning.
+        rng (numpy.random.Generator): The random generator.
+
+    Returns:
+        tuple: The read-only uint8 mask of shape (height, width), 255 where the page is torn, and the
+        (left, top, right, bottom) boxes of the tears, outside of which the mask is 0.
+    """
+    width, height = size
+    mask = Image.new("L", size, 0)
+    draw = ImageDraw.Draw(mask)
+    jagged_lines = generate_jagged_lines(
+        size, num_tears, tear_size, jagged_step, jagged_variability, rng
+    )
+    boxes = []
+    for jagged_line in jagged_lines:
+        draw.line(jagged_line.ravel().tolist(), fill=255, width=tear_size)
+        # The thick line stays within tear_size / 2 of its points
+        left, top = np.maximum(jagged_line.min(axis=0) - tear_size, 0)
+        right, bottom = np.minimum(jagged_line.max(axis=0) + tear_size, (width, height))
+        if left < right and top < bottom:
+            boxes.append((int(left), int(top), int(right), int(bottom)))
+    mask_np = np.array(mask)
+    mask_np.flags.writeable = False
+    return mask_np, tuple(boxes)
+
+
+@lru_cache(maxsize=config.TORN_MASK_CACHE_SIZE)
+def get_torn_mask(size, seed, num_tears, tear_size, jagged_step, jagged_variability):
+    """Return the torn mask of a seed, drawing it only once per seed, page size and parameters.
+
+    Args:
+        size (tuple): The (width, height) of the page.
+        seed (int): The seed of the random generator the tears are drawn from.
+        num_tears (int): The number of tears.
+        tear_size (int): The size of each tear in pixels.
+        jagged_step (int): The step size for jagged line creation.
+        jagged_variability (int): The variability in jagged line positioning.
+
+    Returns:
+        tuple: The read-only uint8 mask and the boxes of the tears, see generate_torn_mask.
+    """
+    return generate_torn_mask(
+        size,
+        num_tears,
+        tear_size,
+        jagged_step,
+        jagged_variability,
+        np.random.default_rng(seed),
+    )
+
 
 class TornAugmentation:
     def __init__(
@@ -11,6 +122,9 @@ class TornAugmentation:
         tear_size: int = 30,
         jagged_step: int = 5,
         jagged_variability: int = 5,
+        seed=None,
+        output="rgba",
+        rng=None,
     ):
         """Initializes the TornAugmentation class with the provided image and parameters.
 
@@ -20,104 +134,64 @@ class TornAugmentation:
             tear_size (int, optional): The size of each tear in pixels. Defaults to 30.
             jagged_step (int, optional): The step size for jagged line creation. Defaults to 5.
             jagged_variability (int, optional): The variability in jagged line positioning. Defaults to 5.
+            seed (int, optional): The seed the tears are drawn from. The masks of seeded tears are cached,
+                                  see get_torn_mask. Defaults to None, the tears are drawn from rng.
+            output (str, optional): "rgba" makes the torn areas transparent in an RGBA copy of the image,
+                                    "fill" paints them white in the mode of the image and "mask" returns
+                                    only the mask, as an "L" image that is 255 where the page is torn.
+                                    Defaults to "rgba".
+            rng (numpy.random.Generator or int, optional): The random generator the tears are drawn from
+                                                           when no seed is given. Defaults to None, see
+                                                           utils.get_rng.
         """
+        if output not in TORN_OUTPUTS:
+            raise ValueError(f"output must be one of {TORN_OUTPUTS}, got {output!r}")
         self.original_img_obj = original_img_obj
         self.num_tears = num_tears
         self.tear_size = tear_size
         self.jagged_step = jagged_step
         self.jagged_variability = jagged_variability
+        self.seed = seed
+        self.output = output
+        self.rng = rng
+
+    def get_mask(self):
+        """Return the torn areas of the image.
+
+        Returns:
+            tuple: The read-only uint8 mask and the boxes of the tears, see generate_torn_mask.
+        """
+        parameters = (
+            self.num_tears,
+            self.tear_size,
+            self.jagged_step,
+            self.jagged_variability,
+        )
+        size = self.original_img_obj.size
+        if self.seed is None:
+            return generate_torn_mask(size, *parameters, get_rng(self.rng))
+        return get_torn_mask(size, self.seed, *parameters)
 
     def apply_torn(self):
         """Applies a torn effect to the original image.
 
         Returns:
-            PIL.Image.Image: The image with the torn effect applied.
+            PIL.Image.Image: The image with the torn effect applied, or its mask, depending on the output.
         """
-        aug_img = self.original_img_obj
-
-        if aug_img.mode != "RGBA":
-            aug_img = aug_img.convert("RGBA")
-
-        width, height = aug_img.size
-        mask = Image.new("L", (width, height), 0)
-        draw = ImageDraw.Draw(mask)
-
-        # Define areas for tears
-        for _ in range(self.num_tears):
-            edge = random.choice(["top", "bottom", "left", "right"])
-
-            if edge == "top":
-                x0 = random.randint(0, width - self.tear_size)
-                y0 = 0
-                jagged_line = [
-                    (
-                        x0
-                        + i
-                        + random.randint(
-                            -self.jagged_variability, self.jagged_variability
-                        ),
-                        y0
-                        + random.randint(
-                            -self.jagged_variability, self.jagged_variability
-                        ),
-                    )
-                    for i in range(0, self.tear_size, self.jagged_step)
-                ]
-            elif edge == "bottom":
-                x0 = random.randint(0, width - self.tear_size)
-                y0 = height - self.tear_size
-                jagged_line = [
-                    (
-                        x0
-                        + i
-                        + random.randint(
-                            -self.jagged_variability, self.jagged_variability
-                        ),
-                        y0
-                        + random.randint(
-                            -self.jagged_variability, self.jagged_variability
-                        ),
-                    )
-                    for i in range(0, self.tear_size, self.jagged_step)
-                ]
-            elif edge == "left":
-                x0 = 0
-                y0 = random.randint(0, height - self.tear_size)
-                jagged_line = [
-                    (
-                        x0
-                        + random.randint(
-                            -self.jagged_variability, self.jagged_variability
-                        ),
-                        y0
-                        + i
-                        + random.randint(
-                            -self.jagged_variability, self.jagged_variability
-                        ),
-                    )
-                    for i in range(0, self.tear_size, self.jagged_step)
-                ]
-            elif edge == "right":
-                x0 = width - self.tear_size
-                y0 = random.randint(0, height - self.tear_size)
-                jagged_line = [
-                    (
-                        x0
-                        + random.randint(
-                            -self.jagged_variability, self.jagged_variability
-                        ),
-                        y0
-                        + i
-                        + random.randint(
-                            -self.jagged_variability, self.jagged_variability
-                        ),
-                    )
-                    for i in range(0, self.tear_size, self.jagged_step)
-                ]
-
-            draw.line(jagged_line, fill=255, width=self.tear_size)
-
-        # Apply the mask to the image
-        torn_image = aug_img.copy()
-        torn_image.paste((0, 0, 0, 0), mask=mask)
+        mask, boxes = self.get_mask()
+        mask_img = Image.fromarray(mask)
+        if self.output == "mask":
+            return mask_img
+
+        if self.output == "rgba":
+            torn_image = self.original_img_obj.convert("RGBA")
+            fill = (0, 0, 0, 0)
+        else:
+            torn_image = ensure_8bit(self.original_img_obj)
+            if torn_image is self.original_img_obj:
+                torn_image = torn_image.copy()
+            fill = "white"
+        # Only the areas around the tears are updated
+        for box in boxes:
+            torn_image.paste(fill, box, mask=mask_img.crop(box))
         return torn_image
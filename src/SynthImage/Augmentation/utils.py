@@ -1,2 +1,132 @@
+import random
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+from numba import njit
+
+# Libraries such as augraphy draw from the global random states, their seeded calls hold this lock
+_global_random_lock = threading.RLock()
+
+
 def add_one(number):
     return number + 1
+
+
+def get_rng(rng=None):
+    """Returns the numpy random generator an augmentation draws its parameters from.
+
+    Args:
+        rng (numpy.random.Generator, int or numpy.random.SeedSequence, optional): A generator, returned
+            as is, or the seed of a new one. Defaults to None, a generator seeded from the random module,
+            so that random.seed still makes the augmentation reproducible.
+
+    Returns:
+        numpy.random.Generator: The random generator.
+    """
+    if rng is None:
+        rng = random.getrandbits(64)
+    return np.random.default_rng(rng)
+
+
+def draw_seed(rng):
+    """Draws a seed for a library transform from a numpy random generator.
+
+    Args:
+        rng (numpy.random.Generator or int): The random generator, or the seed of a new one.
+
+    Returns:
+        int: A seed in [0, 2**32).
+    """
+    return int(np.random.default_rng(rng).integers(2**32))
+
+
+@njit
+def seed_numba_random(seed):
+    """Seeds the random states of numba compiled code in the calling thread.
+
+    Numba keeps its own random states, separate from the random module and numpy. They are seeded by
+    calling random.seed and np.random.seed from compiled code.
+    """
+    random.seed(seed)
+    np.random.seed(seed)
+
+
+@contextmanager
+def seeded_global_random(rng=None):
+    """Seeds the global random states of the random module, numpy and numba for a library call.
+
+    Libraries such as augraphy draw from the global random states, also from numba compiled code. With
+    a random generator, the states are held by one thread at a time for the duration of the call. They
+    are seeded from the generator, and the states of the random module and numpy are restored
+    afterwards, so the draws of the caller are not changed by the seeded call. Numba's states cannot be
+    read back and stay seeded.
+
+    Unseeded calls do not take the lock, so that they run in parallel. In threaded runs, they can draw
+    from the global random states during a seeded call of another thread, so all the calls must be
+    seeded for the seeded ones to be reproducible.
+
+    Args:
+        rng (numpy.random.Generator or int, optional): The random generator the seed is drawn from, or a
+                                                       seed. Defaults to None, the library draws from the
+                                                       global random states as they are.
+    """
+    if rng is None:
+        yield
+        return
+    with _global_random_lock:
+        seed = draw_seed(rng)
+        random_state = random.getstate()
+        numpy_state = np.random.get_state()
+        try:
+            random.seed(seed)
+            np.random.seed(seed)
+            seed_numba_random(seed)
+            yield
+        finally:
+            random.setstate(random_state)
+            np.random.set_state(numpy_state)
+
+
+def ensure_8bit(img):
+    """Converts a bilevel ("1") image to 8-bit grayscale so that it can be augmented.
+
+    Args:
+        img (PIL.Image.Image): The input image.
+
+    Returns:
+        PIL.Image.Image: An "L" image for bilevel input, otherwise the input image itself.
+    """
+    if img.mode == "1":
+        return img.convert("L")
+    return img
+
+
+def ensure_rgb(img):
+    """Converts an image to RGB for augmentations that only work on color images.
+
+    Args:
+        img (PIL.Image.Image): The input image.
+
+    Returns:
+        PIL.Image.Image: The image in RGB mode, the input image itself if it already is.
+    """
+    if img.mode != "RGB":
+        return img.convert("RGB")
+    return img
+
+
+def image_to_array(img, rgb=False):
+    """Converts an image to a numpy array for augmentation.
+
+    Args:
+        img (PIL.Image.Image): The input image.
+        rgb (bool, optional): Convert the image to RGB first, for augmentations that only work on color
+                              images. Defaults to False.
+
+    Returns:
+        numpy.ndarray: A uint8 array of shape (height, width) or (height, width, channels).
+    """
+    if rgb:
+        return np.array(ensure_rgb(img))
+    return np.array(ensure_8bit(img))
@@ -0,0 +1,130 @@
+import SynthImage.config as config
+from SynthImage.LineExtraction.line_extraction import ExtractLines
+from SynthImage.parallel import imap_bounded
+
+
+class PageRecord:
+    def __init__(
+        self,
+        aug_img,
+        page_text,
+        transform=None,
+        rotation_angle=0,
+        layout=None,
+        page_id=None,
+    ):
+        """Initialize the PageRecord object.
+
+        Args:
+            aug_img (PIL.Image.Image): The augmented page image.
+            page_text (str): The text content of the page.
+            transform (numpy.ndarray, optional): The 3x3 matrix mapping the page to the augmented image.
+                                                 Defaults to the transform recorded on aug_img.
+            rotation_angle (int, optional): The angle the page was rotated by. Defaults to 0.
+            layout (PageLayout, optional): The ground-truth layout of the page. Defaults to None.
+            page_id (optional): An identifier of the page, its position in the stream when not given.
+                                Defaults to None.
+        """
+        self.aug_img = aug_img
+        self.page_text = page_text
+        self.transform = transform
+        self.rotation_angle = rotation_angle
+        self.layout = layout
+        self.page_id = page_id
+
+
+class BatchLineExtractor:
+    def __init__(
+        self,
+        font_size,
+        font_path,
+        workers=None,
+        chunksize=config.PAGE_CHUNK_SIZE,
+        max_in_flight=None,
+        mp_context=None,
+    ):
+        """Initialize the BatchLineExtractor object.
+
+        Args:
+            font_size (int): The size of the font used in the pages.
+            font_path (str): The path to the font file used in the pages.
+            workers (int, optional): The number of worker processes. With 0 or 1, the pages are processed
+                                     in the calling process. Defaults to os.cpu_count().
+            chunksize (int, optional): The number of pages sent to a worker at a time.
+                                       Defaults to config.PAGE_CHUNK_SIZE.
+            max_in_flight (int, optional): The maximum number of chunks being extracted or waiting to be
+                                           consumed. Defaults to twice the number of workers.
+            mp_context (multiprocessing.context.BaseContext, optional): The multiprocessing context used
+                                                                        to start the workers. Defaults to None.
+        """
+        self.font_size = font_size
+        self.font_path = font_path
+        self.workers = workers
+        self.chunksize = chunksize
+        self.max_in_flight = max_in_flight
+        self.mp_context = mp_context
+
+    def extract_page(self, record):
+        """Extract the lines of a single page.
+
+        Args:
+            record (PageRecord): The page to extract the lines from.
+
+        Returns:
+            list of tuples: A list of tuples, each containing the image of a line and its text.
+        """
+        extractor = ExtractLines(
+            record.aug_img,
+            record.page_text,
+            record.rotation_angle,
+            self.font_size,
+            self.font_path,
+            layout=record.layout,
+            transform=record.transform,
+        )
+        return extractor.extract_labeled_lines()
+
+    def extract(self, records, ordered=True):
+        """Extract the lines of a stream of pages with a pool of worker processes.
+
+        Pages are read from the stream only as fast as the lines are consumed, so at most max_in_flight
+        chunks of pages are held in memory however long the stream is.
+
+        Args:
+            records (iterable of PageRecord): The pages to extract the lines from.
+            ordered (bool, optional): Yield the lines in the order of the pages. When False, the lines of
+                                      each page are yielded as soon as it is done. Defaults to True.
+
+        Yields:
+            tuple: The line image, the line text, the page id and the index of the line among the lines
+            extracted from the page.
+        """
+        results = imap_bounded(
+            _extract_indexed_page,
+            enumerate(records),
+            workers=self.workers,
+            chunksize=self.chunksize,
+            ordered=ordered,
+            max_in_flight=self.max_in_flight,
+            initializer=_init_extraction_worker,
+            initargs=(self,),
+            mp_context=self.mp_context,
+        )
+        for page_id, labeled_lines in results:
+            for line_index, (line_image, line_text) in enumerate(labeled_lines):
+                yield line_image, line_text, page_id, line_index
+
+
+_worker_line_extractor = None
+
+
+def _init_extraction_worker(line_extractor):
+    """Keeps the batch line extractor of a worker process."""
+    global _worker_line_extractor
+    _worker_line_extractor = line_extractor
+
+
+def _extract_indexed_page(indexed_record):
+    index, record = indexed_record
+    page_id = index if record.page_id is None else record.page_id
+    return page_id, _worker_line_extractor.extract_page(record)
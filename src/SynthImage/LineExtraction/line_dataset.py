@@ -0,0 +1,211 @@
+import json
+import math
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+import SynthImage.config as config
+
+INDEX_FILE_NAME = "index.json"
+
+
+def normalize_line_image(line_image, line_height=config.LINE_HEIGHT):
+    """Scales a line image to a fixed height, keeping its aspect ratio.
+
+    Args:
+        line_image (PIL.Image.Image): The line image.
+        line_height (int, optional): The height of the normalized line. Defaults to config.LINE_HEIGHT.
+
+    Returns:
+        numpy.ndarray: The grayscale line as a uint8 array of shape (line_height, width).
+    """
+    line_image = line_image.convert("L")
+    width = max(1, round(line_image.width * line_height / line_image.height))
+    if line_image.size != (width, line_height):
+        line_image = line_image.resize((width, line_height), Image.Resampling.BILINEAR)
+    return np.asarray(line_image)
+
+
+def get_bucket_width(width, bucket_growth=config.LINE_BUCKET_GROWTH):
+    """Rounds a line width up to the width of its bucket.
+
+    The bucket widths are the powers of bucket_growth, rounded up, so short lines and long lines alike
+    are padded by at most bucket_growth - 1 of their width, plus a pixel.
+
+    Args:
+        width (int): The width of the normalized line.
+        bucket_growth (float, optional): The ratio between the widths of neighbouring buckets.
+                                         Defaults to config.LINE_BUCKET_GROWTH.
+
+    Returns:
+        int: The bucket width.
+    """
+    exponent = max(0, math.ceil(math.log(width, bucket_growth)))
+    # The logarithm can be rounded below the exponent of an exact power
+    while math.ceil(bucket_growth**exponent) < width:
+        exponent += 1
+    return math.ceil(bucket_growth**exponent)
+
+
+class LineDatasetWriter:
+    def __init__(
+        self,
+        output_dir,
+        line_height=config.LINE_HEIGHT,
+        bucket_growth=config.LINE_BUCKET_GROWTH,
+    ):
+        """Initialize the LineDatasetWriter object.
+
+        Lines are scaled to the same height and grouped into buckets of similar width. Each bucket is a
+        raw file of contiguous uint8 lines of shape (line_height, bucket width), padded with white on the
+        right, that LineDataset memory-maps. The texts and widths of the lines are written to an index
+        when the writer is closed, a line's position in its bucket gives its place in the file.
+
+        Args:
+            output_dir (str or os.PathLike): The directory the dataset is written to.
+            line_height (int, optional): The height of every line. Defaults to config.LINE_HEIGHT.
+            bucket_growth (float, optional): The ratio between the widths of neighbouring buckets.
+                                             Defaults to config.LINE_BUCKET_GROWTH.
+        """
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.line_height = line_height
+        self.bucket_growth = bucket_growth
+        self.buckets = {}
+        self._files = {}
+
+    def add_line(self, line_image, text):
+        """Normalizes a line and appends it to the file of its bucket.
+
+        Args:
+            line_image (PIL.Image.Image): The line image.
+            text (str): The text of the line.
+        """
+        line_np = normalize_line_image(line_image, self.line_height)
+        width = line_np.shape[1]
+        bucket_width = get_bucket_width(width, self.bucket_growth)
+        bucket = self.buckets.get(bucket_width)
+        if bucket is None:
+            bucket = {
+                "file": f"bucket_{bucket_width}.u8",
+                "width": bucket_width,
+                "widths": [],
+                "texts": [],
+            }
+            self.buckets[bucket_width] = bucket
+            self._files[bucket_width] = open(self.output_dir / bucket["file"], "wb")
+
+        padded = np.full((self.line_height, bucket_width), 255, dtype=np.uint8)
+        padded[:, :width] = line_np
+        bucket_file = self._files[bucket_width]
+        bucket["widths"].append(width)
+        bucket["texts"].append(text)
+        bucket_file.write(padded.tobytes())
+
+    def add_lines(self, lines):
+        """Adds a stream of lines, e.g. from ExtractLines.extract_labeled_lines or BatchLineExtractor.extract.
+
+        Args:
+            lines (iterable of tuples): Tuples starting with a line image and its text.
+        """
+        for line in lines:
+            self.add_line(line[0], line[1])
+
+    def close(self):
+        """Closes the bucket files and writes the index."""
+        for bucket_file in self._files.values():
+            bucket_file.close()
+        self._files = {}
+        index = {
+            "line_height": self.line_height,
+            "buckets": [self.buckets[width] for width in sorted(self.buckets)],
+        }
+        with open(
+            self.output_dir / INDEX_FILE_NAME, "w", encoding="utf-8"
+        ) as index_file:
+            json.dump(index, index_file, ensure_ascii=False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class LineDataset:
+    def __init__(self, dataset_dir):
+        """Initialize the LineDataset object.
+
+        Args:
+            dataset_dir (str or os.PathLike): The directory a LineDatasetWriter wrote the dataset to.
+        """
+        self.dataset_dir = Path(dataset_dir)
+        with open(self.dataset_dir / INDEX_FILE_NAME, encoding="utf-8") as index_file:
+            index = json.load(index_file)
+        self.line_height = index["line_height"]
+        self.buckets = {bucket["width"]: bucket for bucket in index["buckets"]}
+        self._arrays = {}
+
+    @property
+    def bucket_widths(self):
+        return sorted(self.buckets)
+
+    def get_bucket(self, bucket_width):
+        """Memory-maps the lines of a bucket.
+
+        Args:
+            bucket_width (int): The width of the bucket.
+
+        Returns:
+            numpy.memmap: The read-only lines, of shape (number of lines, line_height, bucket_width).
+        """
+        array = self._arrays.get(bucket_width)
+        if array is None:
+            bucket = self.buckets[bucket_width]
+            shape = (len(bucket["widths"]), self.line_height, bucket_width)
+            array = np.memmap(
+                self.dataset_dir / bucket["file"], dtype=np.uint8, mode="r", shape=shape
+            )
+            self._arrays[bucket_width] = array
+        return array
+
+    def get_line(self, bucket_width, index):
+        """Returns a line without its padding.
+
+        Args:
+            bucket_width (int): The width of the bucket.
+            index (int): The position of the line in the bucket.
+
+        Returns:
+            tuple: The line as an array of shape (line_height, width) and its text.
+        """
+        bucket = self.buckets[bucket_width]
+        width = bucket["widths"][index]
+        return self.get_bucket(bucket_width)[index, :, :width], bucket["texts"][index]
+
+    def iter_batches(self, batch_size, drop_last=False):
+        """Yields batches of lines of the same bucket, read straight from the memory-mapped files.
+
+        Args:
+            batch_size (int): The maximum number of lines in a batch.
+            drop_last (bool, optional): Skip the last batch of a bucket when it is smaller than
+                                        batch_size. Defaults to False.
+
+        Yields:
+            tuple: The lines as an array of shape (batch size, line_height, bucket width), their widths
+            and their texts.
+        """
+        for bucket_width in self.bucket_widths:
+            bucket = self.buckets[bucket_width]
+            array = self.get_bucket(bucket_width)
+            for start in range(0, len(array), batch_size):
+                end = start + batch_size
+                if drop_last and end > len(array):
+                    break
+                yield array[start:end], bucket["widths"][start:end], bucket["texts"][
+                    start:end
+                ]
+
+    def __len__(self):
+        return sum(len(bucket["widths"]) for bucket in self.buckets.values())
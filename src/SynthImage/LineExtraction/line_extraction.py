@@ -1,11 +1,30 @@
+import cv2
 import numpy as np
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageColor, ImageDraw
 
 import SynthImage.config as config  # Import the config file
+from SynthImage.Augmentation.geometry import (
+    TRANSFORM_KEY,
+    WARP_INTERPOLATIONS,
+    rotation_matrix,
+    transform_points,
+    translation_matrix,
+)
+from SynthImage.Augmentation.utils import ensure_8bit
+from SynthImage.font_cache import get_font
 
 
 class ExtractLines:
-    def __init__(self, aug_img, page_text, rotation_angle, font_size, font_path):
+    def __init__(
+        self,
+        aug_img,
+        page_text,
+        rotation_angle,
+        font_size,
+        font_path,
+        layout=None,
+        transform=None,
+    ):
         """Initialize the ExtractLines object.
 
         Args:
@@ -14,12 +33,47 @@ class ExtractLines:
             rotation_angle (int): The angle to rotate the image for line extraction.
             font_size (int): The size of the font used in the image.
             font_path (str): The path to the font file used in the image.
+            layout (PageLayout, optional): The ground-truth layout returned with the page image. When
+                                           given, the line positions are taken from it instead of
+                                           measuring the text again. Defaults to None.
+            transform (numpy.ndarray, optional): The 3x3 matrix mapping the page to the augmented image.
+                                                 Defaults to the transform the geometric augmentations
+                                                 recorded on aug_img. Together with a layout, each line is
+                                                 cut out of the augmented image with a single warp instead
+                                                 of rotating the whole page back. Non-affine warps such as
+                                                 the deformation record none, and the lines are then found
+                                                 by rotating the page back.
         """
-        self.aug_img = aug_img
+        self.aug_img = ensure_8bit(aug_img)
         self.page_text = page_text
         self.rotation_angle = rotation_angle
         self.font_size = font_size
         self.font_path = font_path
+        self.layout = layout
+        if transform is None:
+            transform = aug_img.info.get(TRANSFORM_KEY)
+        self.transform = transform
+
+    @property
+    def aug_img(self):
+        return self._aug_img
+
+    @aug_img.setter
+    def aug_img(self, aug_img):
+        # The page array and ink profile belong to the image, so replacing the image invalidates them
+        self._aug_img = aug_img
+        self._page_array = None
+        self._ink_profile = None
+
+    def get_page_array(self):
+        """Return the augmented image as a read-only numpy array, converted once and cached.
+
+        Returns:
+            numpy.ndarray: The pixels of the augmented image.
+        """
+        if self._page_array is None:
+            self._page_array = np.asarray(self.aug_img)
+        return self._page_array
 
     def get_blank_img(self):
         """Create a blank white image with the same size as the augmented image.
@@ -29,6 +83,46 @@ class ExtractLines:
         """
         return Image.new("RGB", self.aug_img.size, config.WHITE_COLOR)
 
+    def get_white_color(self):
+        """Return white in the mode of the augmented image.
+
+        Returns:
+            int or tuple: The white color of the augmented image.
+        """
+        return ImageColor.getcolor("white", self.aug_img.mode)
+
+    @staticmethod
+    def has_ink(array):
+        """Check whether an 8-bit image array has a non-white pixel, with a single reduction.
+
+        Args:
+            array (numpy.ndarray): The pixels of an "L" or "RGB" image, where white is 255 in every channel.
+
+        Returns:
+            bool: True if any pixel is not white.
+        """
+        return array.size > 0 and array.min() < 255
+
+    def get_ink_profile(self):
+        """Return the horizontal projection profile of the augmented image.
+
+        The profile is computed once per image and cached.
+
+        Returns:
+            numpy.ndarray: The number of non-white pixels in each row of the image.
+        """
+        if self._ink_profile is None:
+            non_white = self.get_page_array() != self.get_white_color()
+            if non_white.ndim == 3:
+                non_white = non_white.any(axis=2)
+            self._ink_profile = np.count_nonzero(non_white, axis=1)
+        return self._ink_profile
+
+    def get_first_ink_row(self):
+        """Return the index of the topmost row with a non-white pixel, or 0 for a blank image."""
+        ink_rows = np.flatnonzero(self.get_ink_profile())
+        return ink_rows[0].item() if ink_rows.size > 0 else 0
+
     def get_max_width(self, lines, blank_img, font):
         """Determine the maximum width of the lines of text and their bounding boxes.
 
@@ -43,18 +137,14 @@ class ExtractLines:
         """
         max_width = 0
         line_bboxes = []
-        # Find the topmost position of the text after rotation
-        non_white_pixels = np.where(np.array(self.aug_img) != config.WHITE_COLOR)
-        y = max(
-            np.min(non_white_pixels[0]).item() if non_white_pixels[0].size > 0 else 0,
-            config.TOP_PADDING,
-        )  # Start position for the first line
+        # Find the topmost position of the text after rotation, the start position for the first line
+        y = max(self.get_first_ink_row(), config.TOP_PADDING)
 
+        # Measuring does not draw, so one drawing context on the blank image serves every line
+        draw = ImageDraw.Draw(blank_img)
         for line in lines:
-            # Draw the line on the blank image to calculate the bounding box
-            temp_img = blank_img.copy()
-            temp_draw = ImageDraw.Draw(temp_img)
-            line_bbox = temp_draw.textbbox((config.LEFT_PADDING, y), line, font=font)
+            # Calculate the bounding box of the line
+            line_bbox = draw.textbbox((config.LEFT_PADDING, y), line, font=font)
 
             if line_bbox[2] > line_bbox[0] and line_bbox[3] > line_bbox[1]:
                 width = line_bbox[2] - line_bbox[0]
@@ -65,6 +155,71 @@ class ExtractLines:
             y += line_bbox[3] - line_bbox[1]
         return max_width, line_bboxes
 
+    def get_layout_line_bboxes(self):
+        """Determine the maximum width of the lines and their bounding boxes from the page layout.
+
+        Without a transform, the page is assumed to be centered in the augmented image, which holds after
+        the rotation is undone with an expanded canvas. With a transform, the boxes are left in page
+        coordinates.
+
+        Returns:
+            tuple: The maximum width of the lines and a list of tuples, each containing a
+            line of text and its bounding box.
+        """
+        x_offset = y_offset = 0
+        if self.transform is None:
+            page_width, page_height = self.layout.size
+            x_offset = (self.aug_img.width - page_width) // 2
+            y_offset = (self.aug_img.height - page_height) // 2
+        max_width = 0
+        line_bboxes = []
+        for line in self.layout.lines:
+            if line.width > 0 and line.height > 0:
+                left, top, right, bottom = line.bbox
+                line_bbox = (
+                    left + x_offset,
+                    top + y_offset,
+                    right + x_offset,
+                    bottom + y_offset,
+                )
+                max_width = max(max_width, line.width)
+                line_bboxes.append((line.text, line_bbox))
+        return max_width, line_bboxes
+
+    def get_page_line_bboxes(self):
+        """Determine the maximum width of the lines and their bounding boxes on the augmented image.
+
+        The boxes come from the page layout when one was given, otherwise the text is measured.
+
+        Returns:
+            tuple: The maximum width of the lines and a list of tuples, each containing a
+            line of text and its bounding box.
+        """
+        if self.layout is not None:
+            return self.get_layout_line_bboxes()
+        lines = self.page_text.split("\n")
+        font = get_font(self.font_path, self.font_size, config.FONT_ENCODING)
+        # Measuring only needs an image of the right mode, not one of the page size
+        blank_img = Image.new("RGB", config.DUMMY_IMAGE_SIZE, config.WHITE_COLOR)
+        return self.get_max_width(lines, blank_img, font)
+
+    def get_crop_box(self, bbox, max_width):
+        """Adjust the bounding box of a line to the width shared by every line.
+
+        Args:
+            bbox (tuple): The (x1, y1, x2, y2) bounding box of the line.
+            max_width (int): The maximum width of the lines.
+
+        Returns:
+            tuple: The (x1, y1, x2, y2) crop box of the line.
+        """
+        x1, y1, x2, y2 = bbox
+        if self.rotation_angle != 0:
+            x2 = x1 + (max_width + 10)
+        else:
+            x2 = x1 + max_width
+        return x1, y1, x2, y2
+
     def get_line_images(self, max_width, line_bboxes):
         """Extract images of each line of text based on their bounding boxes.
 
@@ -74,33 +229,128 @@ class ExtractLines:
         Returns:
             list of PIL.Image.Image: A list of images, each containing a line of text.
         """
-        line_images = []
-        non_white_pixels = np.where(np.array(self.aug_img) != config.WHITE_COLOR)
-        y = max(
-            np.min(non_white_pixels[0]).item() if non_white_pixels[0].size > 0 else 0,
-            config.TOP_PADDING,
-        )  # Start position for the first line
+        return [
+            line_image
+            for line_image, _ in self.iter_line_images(max_width, line_bboxes)
+        ]
+
+    def iter_line_images(self, max_width, line_bboxes):
+        """Extract images of each line of text based on their bounding boxes, along with their text.
 
+        Args:
+            max_width (int): The maximum width of the lines.
+            line_bboxes (list of tuples): A list of tuples, each containing a line of text and its bounding box.
+        Yields:
+            tuple: The image of a line and its text.
+        """
+        page_np = self.get_page_array()
+        height, width = page_np.shape[:2]
         for line, bbox in line_bboxes:
-            # Adjust bounding box width to max_width
-            x1, y1, x2, y2 = bbox
+            crop_box = self.get_crop_box(bbox, max_width)
+            x1, y1, x2, y2 = crop_box
+
+            # Check if there are non-white pixels. Crops reaching outside the image are padded with
+            # black, so they always have some.
+            inside = x1 >= 0 and y1 >= 0 and x2 <= width and y2 <= height
+            if not inside or self.has_ink(page_np[y1:y2, x1:x2]):
+                yield self.aug_img.crop(crop_box).convert("RGB"), line
+
+    def get_line_arrays(self, max_width, line_bboxes):
+        """Extract each line of text as a view into a single array of the augmented image.
+
+        No pixels are copied. The crop boxes are clipped to the image and lines without ink are left out.
+
+        Args:
+            max_width (int): The maximum width of the lines.
+            line_bboxes (list of tuples): A list of tuples, each containing a line of text and its bounding box.
+        Returns:
+            list of numpy.ndarray: A list of read-only arrays, each containing a line of text.
+        """
+        line_arrays = []
+        page_np = self.get_page_array()
+        for _, bbox in line_bboxes:
+            x1, y1, x2, y2 = (
+                max(value, 0) for value in self.get_crop_box(bbox, max_width)
+            )
+            line_np = page_np[y1:y2, x1:x2]
+            if self.has_ink(line_np):
+                line_arrays.append(line_np)
+        return line_arrays
+
+    def get_line_quads(self):
+        """Map the bounding boxes of the layout lines into the augmented image.
+
+        Returns:
+            list of tuples: A list of tuples, each containing a line of text and the (4, 2) array of the
+            top-left, top-right, bottom-right and bottom-left corners of its box in the augmented image.
+        """
+        line_quads = []
+        for line in self.layout.lines:
+            if line.width > 0 and line.height > 0:
+                left, top, right, bottom = line.bbox
+                corners = [(left, top), (right, top), (right, bottom), (left, bottom)]
+                line_quads.append(
+                    (line.text, transform_points(self.transform, corners))
+                )
+        return line_quads
+
+    def warp_line_images(self):
+        """Extract the lines of the layout from the augmented image with one warp per line.
+
+        Each line is mapped from the augmented image back onto its crop box on the page and, with a
+        rotation angle, rotated again in the same warp, so no full-page resampling is needed.
+
+        Returns:
+           list of PIL.Image.Image: A list of images, each containing a line of text.
+        """
+        return [line_image for line_image, _ in self.iter_warped_line_images()]
+
+    def iter_warped_line_images(self):
+        """Extract the lines of the layout with one warp per line, along with their text.
+
+        Yields:
+            tuple: The image of a line and its text.
+        """
+        page_np = self.get_page_array()
+        white = self.get_white_color()
+        to_page = np.linalg.inv(self.transform)
+        max_width, line_bboxes = self.get_layout_line_bboxes()
+        for line, bbox in line_bboxes:
+            x1, y1, x2, y2 = self.get_crop_box(bbox, max_width)
+            size = (x2 - x1, y2 - y1)
+            matrix = translation_matrix(-x1, -y1) @ to_page
+            inside = None
             if self.rotation_angle != 0:
-                x2 = x1 + (max_width + 10)
-            else:
-                x2 = x1 + max_width
+                rotation, rotated_size = rotation_matrix(size, self.rotation_angle)
+                matrix = rotation @ matrix
+                corners = [
+                    (0, 0),
+                    (size[0] - 1, 0),
+                    (size[0] - 1, size[1] - 1),
+                    (0, size[1] - 1),
+                ]
+                quad = np.round(transform_points(rotation, corners)).astype(np.int32)
+                inside = np.zeros(rotated_size[::-1], dtype=np.uint8)
+                cv2.fillConvexPoly(inside, quad, 1)
+                size = rotated_size
 
-            # Crop the original image based on the adjusted bounding box
-            line_aug_img = self.aug_img.crop((x1, y1, x2, y2))
-            line_aug_img = line_aug_img.convert("RGB")
-            line_aug_img_np = np.array(line_aug_img)
+            warp_options = {
+                "flags": WARP_INTERPOLATIONS[config.LINE_WARP_INTERPOLATION],
+                "borderMode": cv2.BORDER_CONSTANT,
+                "borderValue": white,
+            }
+            if np.allclose(matrix[2], (0, 0, 1)):
+                # Rotations, flips and transposes are affine, which is cheaper to warp
+                line_np = cv2.warpAffine(page_np, matrix[:2], size, **warp_options)
+            else:
+                line_np = cv2.warpPerspective(page_np, matrix, size, **warp_options)
+            if inside is not None:
+                # Like a rotated crop, everything outside the rotated crop box is white
+                line_np = cv2.copyTo(line_np, inside, np.full_like(line_np, 255))
 
             # Check if there are non-white pixels
-            if np.any(line_aug_img_np != [255, 255, 255]):
-                line_images.append(line_aug_img)
-
-            # Move to the next line position
-            y += bbox[3] - bbox[1]
-        return line_images
+            if self.has_ink(line_np):
+                yield Image.fromarray(line_np).convert("RGB"), line
 
     def extract_lines(self):
         """Extract individual line images from the augmented image.
@@ -108,28 +358,49 @@ class ExtractLines:
         Returns:
            list of PIL.Image.Image: A list of images, each containing a line of text.
         """
+        return [line_image for line_image, _ in self.extract_labeled_lines()]
+
+    def extract_labeled_lines(self):
+        """Extract individual line images from the augmented image, along with the text of each line.
+
+        Returns:
+           list of tuples: A list of tuples, each containing the image of a line and its text.
+        """
+        if self.layout is not None and self.transform is not None:
+            return list(self.iter_warped_line_images())
+
         if self.rotation_angle != 0:
             self.aug_img = self.aug_img.rotate(
-                -self.rotation_angle, expand=True, fillcolor=config.WHITE_COLOR
+                -self.rotation_angle, expand=True, fillcolor="white"
             )
 
-        lines = self.page_text.split("\n")
-        font = ImageFont.truetype(
-            self.font_path, self.font_size, encoding=config.FONT_ENCODING
-        )
-
-        # Create a blank image to draw text
-        blank_img = self.get_blank_img()
         # Determine the maximum width
-        max_width, line_bboxes = self.get_max_width(lines, blank_img, font)
+        max_width, line_bboxes = self.get_page_line_bboxes()
 
         # Extract lines with the maximum width
-        line_images = self.get_line_images(max_width, line_bboxes)
+        labeled_lines = list(self.iter_line_images(max_width, line_bboxes))
 
         if self.rotation_angle != 0:
-            for i in range(len(line_images)):
-                line_images[i] = line_images[i].rotate(
-                    self.rotation_angle, expand=True, fillcolor=config.WHITE_COLOR
+            for i, (line_image, line) in enumerate(labeled_lines):
+                line_image = line_image.rotate(
+                    self.rotation_angle, expand=True, fillcolor="white"
                 )
+                labeled_lines[i] = (line_image, line)
 
-        return line_images
+        return labeled_lines
+
+    def extract_line_arrays(self):
+        """Extract individual lines from the augmented image as numpy arrays.
+
+        Without rotation, the lines are views into a single array of the image, in the mode of the image.
+        Rotated or warped lines are returned as new RGB arrays.
+
+        Returns:
+           list of numpy.ndarray: A list of arrays, each containing a line of text.
+        """
+        if self.rotation_angle != 0 or (
+            self.layout is not None and self.transform is not None
+        ):
+            return [np.asarray(line_image) for line_image in self.extract_lines()]
+        max_width, line_bboxes = self.get_page_line_bboxes()
+        return self.get_line_arrays(max_width, line_bboxes)
@@ -0,0 +1,185 @@
+import itertools
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from functools import partial
+
+import numpy as np
+from PIL import Image
+
+import SynthImage.config as config
+
+BACKGROUND_FITS = ("stretch", "tile")
+
+
+def composite_text(background, coverage, text_color):
+    """Alpha blends text onto a background.
+
+    For black text this is the same as multiplying the background with the inverted coverage.
+
+    Args:
+        background (numpy.ndarray): The background as a uint8 array of shape (height, width) or
+                                    (height, width, channels).
+        coverage (numpy.ndarray): The text coverage as a uint8 array of shape (height, width), 255 where
+                                  the text is fully opaque.
+        text_color (int or tuple): The text color, with one value per background channel.
+
+    Returns:
+        numpy.ndarray: The composited page as a uint8 array with the shape of the background.
+    """
+    alpha = coverage.astype(np.uint16)
+    if background.ndim == 3:
+        alpha = alpha[..., np.newaxis]
+    text_color = np.asarray(text_color, dtype=np.uint16)
+    blended = background * (255 - alpha)
+    blended += text_color * alpha
+    blended += 127
+    blended //= 255
+    return blended.astype(np.uint8)
+
+
+class BackgroundCache:
+    def __init__(self, max_bytes: int = config.BACKGROUND_CACHE_BYTES):
+        """Initialize the BackgroundCache object.
+
+        Background images are decoded once and kept as numpy arrays, along with the stretched copies
+        made for each page size. Paths are keyed by the path, in-memory images by a token of their own,
+        which is not reused like their id and does not keep them alive.
+
+        Args:
+            max_bytes (int, optional): The maximum total size of the cached arrays. The least recently
+                                       used arrays are evicted once the cache is full.
+                                       Defaults to config.BACKGROUND_CACHE_BYTES.
+        """
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._arrays = OrderedDict()
+        self._lock = threading.Lock()
+        # The token of each in-memory image, by id, with a weak reference that tells reused ids apart
+        self._image_tokens = {}
+        self._next_token = itertools.count()
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._arrays.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._arrays.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def _put(self, key, array):
+        array.flags.writeable = False
+        with self._lock:
+            if key not in self._arrays:
+                self._arrays[key] = array
+                self.nbytes += array.nbytes
+            while self.nbytes > self.max_bytes and self._arrays:
+                _, evicted_array = self._arrays.popitem(last=False)
+                self.nbytes -= evicted_array.nbytes
+        return array
+
+    def _source_key(self, source):
+        if not isinstance(source, Image.Image):
+            return os.fspath(source)
+        # Ids are reused once an image is garbage collected, tokens are never reused
+        with self._lock:
+            image_ref, token = self._image_tokens.get(id(source), (None, None))
+            if image_ref is None or image_ref() is not source:
+                image_ref = weakref.ref(source, partial(self._forget_image, id(source)))
+                token = next(self._next_token)
+                self._image_tokens[id(source)] = (image_ref, token)
+        return ("image", token)
+
+    def _forget_image(self, image_id, image_ref):
+        # Called by the garbage collector, possibly while this thread holds the lock, so without it. At
+        # worst the token of a new image with the same id is dropped, and its arrays are decoded again.
+        if self._image_tokens.get(image_id, (None, None))[0] is image_ref:
+            self._image_tokens.pop(image_id, None)
+
+    def get_decoded(self, source, mode):
+        """Return a background image decoded into a numpy array.
+
+        Args:
+            source (str, os.PathLike or PIL.Image.Image): The background image or its path.
+            mode (str): The image mode of the array, e.g. "RGB" or "L".
+
+        Returns:
+            numpy.ndarray: The read-only background array.
+        """
+        key = ("decoded", self._source_key(source), mode)
+        array = self._get(key)
+        if array is not None:
+            return array
+        if isinstance(source, Image.Image):
+            background_img = source.convert(mode)
+        else:
+            with Image.open(source) as source_img:
+                background_img = source_img.convert(mode)
+        return self._put(key, np.array(background_img))
+
+    def get_background(self, source, size, mode, fit=config.BACKGROUND_FIT):
+        """Return a background of the given size.
+
+        Args:
+            source (str, os.PathLike or PIL.Image.Image): The background image or its path.
+            size (tuple): The (width, height) of the page.
+            mode (str): The image mode of the array, e.g. "RGB" or "L".
+            fit (str, optional): "stretch" resizes the background to the page, "tile" repeats it at its
+                                 own size. Defaults to config.BACKGROUND_FIT.
+
+        Returns:
+            numpy.ndarray: The read-only background array of shape (height, width[, channels]).
+        """
+        if fit not in BACKGROUND_FITS:
+            raise ValueError(f"fit must be one of {BACKGROUND_FITS}, got {fit!r}")
+        width, height = size
+        decoded = self.get_decoded(source, mode)
+        if fit == "tile":
+            rows = np.arange(height) % decoded.shape[0]
+            columns = np.arange(width) % decoded.shape[1]
+            return decoded[rows[:, np.newaxis], columns]
+
+        key = ("stretch", self._source_key(source), mode, size)
+        array = self._get(key)
+        if array is not None:
+            return array
+        stretched = Image.fromarray(decoded).resize(size, Image.Resampling.BILINEAR)
+        return self._put(key, np.array(stretched))
+
+    def __getstate__(self):
+        # Caches are sent to worker processes empty, each worker fills its own
+        return {"max_bytes": self.max_bytes}
+
+    def __setstate__(self, state):
+        self.__init__(state["max_bytes"])
+
+    def clear(self):
+        """Remove every background from the cache and reset the hit/miss counters."""
+        with self._lock:
+            self._arrays.clear()
+            self.nbytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Return the cache statistics.
+
+        Returns:
+            dict: The number of hits, misses and cached arrays, and the cached and maximum bytes.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "arrays": len(self._arrays),
+                "bytes": self.nbytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+background_cache = BackgroundCache()
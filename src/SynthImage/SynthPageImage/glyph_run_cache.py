@@ -0,0 +1,186 @@
+import re
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+import SynthImage.config as config
+
+# A run ends after a tsheg, a shad or a space, so stacked clusters never straddle two runs
+RUN_BOUNDARY = re.compile(r"(?<=[་།༎ ])")
+
+
+def split_runs(text):
+    """Splits a line of Tibetan text into syllable runs, keeping each delimiter with its syllable.
+
+    Args:
+        text (str): The line of text.
+
+    Returns:
+        list of str: The runs, which concatenate back to the line.
+    """
+    return [run for run in RUN_BOUNDARY.split(text) if run]
+
+
+class GlyphRun:
+    def __init__(self, mask, offset, advance):
+        """Initialize the GlyphRun object.
+
+        Args:
+            mask (numpy.ndarray): The rasterized coverage of the run as a 2D uint8 array.
+            offset (tuple): The (x, y) position of the mask relative to the pen position.
+            advance (float): The horizontal distance the pen moves after the run.
+        """
+        self.mask = mask
+        self.offset = offset
+        self.advance = advance
+
+    @property
+    def nbytes(self):
+        return self.mask.nbytes
+
+
+class GlyphRunCache:
+    def __init__(self, max_bytes: int = config.GLYPH_RUN_CACHE_BYTES):
+        """Initialize the GlyphRunCache object.
+
+        Text drawn through the cache is split into syllable runs, and each run is shaped and rasterized
+        once per font. Lines are composited from the cached run bitmaps, placing each run at the rounded
+        sum of the advances before it. Compared with drawing the full line with ImageDraw.text, a run
+        can land up to one pixel away from its position in the full line.
+
+        Args:
+            max_bytes (int, optional): The maximum total size of the cached run bitmaps. The least
+                                       recently used runs are evicted once the cache is full.
+                                       Defaults to config.GLYPH_RUN_CACHE_BYTES.
+        """
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._runs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_run(self, font, run, fontmode="L"):
+        """Return the rasterized run, shaping and rasterizing it on a cache miss.
+
+        Args:
+            font (PIL.ImageFont.FreeTypeFont): The font of the run.
+            run (str): The text of the run.
+            fontmode (str, optional): "L" for antialiased or "1" for bilevel rasterization. Defaults to "L".
+
+        Returns:
+            GlyphRun: The run bitmap, its offset and its advance.
+        """
+        key = (font.path, font.size, font.index, font.encoding, fontmode, run)
+        with self._lock:
+            glyph_run = self._runs.get(key)
+            if glyph_run is not None:
+                self._runs.move_to_end(key)
+                self.hits += 1
+                return glyph_run
+            self.misses += 1
+
+        glyph_run = self.rasterize_run(font, run, fontmode)
+        with self._lock:
+            if key not in self._runs:
+                self._runs[key] = glyph_run
+                self.nbytes += glyph_run.nbytes
+            while self.nbytes > self.max_bytes and self._runs:
+                _, evicted_run = self._runs.popitem(last=False)
+                self.nbytes -= evicted_run.nbytes
+        return glyph_run
+
+    @staticmethod
+    def rasterize_run(font, run, fontmode="L"):
+        """Shapes and rasterizes a run of text.
+
+        Args:
+            font (PIL.ImageFont.FreeTypeFont): The font of the run.
+            run (str): The text of the run.
+            fontmode (str, optional): "L" for antialiased or "1" for bilevel rasterization. Defaults to "L".
+
+        Returns:
+            GlyphRun: The run bitmap, its offset and its advance.
+        """
+        left, top, right, bottom = font.getbbox(run, mode=fontmode)
+        run_img = Image.new("L", (max(right - left, 0), max(bottom - top, 0)), 0)
+        if run_img.width and run_img.height:
+            draw = ImageDraw.Draw(run_img)
+            draw.fontmode = fontmode
+            draw.text((-left, -top), run, font=font, fill=255)
+        advance = font.getlength(run, mode=fontmode)
+        return GlyphRun(np.asarray(run_img), (left, top), advance)
+
+    def draw_text(self, image, origin, text, font, fill):
+        """Draws a line of text onto an image from the cached run bitmaps.
+
+        Args:
+            image (PIL.Image.Image): The image to draw on.
+            origin (tuple): The (x, y) position of the line, as for ImageDraw.text.
+            text (str): The line of text.
+            font (PIL.ImageFont.FreeTypeFont): The font of the text.
+            fill: The text color, in the image's mode.
+        """
+        fontmode = "1" if image.mode == "1" else "L"
+        placed_runs = []
+        pen = 0.0
+        for run in split_runs(text):
+            glyph_run = self.get_run(font, run, fontmode)
+            if glyph_run.mask.size:
+                x = round(pen) + glyph_run.offset[0]
+                placed_runs.append((x, glyph_run.offset[1], glyph_run.mask))
+            pen += glyph_run.advance
+        if not placed_runs:
+            return
+
+        # Composite the runs into one coverage mask for the line, keeping the darkest coverage where
+        # runs overlap, the same way FreeType glyphs are combined when a full line is rasterized
+        left = min(x for x, _, _ in placed_runs)
+        top = min(y for _, y, _ in placed_runs)
+        right = max(x + mask.shape[1] for x, _, mask in placed_runs)
+        bottom = max(y + mask.shape[0] for _, y, mask in placed_runs)
+        coverage = np.zeros((bottom - top, right - left), dtype=np.uint8)
+        for x, y, mask in placed_runs:
+            row, column = y - top, x - left
+            row_end, column_end = row + mask.shape[0], column + mask.shape[1]
+            region = coverage[row:row_end, column:column_end]
+            np.maximum(region, mask, out=region)
+
+        image.paste(
+            fill, (origin[0] + left, origin[1] + top), Image.fromarray(coverage)
+        )
+
+    def __getstate__(self):
+        # Caches are sent to worker processes empty, each worker fills its own
+        return {"max_bytes": self.max_bytes}
+
+    def __setstate__(self, state):
+        self.__init__(state["max_bytes"])
+
+    def clear(self):
+        """Remove every run from the cache and reset the hit/miss counters."""
+        with self._lock:
+            self._runs.clear()
+            self.nbytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Return the cache statistics.
+
+        Returns:
+            dict: The number of hits, misses and cached runs, and the cached and maximum bytes.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "runs": len(self._runs),
+                "bytes": self.nbytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def __len__(self):
+        return len(self._runs)
@@ -1,6 +1,54 @@
-from PIL import Image, ImageDraw, ImageFont
+import numpy as np
+from PIL import Image, ImageDraw
 
 import SynthImage.config as config
+from SynthImage.font_cache import get_font
+from SynthImage.parallel import imap_bounded
+from SynthImage.SynthPageImage.background import (
+    background_cache as default_background_cache,
+)
+from SynthImage.SynthPageImage.background import composite_text
+from SynthImage.SynthPageImage.page_layout import LineLayout, PageLayout
+from SynthImage.SynthPageImage.volume_reader import iter_volume_pages
+
+
+def convert_color(color, mode):
+    """Converts an RGB color tuple to the equivalent color of another image mode.
+
+    Args:
+        color (tuple or str): An RGB color tuple or a color name.
+        mode (str): The image mode, e.g. "L", "1" or "RGB".
+
+    Returns:
+        int, tuple or str: The color in the given mode. Color names are returned unchanged.
+    """
+    if isinstance(color, str) or mode == "RGB":
+        return color
+    return Image.new("RGB", (1, 1), color).convert(mode).getpixel((0, 0))
+
+
+def crop_background(background, box):
+    """Crops a box out of a background array, mirroring the background where the box extends past it.
+
+    Args:
+        background (numpy.ndarray): The background array of shape (height, width[, channels]).
+        box (tuple): The (left, top, right, bottom) box to crop.
+
+    Returns:
+        numpy.ndarray: The crop, of shape (bottom - top, right - left[, channels]).
+    """
+    left, top, right, bottom = box
+    height, width = background.shape[:2]
+    rows = slice(max(top, 0), min(bottom, height))
+    columns = slice(max(left, 0), min(right, width))
+    crop = background[rows, columns]
+    pad_width = [
+        (max(-top, 0), max(bottom - height, 0)),
+        (max(-left, 0), max(right - width, 0)),
+    ] + [(0, 0)] * (background.ndim - 2)
+    if any(before or after for before, after in pad_width):
+        crop = np.pad(crop, pad_width, mode="symmetric")
+    return crop
 
 
 class PageGenerator:
@@ -13,7 +61,16 @@ class PageGenerator:
         top_padding,
         bottom_padding,
         background_image=None,
+        glyph_run_cache=None,
+        image_mode=config.DUMMY_IMAGE_MODE,
+        background_fit=config.BACKGROUND_FIT,
+        background_cache=None,
+        seed=None,
     ) -> None:
+        if image_mode not in config.PAGE_IMAGE_MODES:
+            raise ValueError(
+                f"image_mode must be one of {config.PAGE_IMAGE_MODES}, got {image_mode!r}"
+            )
         self.font_size = font_size
         self.font_path = font_path
         self.right_padding = right_padding
@@ -21,14 +78,28 @@ class PageGenerator:
         self.top_padding = top_padding
         self.bottom_padding = bottom_padding
         self.background_image = background_image
+        self.background_fit = background_fit
+        self.background_cache = background_cache or default_background_cache
+        self.glyph_run_cache = glyph_run_cache
         self.extra_padding = config.EXTRA_PADDING
-        self.dummy_image_mode = config.DUMMY_IMAGE_MODE
+        self.image_mode = image_mode
         self.dummy_image_size = config.DUMMY_IMAGE_SIZE
         self.background_color = config.BACKGROUND_COLOR
-        self.text_color = config.TEXT_COLOR
+        self.text_color = convert_color(config.TEXT_COLOR, image_mode)
         self.encoding = config.FONT_ENCODING
         self.text_bbox_x = config.TEXT_BBOX_X
         self.text_bbox_y = config.TEXT_BBOX_Y
+        # Every page draws its augmentations from its own generator derived from this seed, so any page
+        # of a run can be reproduced alone
+        self.seed = np.random.SeedSequence(seed).entropy
+
+    def load_font(self):
+        """Loads the page font from the process-wide font cache.
+
+        Returns:
+            PIL.ImageFont.FreeTypeFont: The font used to render the pages.
+        """
+        return get_font(self.font_path, self.font_size, self.encoding)
 
     def get_pages(self, vol_text):
         """Segments all the page text from the volume text.
@@ -42,65 +113,331 @@ class PageGenerator:
         pages = vol_text.split("\n\n")
         return pages
 
-    def calculate_image_dimension(self, text):
-        """Calculates the image dimensions.
+    def iter_pages(self, source, encoding=config.VOLUME_ENCODING, use_mmap=False):
+        """Lazily segments the page texts of a volume without loading the whole volume into memory.
+
+        Args:
+            source (str, os.PathLike or file object): The path to a plain, gzip, bz2 or xz volume file,
+                                                      or an open text or binary file object.
+            encoding (str, optional): The text encoding of the volume. Defaults to config.VOLUME_ENCODING.
+            use_mmap (bool, optional): Memory-map plain volume files instead of reading them in chunks.
+                                       Defaults to False.
+
+        Returns:
+            generator: The page texts, the same as get_pages returns for the whole volume text.
+        """
+        return iter_volume_pages(source, encoding=encoding, use_mmap=use_mmap)
+
+    def layout_page(self, text):
+        """Shapes and measures every line of the text once and places it on the page.
 
         Args:
             text (str): Text that will be rendered into the image.
 
         Returns:
-            tuple: Image dimensions (width, height).
+            PageLayout: The page size together with the origin, bounding box and baseline of each line.
         """
-        dummy_image = Image.new(self.dummy_image_mode, self.dummy_image_size)
+        # Measure on an image of the page mode, which decides whether the text is antialiased
+        dummy_image = Image.new(self.image_mode, self.dummy_image_size)
         draw = ImageDraw.Draw(dummy_image)
-        font = ImageFont.truetype(
-            self.font_path, self.font_size, encoding=self.encoding
-        )
-        lines = text.split("\n")
+        font = self.load_font()
+        ascent, _ = font.getmetrics()
         horizontal_padding = self.right_padding + self.left_padding
         vertical_padding = self.top_padding + self.bottom_padding
 
-        # Use constants for the text bounding box coordinates
-        max_width = max(
-            draw.textbbox((self.text_bbox_x, self.text_bbox_y), line, font=font)[2]
-            for line in lines
-        )
-        total_height = (
-            sum(
-                draw.textbbox((self.text_bbox_x, self.text_bbox_y), line, font=font)[3]
-                - draw.textbbox((self.text_bbox_x, self.text_bbox_y), line, font=font)[
-                    1
-                ]
-                for line in lines
+        max_width = 0
+        total_height = 0
+        lines = []
+        y = self.top_padding
+        for line in text.split("\n"):
+            # Use constants for the text bounding box coordinates
+            left, top, right, bottom = draw.textbbox(
+                (self.text_bbox_x, self.text_bbox_y), line, font=font
             )
-            + self.extra_padding
-        )
-        return (
+            x_shift = self.left_padding - self.text_bbox_x
+            y_shift = y - self.text_bbox_y
+            lines.append(
+                LineLayout(
+                    text=line,
+                    origin=(self.left_padding, y),
+                    bbox=(
+                        left + x_shift,
+                        top + y_shift,
+                        right + x_shift,
+                        bottom + y_shift,
+                    ),
+                    baseline=y + ascent,
+                )
+            )
+            max_width = max(max_width, right)
+            total_height += bottom - top
+            y += bottom - top
+
+        size = (
             max_width + horizontal_padding,
-            total_height + vertical_padding,
+            total_height + self.extra_padding + vertical_padding,
         )
+        return PageLayout(size, lines)
+
+    def calculate_image_dimension(self, text):
+        """Calculates the image dimensions.
+
+        Args:
+            text (str): Text that will be rendered into the image.
+
+        Returns:
+            tuple: Image dimensions (width, height).
+        """
+        return self.layout_page(text).size
 
-    def generate_page_image(self, page_text):
+    def generate_page_image(self, page_text, layout=None, return_layout=False):
         """Generates a synthetic page image.
 
         Args:
             page_text (str): The text content to be rendered on the image.
+            layout (PageLayout, optional): A layout of page_text from layout_page. When not given,
+                                           the page is laid out first. Defaults to None.
+            return_layout (bool, optional): Also return the layout, with the text, bounding box and
+                                            baseline of every line on the page. Defaults to False.
 
         Returns:
-            PIL.Image.Image: An Image object representing the rendered page with the provided text.
+            PIL.Image.Image or tuple: An Image object representing the rendered page with the provided text,
+            or a tuple of the image and its PageLayout when return_layout is True.
         """
-        page_image_dimension = self.calculate_image_dimension(page_text)
-        page_img = Image.new(
-            self.dummy_image_mode, page_image_dimension, color=self.background_color
+        if layout is None:
+            layout = self.layout_page(page_text)
+        page_img = self.render_layout(layout)
+        if return_layout:
+            return page_img, layout
+        return page_img
+
+    def get_page_rng(self, page_index):
+        """Returns the random generator of a page, derived from the seed of the generator and the page index.
+
+        The generator depends only on the seed and the index, not on the pages before it, the worker
+        that renders the page or the order in which pages are rendered.
+
+        Args:
+            page_index (int): The index of the page in the whole run.
+
+        Returns:
+            numpy.random.Generator: The random generator of the page.
+        """
+        return np.random.default_rng(
+            np.random.SeedSequence(self.seed, spawn_key=(page_index,))
         )
-        draw = ImageDraw.Draw(page_img)
-        font = ImageFont.truetype(
-            self.font_path, self.font_size, encoding=self.encoding
+
+    def generate_augmented_page_image(self, page_text, augment, page_index):
+        """Generates a synthetic page image and augments it with the random generator of the page.
+
+        Args:
+            page_text (str): The text content to be rendered on the image.
+            augment (callable): A function taking the page image and a numpy.random.Generator and returning
+                                the augmented image, e.g. a Pipeline or an operator.
+            page_index (int): The index of the page in the whole run, see get_page_rng.
+
+        Returns:
+            PIL.Image.Image: The augmented page image.
+        """
+        page_img = self.generate_page_image(page_text)
+        return augment(page_img, self.get_page_rng(page_index))
+
+    def render_layout(self, layout, background=None):
+        """Renders the lines of a layout onto a canvas of the layout size.
+
+        Args:
+            layout (PageLayout): The layout to render.
+            background (numpy.ndarray, optional): The background of the canvas when a background image is
+                                                  set, see generate_background_page_image.
+                                                  Defaults to None.
+
+        Returns:
+            PIL.Image.Image: The rendered image.
+        """
+        if self.background_image is not None:
+            return self.generate_background_page_image(layout, background)
+        image = Image.new(self.image_mode, layout.size, color=self.background_color)
+        self.draw_text(image, layout, self.text_color)
+        return image
+
+    def generate_line_images(
+        self, page_text, augment=None, padding=config.LINE_PADDING, layout=None
+    ):
+        """Renders each line of a page straight onto its own tight canvas.
+
+        The lines are drawn exactly as they would be on the page, but no page image is rendered and
+        no lines have to be extracted from it afterwards. With a background image, the background is
+        fitted to the page once and each line shows the part of it under the line. Blank lines are
+        skipped.
+
+        Args:
+            page_text (str): The text content of the page.
+            augment (callable, optional): A function applied to every line image, taking and returning
+                                          a PIL.Image.Image, e.g.
+                                          lambda img: BlurAugmentation(img).apply_blur().
+                                          Defaults to None.
+            padding (int, optional): The margin around the text of each line, in pixels.
+                                     Defaults to config.LINE_PADDING.
+            layout (PageLayout, optional): A layout of page_text from layout_page. When not given,
+                                           the page is laid out first. Defaults to None.
+
+        Yields:
+            tuple: The line image and the text of the line.
+        """
+        if layout is None:
+            layout = self.layout_page(page_text)
+        page_background = None
+        if self.background_image is not None:
+            page_background = self.get_background(layout.size)
+        for line in layout.lines:
+            if not line.text.strip() or line.width <= 0 or line.height <= 0:
+                continue
+            left, top = line.bbox[0] - padding, line.bbox[1] - padding
+            line_size = (line.width + 2 * padding, line.height + 2 * padding)
+            line_layout = PageLayout(line_size, [line.shift(-left, -top)])
+            line_background = None
+            if page_background is not None:
+                line_box = (left, top, left + line_size[0], top + line_size[1])
+                line_background = crop_background(page_background, line_box)
+            line_img = self.render_layout(line_layout, line_background)
+            if augment is not None:
+                line_img = augment(line_img)
+            yield line_img, line.text
+
+    def draw_text(self, image, layout, fill):
+        """Draws every line of a page layout onto an image.
+
+        Args:
+            image (PIL.Image.Image): The image to draw on.
+            layout (PageLayout): The layout of the page.
+            fill: The text color, in the image's mode.
+        """
+        draw = ImageDraw.Draw(image)
+        if self.image_mode == "1":
+            draw.fontmode = "1"
+        font = self.load_font()
+        for line in layout.lines:
+            if self.glyph_run_cache is None:
+                draw.text(line.origin, line.text, font=font, fill=fill)
+            else:
+                self.glyph_run_cache.draw_text(
+                    image, line.origin, line.text, font, fill
+                )
+
+    def get_composite_mode(self):
+        # Bilevel pages are composited in grayscale and thresholded at the end
+        return "L" if self.image_mode == "1" else self.image_mode
+
+    def get_background(self, size):
+        """Returns the background image fitted to a page size, from the background cache.
+
+        Args:
+            size (tuple): The (width, height) of the page.
+
+        Returns:
+            numpy.ndarray: The read-only background array of shape (height, width[, channels]).
+        """
+        return self.background_cache.get_background(
+            self.background_image, size, self.get_composite_mode(), self.background_fit
         )
-        y = self.top_padding
-        for line in page_text.split("\n"):
-            line_bbox = draw.textbbox((self.text_bbox_x, y), line, font=font)
-            draw.text((self.left_padding, y), line, font=font, fill=self.text_color)
-            y += line_bbox[3] - line_bbox[1]
-        page_img = page_img.convert(self.dummy_image_mode)
+
+    def generate_background_page_image(self, layout, background=None):
+        """Generates a synthetic page image with the text composited onto the background image.
+
+        Args:
+            layout (PageLayout): The layout of the page.
+            background (numpy.ndarray, optional): The background array of the layout size, e.g. a crop of
+                                                  the page background for a line. Defaults to the
+                                                  background image fitted to the layout size.
+
+        Returns:
+            PIL.Image.Image: An Image object representing the rendered page.
+        """
+        composite_mode = self.get_composite_mode()
+        coverage = Image.new("L", layout.size, 0)
+        self.draw_text(coverage, layout, 255)
+        if background is None:
+            background = self.get_background(layout.size)
+        page_np = composite_text(
+            background,
+            np.asarray(coverage),
+            convert_color(config.TEXT_COLOR, composite_mode),
+        )
+        page_img = Image.fromarray(page_np)
+        if self.image_mode == "1":
+            # Dithering would turn the paper texture into noise around the text
+            page_img = page_img.convert("1", dither=Image.Dither.NONE)
         return page_img
+
+    def generate_pages(
+        self,
+        pages,
+        workers=None,
+        chunksize=config.PAGE_CHUNK_SIZE,
+        ordered=True,
+        max_in_flight=None,
+        mp_context=None,
+        augment=None,
+        start_index=0,
+    ):
+        """Generates synthetic page images for many pages with a pool of worker processes.
+
+        Each worker loads the font once when it starts. Pages are read from the iterable only as fast
+        as the images are consumed, so memory stays bounded for arbitrarily long page streams.
+
+        Args:
+            pages (iterable of str): The text content of each page.
+            workers (int, optional): The number of worker processes. With 0 or 1, the pages are rendered
+                                     in the calling process. Defaults to os.cpu_count().
+            chunksize (int, optional): The number of pages sent to a worker at a time.
+                                       Defaults to config.PAGE_CHUNK_SIZE.
+            ordered (bool, optional): Yield the images in the order of the pages. When False, the images
+                                      are yielded as soon as they are rendered. Defaults to True.
+            max_in_flight (int, optional): The maximum number of chunks being rendered or waiting to be
+                                           consumed. Defaults to twice the number of workers.
+            mp_context (multiprocessing.context.BaseContext, optional): The multiprocessing context used
+                                                                        to start the workers. Defaults to None.
+            augment (callable, optional): A picklable function applied to every page, taking the page image
+                                          and the random generator of the page, see
+                                          generate_augmented_page_image. Defaults to None.
+            start_index (int, optional): The index of the first page in the whole run, e.g. the offset of a
+                                         shard. Defaults to 0.
+
+        Returns:
+            generator: The page images when ordered, otherwise (page index, page image) tuples.
+        """
+        results = imap_bounded(
+            _render_indexed_page,
+            enumerate(pages, start_index),
+            workers=workers,
+            chunksize=chunksize,
+            ordered=ordered,
+            max_in_flight=max_in_flight,
+            initializer=_init_page_worker,
+            initargs=(self, augment),
+            mp_context=mp_context,
+        )
+        if ordered:
+            return (page_img for _, page_img in results)
+        return results
+
+
+_worker_page_generator = None
+_worker_augment = None
+
+
+def _init_page_worker(page_generator, augment=None):
+    """Keeps the page generator and augmentation of a worker process and preloads its font."""
+    global _worker_page_generator, _worker_augment
+    _worker_page_generator = page_generator
+    _worker_augment = augment
+    page_generator.load_font()
+
+
+def _render_indexed_page(indexed_page):
+    index, page_text = indexed_page
+    if _worker_augment is None:
+        return index, _worker_page_generator.generate_page_image(page_text)
+    return index, _worker_page_generator.generate_augmented_page_image(
+        page_text, _worker_augment, index
+    )
@@ -0,0 +1,159 @@
+import json
+
+
+class LineLayout:
+    def __init__(self, text, origin, bbox, baseline):
+        """Initialize the LineLayout object.
+
+        Args:
+            text (str): The text of the line.
+            origin (tuple): The (x, y) position the line is drawn at.
+            bbox (tuple): The (left, top, right, bottom) bounding box of the line on the page.
+            baseline (int): The y coordinate of the line's baseline on the page.
+        """
+        self.text = text
+        self.origin = origin
+        self.bbox = bbox
+        self.baseline = baseline
+
+    @property
+    def width(self):
+        return self.bbox[2] - self.bbox[0]
+
+    @property
+    def height(self):
+        return self.bbox[3] - self.bbox[1]
+
+    def shift(self, dx, dy):
+        """Return a copy of the line layout moved by (dx, dy) pixels.
+
+        Args:
+            dx (int): The horizontal shift.
+            dy (int): The vertical shift.
+
+        Returns:
+            LineLayout: The moved line layout.
+        """
+        left, top, right, bottom = self.bbox
+        return LineLayout(
+            text=self.text,
+            origin=(self.origin[0] + dx, self.origin[1] + dy),
+            bbox=(left + dx, top + dy, right + dx, bottom + dy),
+            baseline=self.baseline + dy,
+        )
+
+    def to_dict(self):
+        """Return the line layout as a JSON-serializable dictionary."""
+        return {
+            "text": self.text,
+            "origin": list(self.origin),
+            "bbox": list(self.bbox),
+            "baseline": self.baseline,
+        }
+
+    @classmethod
+    def from_dict(cls, line_dict):
+        """Create a line layout from a dictionary made by to_dict."""
+        return cls(
+            text=line_dict["text"],
+            origin=tuple(line_dict["origin"]),
+            bbox=tuple(line_dict["bbox"]),
+            baseline=line_dict["baseline"],
+        )
+
+    def __repr__(self):
+        return f"LineLayout(text={self.text!r}, origin={self.origin}, bbox={self.bbox}, baseline={self.baseline})"
+
+
+class PageLayout:
+    def __init__(self, size, lines):
+        """Initialize the PageLayout object.
+
+        Args:
+            size (tuple): The (width, height) of the page canvas.
+            lines (list of LineLayout): The layout of every line of the page, top to bottom.
+        """
+        self.size = size
+        self.lines = lines
+
+    @property
+    def width(self):
+        return self.size[0]
+
+    @property
+    def height(self):
+        return self.size[1]
+
+    def to_dict(self):
+        """Return the page layout as a JSON-serializable dictionary."""
+        return {
+            "size": list(self.size),
+            "lines": [line.to_dict() for line in self.lines],
+        }
+
+    @classmethod
+    def from_dict(cls, layout_dict):
+        """Create a page layout from a dictionary made by to_dict."""
+        return cls(
+            size=tuple(layout_dict["size"]),
+            lines=[LineLayout.from_dict(line) for line in layout_dict["lines"]],
+        )
+
+    def to_json(self, **kwargs):
+        """Serialize the page layout to a JSON string.
+
+        Args:
+            **kwargs: Keyword arguments passed on to json.dumps.
+
+        Returns:
+            str: The JSON text of the layout.
+        """
+        kwargs.setdefault("ensure_ascii", False)
+        return json.dumps(self.to_dict(), **kwargs)
+
+    @classmethod
+    def from_json(cls, layout_json):
+        """Create a page layout from JSON text made by to_json."""
+        return cls.from_dict(json.loads(layout_json))
+
+    def to_arrow(self):
+        """Convert the page layout to an Arrow table with one row per line.
+
+        The page size is stored in the schema metadata. Requires the optional pyarrow dependency.
+
+        Returns:
+            pyarrow.Table: The table with the line text, origin, bounding box and baseline columns.
+        """
+        try:
+            import pyarrow as pa
+        except ImportError as e:
+            raise ImportError(
+                "pyarrow is required for Arrow output, install it with `pip install SynthImage[arrow]`"
+            ) from e
+
+        columns = {
+            "line_index": pa.array(range(len(self.lines)), type=pa.int32()),
+            "text": pa.array([line.text for line in self.lines], type=pa.string()),
+        }
+        for name, index in [("origin_x", 0), ("origin_y", 1)]:
+            columns[name] = pa.array(
+                [line.origin[index] for line in self.lines], type=pa.int32()
+            )
+        for name, index in [("left", 0), ("top", 1), ("right", 2), ("bottom", 3)]:
+            columns[name] = pa.array(
+                [line.bbox[index] for line in self.lines], type=pa.int32()
+            )
+        columns["baseline"] = pa.array(
+            [line.baseline for line in self.lines], type=pa.int32()
+        )
+        metadata = {"width": str(self.width), "height": str(self.height)}
+        return pa.table(columns, metadata=metadata)
+
+    def __len__(self):
+        return len(self.lines)
+
+    def __iter__(self):
+        return iter(self.lines)
+
+    def __repr__(self):
+        return f"PageLayout(size={self.size}, lines={len(self.lines)})"
@@ -0,0 +1,162 @@
+import bz2
+import gzip
+import itertools
+import lzma
+import mmap
+import os
+
+import SynthImage.config as config
+
+PAGE_SEPARATOR = "\n\n"
+
+COMPRESSED_OPENERS = (
+    (b"\x1f\x8b", gzip.open),
+    (b"BZh", bz2.open),
+    (b"\xfd7zXZ\x00", lzma.open),
+)
+
+
+def split_chunks(chunks, separator):
+    """Splits a stream of text or byte chunks on a separator, one piece at a time.
+
+    The pieces are the same as the ones str.split would return for the concatenated chunks, but only
+    the piece currently being read is held in memory.
+
+    Args:
+        chunks (iterable): The str or bytes chunks of the stream, in order.
+        separator (str or bytes): The separator between pieces, of the same type as the chunks.
+
+    Yields:
+        str or bytes: The pieces of the stream.
+    """
+    buffer = separator[:0]
+    for chunk in chunks:
+        buffer += chunk
+        start = 0
+        end = buffer.find(separator, start)
+        while end != -1:
+            yield buffer[start:end]
+            start = end + len(separator)
+            end = buffer.find(separator, start)
+        buffer = buffer[start:]
+    yield buffer
+
+
+def iter_chunks(file_obj, chunk_size=config.VOLUME_READ_CHUNK_SIZE):
+    """Reads a file object chunk by chunk.
+
+    Args:
+        file_obj (file object): The text or binary file to read.
+        chunk_size (int, optional): The size of each read. Defaults to config.VOLUME_READ_CHUNK_SIZE.
+
+    Yields:
+        str or bytes: The chunks of the file.
+    """
+    while True:
+        chunk = file_obj.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def get_volume_opener(path):
+    """Picks the function that opens a volume file, detecting gzip, bz2 and xz compression.
+
+    The compression is detected from the magic bytes at the start of the file, not from its extension.
+
+    Args:
+        path (str or os.PathLike): The path to the volume file.
+
+    Returns:
+        callable: gzip.open, bz2.open, lzma.open or open for uncompressed files.
+    """
+    with open(path, "rb") as volume_file:
+        magic = volume_file.read(6)
+    for signature, opener in COMPRESSED_OPENERS:
+        if magic.startswith(signature):
+            return opener
+    return open
+
+
+def iter_mmap_pages(path, encoding=config.VOLUME_ENCODING):
+    """Yields the pages of a plain text volume through a memory map of the file.
+
+    Args:
+        path (str or os.PathLike): The path to the uncompressed volume file.
+        encoding (str, optional): The text encoding of the volume. Defaults to config.VOLUME_ENCODING.
+
+    Yields:
+        str: The text of each page.
+    """
+    separator = PAGE_SEPARATOR.encode(encoding)
+    with open(path, "rb") as volume_file:
+        if os.fstat(volume_file.fileno()).st_size == 0:
+            yield ""
+            return
+        with mmap.mmap(volume_file.fileno(), 0, access=mmap.ACCESS_READ) as volume:
+            start = 0
+            end = volume.find(separator, start)
+            while end != -1:
+                yield volume[start:end].decode(encoding)
+                start = end + len(separator)
+                end = volume.find(separator, start)
+            yield volume[start:].decode(encoding)
+
+
+def iter_file_pages(
+    file_obj, encoding=config.VOLUME_ENCODING, chunk_size=config.VOLUME_READ_CHUNK_SIZE
+):
+    """Lazily segments the page texts of an open volume file.
+
+    Args:
+        file_obj (file object): An open text or binary volume file.
+        encoding (str, optional): The text encoding of a binary file. Defaults to config.VOLUME_ENCODING.
+        chunk_size (int, optional): The size of each read. Defaults to config.VOLUME_READ_CHUNK_SIZE.
+
+    Yields:
+        str: The text of each page.
+    """
+    chunks = iter_chunks(file_obj, chunk_size)
+    first_chunk = next(chunks, "")
+    chunks = itertools.chain([first_chunk], chunks)
+    if isinstance(first_chunk, str):
+        yield from split_chunks(chunks, PAGE_SEPARATOR)
+        return
+    for page in split_chunks(chunks, PAGE_SEPARATOR.encode(encoding)):
+        yield page.decode(encoding)
+
+
+def iter_volume_pages(
+    source,
+    encoding=config.VOLUME_ENCODING,
+    chunk_size=config.VOLUME_READ_CHUNK_SIZE,
+    use_mmap=False,
+):
+    """Lazily segments the page texts of a volume, splitting on blank lines.
+
+    The pages are the same as PageGenerator.get_pages returns for the whole volume text, but the volume
+    is read incrementally so memory use does not grow with the size of the volume. The encoding must
+    encode newlines as single "\\n" bytes (e.g. UTF-8).
+
+    Args:
+        source (str, os.PathLike or file object): The path to a plain, gzip, bz2 or xz volume file, or an
+                                                  open text or binary file object.
+        encoding (str, optional): The text encoding of the volume. Defaults to config.VOLUME_ENCODING.
+        chunk_size (int, optional): The size of each read. Defaults to config.VOLUME_READ_CHUNK_SIZE.
+        use_mmap (bool, optional): Memory-map plain volume files instead of reading them in chunks.
+                                   Compressed files and file objects are always read in chunks.
+                                   Defaults to False.
+
+    Yields:
+        str: The text of each page.
+    """
+    if not isinstance(source, (str, bytes, os.PathLike)):
+        yield from iter_file_pages(source, encoding, chunk_size)
+        return
+
+    opener = get_volume_opener(source)
+    if use_mmap and opener is open:
+        yield from iter_mmap_pages(source, encoding)
+        return
+    with opener(source, "rb") as volume_file:
+        yield from iter_file_pages(volume_file, encoding, chunk_size)
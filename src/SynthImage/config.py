@@ -3,15 +3,34 @@
 # text settings
 FONT_ENCODING = "utf-16"
 
+# Volume reading settings
+VOLUME_ENCODING = "utf-8"
+VOLUME_READ_CHUNK_SIZE = 1 << 20
+
+# Glyph run cache settings
+GLYPH_RUN_CACHE_BYTES = 64 * 1024 * 1024
+
+# Batch rendering settings
+PAGE_CHUNK_SIZE = 4
+
+# Font cache settings
+FONT_CACHE_SIZE = 32
+
 # Padding settings
 EXTRA_PADDING = 20
+LINE_PADDING = 4
 
 # Image settings
 DUMMY_IMAGE_MODE = "RGB"
+PAGE_IMAGE_MODES = ("RGB", "L", "1")
 DUMMY_IMAGE_SIZE = (1, 1)
 BACKGROUND_COLOR = "white"
 TEXT_COLOR = (0, 0, 0)
 
+# Background image settings
+BACKGROUND_FIT = "stretch"
+BACKGROUND_CACHE_BYTES = 256 * 1024 * 1024
+
 # Text bounding box settings
 TEXT_BBOX_X = 0
 TEXT_BBOX_Y = 0
@@ -21,6 +40,35 @@ TEXT_BBOX_Y = 0
 LEFT_PADDING = 10
 TOP_PADDING = 30
 
+# Augmentation operator settings, the number of rusting operators kept for different parameters
+RUSTING_OPERATOR_CACHE_SIZE = 32
+
+# Deform augmentation settings, the remap maps of a strip of rows are cached per deformation and page
+# width, rounded up to the width step. Each cached pair of maps takes 6 bytes per pixel.
+DEFORM_STRIP_HEIGHT = 256
+DEFORM_MAP_WIDTH_STEP = 256
+DEFORM_MAP_CACHE_SIZE = 8
+
+# Paper texture bank settings, the (width, height) of the stored textures
+TEXTURE_BANK_SIZE = (2048, 2048)
+TEXTURE_BANK_COUNT = 8
+TEXTURE_BANK_MAX_BYTES = 1 << 30
+
+# Torn augmentation settings
+TORN_MASK_CACHE_SIZE = 16
+
+# Rotate augmentation settings, "pil" rotates with Image.rotate and "cv2" with a single cv2.warpAffine
+ROTATION_BACKEND = "pil"
+ROTATION_INTERPOLATION = "nearest"
+
+# Line extraction settings, "nearest" matches the resampling of Image.rotate
+LINE_WARP_INTERPOLATION = "nearest"
+
+# Line dataset settings, the bucket widths grow geometrically so that lines are padded by at most a
+# quarter of their width
+LINE_HEIGHT = 64
+LINE_BUCKET_GROWTH = 1.25
+
 # Color settings
 WHITE_COLOR = (255, 255, 255)
 
@@ -0,0 +1,116 @@
+import os
+import threading
+from collections import OrderedDict
+
+from PIL import ImageFont
+
+import SynthImage.config as config
+
+
+class FontCache:
+    def __init__(self, max_size: int = config.FONT_CACHE_SIZE):
+        """Initialize the FontCache object.
+
+        Args:
+            max_size (int, optional): The maximum number of fonts kept in the cache. The least
+                                      recently used font is evicted once the cache is full.
+                                      Defaults to config.FONT_CACHE_SIZE.
+        """
+        self.max_size = max_size
+        self._fonts = OrderedDict()
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self.hits = 0
+        self.misses = 0
+
+    def _check_process(self):
+        """Reset the cache when it is used from a forked child process.
+
+        A forked child inherits the parent's fonts, whose FreeType faces share open file
+        descriptors (and their read offsets) with the parent, and a lock that may have been
+        held at fork time. The child therefore starts over with its own lock, fonts and counters.
+        """
+        if self._pid != os.getpid():
+            self._reset()
+
+    def _reset(self):
+        """Drop every cached font and start over with a fresh lock and zeroed counters."""
+        self._fonts = OrderedDict()
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self.hits = 0
+        self.misses = 0
+
+    def get_font(self, font_path, font_size, encoding=config.FONT_ENCODING):
+        """Return the font for the given path, size and encoding, loading it on a cache miss.
+
+        Args:
+            font_path (str): The path to the font file.
+            font_size (int): The size of the font.
+            encoding (str, optional): The font encoding. Defaults to config.FONT_ENCODING.
+
+        Returns:
+            PIL.ImageFont.FreeTypeFont: The loaded font.
+        """
+        self._check_process()
+        key = (os.fspath(font_path), font_size, encoding)
+        with self._lock:
+            font = self._fonts.get(key)
+            if font is not None:
+                self._fonts.move_to_end(key)
+                self.hits += 1
+                return font
+            self.misses += 1
+
+        font = ImageFont.truetype(font_path, font_size, encoding=encoding)
+        with self._lock:
+            self._fonts[key] = font
+            self._fonts.move_to_end(key)
+            while len(self._fonts) > self.max_size:
+                self._fonts.popitem(last=False)
+        return font
+
+    def clear(self):
+        """Remove every font from the cache and reset the hit/miss counters."""
+        with self._lock:
+            self._fonts.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Return the cache statistics.
+
+        Returns:
+            dict: The number of hits, misses, cached fonts and the maximum cache size.
+        """
+        self._check_process()
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._fonts),
+                "max_size": self.max_size,
+            }
+
+    def __len__(self):
+        return len(self._fonts)
+
+
+font_cache = FontCache()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=font_cache._reset)
+
+
+def get_font(font_path, font_size, encoding=config.FONT_ENCODING):
+    """Return a font from the process-wide font cache.
+
+    Args:
+        font_path (str): The path to the font file.
+        font_size (int): The size of the font.
+        encoding (str, optional): The font encoding. Defaults to config.FONT_ENCODING.
+
+    Returns:
+        PIL.ImageFont.FreeTypeFont: The loaded font.
+    """
+    return font_cache.get_font(font_path, font_size, encoding)
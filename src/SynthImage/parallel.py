@@ -0,0 +1,105 @@
+import itertools
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+
+def iter_chunks(iterable, chunksize):
+    """Groups the items of an iterable into lists of at most chunksize items.
+
+    Args:
+        iterable (iterable): The items to group.
+        chunksize (int): The maximum number of items in a chunk.
+
+    Yields:
+        list: The chunks, in order.
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def apply_chunk(func, chunk):
+    """Applies a function to every item of a chunk inside a worker process."""
+    return [func(item) for item in chunk]
+
+
+def imap_bounded(
+    func,
+    iterable,
+    workers=None,
+    chunksize=1,
+    ordered=True,
+    max_in_flight=None,
+    initializer=None,
+    initargs=(),
+    mp_context=None,
+):
+    """Lazily maps a function over an iterable with a pool of worker processes.
+
+    The iterable is consumed only as fast as the results are, so at most max_in_flight chunks are
+    submitted to the pool or waiting to be collected at any time.
+
+    Args:
+        func (callable): A picklable function applied to every item.
+        iterable (iterable): The items to process.
+        workers (int, optional): The number of worker processes. With 0 or 1, the items are processed
+                                 in the calling process. Defaults to os.cpu_count().
+        chunksize (int, optional): The number of items sent to a worker at a time. Defaults to 1.
+        ordered (bool, optional): Yield the results in the order of the items. When False, results are
+                                  yielded as soon as their chunk is done. Defaults to True.
+        max_in_flight (int, optional): The maximum number of chunks submitted but not yet yielded.
+                                       Defaults to twice the number of workers.
+        initializer (callable, optional): A function called once in each worker process (and once in
+                                          the calling process when there are no workers). Defaults to None.
+        initargs (tuple, optional): The arguments of the initializer. Defaults to ().
+        mp_context (multiprocessing.context.BaseContext, optional): The multiprocessing context used to
+                                                                    start the workers. Defaults to None.
+
+    Yields:
+        The results of func for every item.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        for item in iterable:
+            yield func(item)
+        return
+
+    if max_in_flight is None:
+        max_in_flight = 2 * workers
+    max_in_flight = max(max_in_flight, 1)
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=mp_context,
+        initializer=initializer,
+        initargs=initargs,
+    )
+    try:
+        if ordered:
+            pending = deque()
+            for chunk in iter_chunks(iterable, chunksize):
+                pending.append(executor.submit(apply_chunk, func, chunk))
+                if len(pending) >= max_in_flight:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        else:
+            pending = set()
+            for chunk in iter_chunks(iterable, chunksize):
+                pending.add(executor.submit(apply_chunk, func, chunk))
+                if len(pending) >= max_in_flight:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield from future.result()
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
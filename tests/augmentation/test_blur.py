@@ -1,6 +1,7 @@
 import tempfile
 from pathlib import Path
 
+import numpy as np
 from PIL import Image
 
 from SynthImage.Augmentation.blur_augmentation import BlurAugmentation
@@ -62,3 +63,10 @@ def test_motion_blur():
         expected_motion_blur_image = Image.open(expected_motion_blur_save_path)
         actual_motion_blur_image = Image.open(actual_motion_blur_save_path)
         assert expected_motion_blur_image.size == actual_motion_blur_image.size
+
+
+def test_blur_seed():
+    """Test that the same seed gives the same blur."""
+    first_img = BlurAugmentation(original_img_obj, rng=11).apply_motion_blur()
+    second_img = BlurAugmentation(original_img_obj, rng=11).apply_motion_blur()
+    assert (np.array(first_img) == np.array(second_img)).all()
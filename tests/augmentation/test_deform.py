@@ -1,9 +1,15 @@
 import tempfile
 from pathlib import Path
 
+import numpy as np
 from PIL import Image
 
-from SynthImage.Augmentation.deform_augmentation import DeformAugmentation
+import SynthImage.config as config
+from SynthImage.Augmentation.deform_augmentation import (
+    DeformAugmentation,
+    get_deform_maps,
+    get_strip_maps,
+)
 
 original_img_path = Path("./tests/page_image/data/expected_page_image.png")
 
@@ -36,5 +42,32 @@ def test_deform_augmentation(utils):
         expected_deform_aug_img = Image.open(expected_deform_save_path)
         actual_deform_aug_img = Image.open(actual_deform_save_path)
 
-        # Assert that the actual image matches the expected image
-        assert utils.is_same_img(actual_deform_aug_img, expected_deform_aug_img)
+        # Assert that the actual image matches the expected image, up to the sub-pixel precision of
+        # the remap
+        assert utils.is_similar_img(actual_deform_aug_img, expected_deform_aug_img, 8)
+
+
+def test_deform_maps_cache():
+    """Test that the deformation maps are shared by pages of any height and of close widths."""
+    width = original_img_obj.width
+    maps = get_deform_maps(width, 30, 3, 90)
+    assert maps[0].shape[:2] == (config.DEFORM_STRIP_HEIGHT, 1280)
+    assert get_deform_maps(width + 50, 30, 3, 90) is maps
+    assert get_deform_maps(width, 30, 4, 90) is not maps
+
+    # Pages of other heights reuse the maps and get the same rows as a full page
+    deformed_np = np.array(
+        DeformAugmentation(original_img_obj, 30, 3, 90).apply_deform()
+    )
+    cropped_img = original_img_obj.crop((0, 0, width, 200))
+    cropped_np = np.array(DeformAugmentation(cropped_img, 30, 3, 90).apply_deform())
+    assert get_strip_maps.cache_info().currsize <= config.DEFORM_MAP_CACHE_SIZE
+    assert (cropped_np[:190] == deformed_np[:190]).all()
+
+
+def test_deform_fill():
+    """Test that pixels shifted in from outside the image are black."""
+    white_img = Image.new("L", (200, 100), 255)
+    deformed_np = np.array(DeformAugmentation(white_img, 20, 10, 30).apply_deform())
+    assert (deformed_np[0] == 0).any() and (deformed_np[-1] == 0).any()
+    assert (deformed_np[40:60] == 255).all()
@@ -1,6 +1,8 @@
+import random
 import tempfile
 from pathlib import Path
 
+import numpy as np
 from PIL import Image
 
 from SynthImage.Augmentation.dirty_augmentation import DirtySpotAugmentation
@@ -36,3 +38,32 @@ def test_dirty_augmentation():
 
         assert expected_dirty_aug_img.size == actual_dirty_aug_img.size
         assert expected_dirty_aug_img.mode == actual_dirty_aug_img.mode
+
+
+def test_dirty_augmentation_many_spots():
+    """Test that spots applied together give the same image as spots applied one at a time."""
+    rng = random.Random(0)
+    many_spots = [
+        (rng.randint(-20, 620), rng.randint(-20, 420), rng.randint(1, 60))
+        for _ in range(300)
+    ]
+
+    aug_img = DirtySpotAugmentation(
+        original_img_obj, many_spots, np.random.default_rng(1)
+    ).apply_dirty()
+
+    spot_rng = np.random.default_rng(1)
+    expected_img = original_img_obj
+    for spot in many_spots:
+        expected_img = DirtySpotAugmentation(
+            expected_img, [spot], spot_rng
+        ).apply_dirty()
+
+    assert (np.array(aug_img) == np.array(expected_img)).all()
+
+
+def test_dirty_augmentation_seed():
+    """Test that the same seed gives the same spots."""
+    first_img = DirtySpotAugmentation(original_img_obj, dirty_spots, 7).apply_dirty()
+    second_img = DirtySpotAugmentation(original_img_obj, dirty_spots, 7).apply_dirty()
+    assert (np.array(first_img) == np.array(second_img)).all()
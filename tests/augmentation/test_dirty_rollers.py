@@ -1,6 +1,7 @@
 import tempfile
 from pathlib import Path
 
+import numpy as np
 from PIL import Image
 
 from SynthImage.Augmentation.dirty_rollers_augmentation import DirtyRollersAugmentation
@@ -26,3 +27,13 @@ def test_dirty_rollers():
         expected_dirty_rollers_image = Image.open(expected_dirty_rollers_path)
         actual_dirty_rollers_image = Image.open(actual_dirty_rollers_path)
         assert expected_dirty_rollers_image.size == actual_dirty_rollers_image.size
+
+
+def test_dirty_rollers_seed():
+    """Test that the same seed gives the same dirty rollers, although augraphy draws in numba compiled code."""
+    first_img = DirtyRollersAugmentation(original_img_obj, rng=7).apply_dirty_rollers()
+    for _ in range(3):
+        other_img = DirtyRollersAugmentation(
+            original_img_obj, rng=7
+        ).apply_dirty_rollers()
+        assert (np.array(first_img) == np.array(other_img)).all()
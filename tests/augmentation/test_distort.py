@@ -1,6 +1,7 @@
 import tempfile
 from pathlib import Path
 
+import numpy as np
 from PIL import Image
 
 from SynthImage.Augmentation.distort_augmentation import (
@@ -44,3 +45,23 @@ def test_distort_augmentation(utils):
 
         # Assert that the actual image matches the expected image
         assert utils.is_same_img(actual_distort_aug_img, expected_distort_aug_img)
+
+
+def test_distort_array_input():
+    """Test that a numpy input is distorted directly and left unchanged."""
+    page_img_np = np.array(original_img_obj)
+    original_np = page_img_np.copy()
+    distort_aug_np = DistortAugmentation(
+        page_img_np, DistortionMode.subtractive, 200, 100, 1, 2, 4
+    ).apply_distort()
+    assert isinstance(distort_aug_np, np.ndarray)
+    assert (distort_aug_np == np.array(distortObject.apply_distort())).all()
+    assert (page_img_np == original_np).all()
+
+
+def test_distort_grayscale():
+    """Test that grayscale images are distorted on their single channel."""
+    gray_img = original_img_obj.convert("L")
+    distort_aug_img = DistortAugmentation(gray_img).apply_distort()
+    assert distort_aug_img.mode == "L"
+    assert (np.array(distort_aug_img) <= np.array(gray_img)).all()
@@ -0,0 +1,98 @@
+import numpy as np
+from PIL import Image
+
+from SynthImage.Augmentation import operators
+from SynthImage.Augmentation.blur_augmentation import BlurAugmentation
+from SynthImage.Augmentation.brightness_augmentation import BrightnessAugmentation
+from SynthImage.Augmentation.deform_augmentation import DeformAugmentation
+from SynthImage.Augmentation.dirty_augmentation import DirtySpotAugmentation
+from SynthImage.Augmentation.distort_augmentation import DistortAugmentation
+from SynthImage.Augmentation.flip_augmentation import FlipAugmentation
+from SynthImage.Augmentation.geometry import (
+    TRANSFORM_KEY,
+    get_transform,
+    rotation_matrix,
+    transform_points,
+)
+from SynthImage.Augmentation.grid_distort_augmentation import GridDistortAugmentation
+from SynthImage.Augmentation.ink_bleed_augmentation import InkBleedAugmentation
+from SynthImage.Augmentation.pipeline import Pipeline
+from SynthImage.Augmentation.rotate_augmentation import RotateAugmentation
+from SynthImage.Augmentation.sharpness_augmentation import SharpnessAugmentation
+from SynthImage.Augmentation.transpose_augmentation import TransposeAugmentation
+
+
+def get_dot_image(size, points):
+    # Dots of 3x3 pixels, single pixels can be dropped by nearest neighbour rotation
+    img = Image.new("L", size, 0)
+    for x, y in points:
+        img.paste(255, (x - 1, y - 1, x + 2, y + 2))
+    return img
+
+
+def test_rotation_matrix():
+    """Test that the rotation matrix maps pixels to where Image.rotate puts them."""
+    size = (201, 99)
+    points = [(5, 7), (198, 90), (100, 49)]
+    for angle in [3, -7.5, 30, 90]:
+        rotated_img = get_dot_image(size, points).rotate(angle, expand=True)
+        matrix, rotated_size = rotation_matrix(size, angle)
+        assert rotated_size == rotated_img.size
+        rotated_np = np.array(rotated_img)
+        for x, y in np.round(transform_points(matrix, points)).astype(int):
+            assert rotated_np[y, x] == 255
+
+
+def test_recorded_transforms():
+    """Test that geometric augmentations record composable transforms on their results."""
+    points = [(5, 7), (150, 60)]
+    img = get_dot_image((160, 80), points).convert("RGB")
+    flipped_img = FlipAugmentation(img).apply_horizontal_flip()
+    transposed_img = TransposeAugmentation(flipped_img).apply_transpose()
+    rotated_img, _ = RotateAugmentation(transposed_img, 5).apply_rotate()
+
+    for aug_img in [flipped_img, transposed_img, rotated_img]:
+        aug_np = np.array(aug_img.convert("L"))
+        for x, y in np.round(transform_points(get_transform(aug_img), points)):
+            assert aug_np[int(y), int(x)] == 255
+    assert (get_transform(img) == np.eye(3)).all()
+
+
+def test_non_geometric_augmentations_keep_transform():
+    """Test that augmentations which leave the page in place pass the recorded transform through."""
+    rotated_img, _ = RotateAugmentation(
+        get_dot_image((160, 80), [(5, 7)]), 5
+    ).apply_rotate()
+    rotated_img = rotated_img.convert("RGB")
+    stages = [
+        lambda img: BlurAugmentation(img, rng=0).apply_blur(),
+        lambda img: InkBleedAugmentation(img, rng=0).apply_ink_bleed(),
+        lambda img: BrightnessAugmentation(img, 0.9).apply_brightness(),
+        lambda img: SharpnessAugmentation(img, 1.5).apply_sharpness(),
+        lambda img: DirtySpotAugmentation(img, [(40, 30, 10)], rng=0).apply_dirty(),
+        lambda img: DistortAugmentation(img).apply_distort(),
+    ]
+    for stage in stages:
+        aug_img = stage(rotated_img)
+        assert np.allclose(get_transform(aug_img), get_transform(rotated_img))
+    # Pages without a recorded transform keep none
+    img = get_dot_image((160, 80), [(5, 7)])
+    assert TRANSFORM_KEY not in BlurAugmentation(img, rng=0).apply_blur().info
+
+
+def test_warps_discard_transform():
+    """Test that non-affine warps leave no transform, which would misplace the lines."""
+    rotated_img, _ = RotateAugmentation(
+        get_dot_image((160, 80), [(5, 7)]), 5
+    ).apply_rotate()
+    stages = [
+        lambda img: DeformAugmentation(img).apply_deform(),
+        lambda img: GridDistortAugmentation(img, rng=0).apply_grid_distort(),
+        lambda img: Pipeline([operators.blur, operators.grid_distort])(img, 0),
+        lambda img: Pipeline([operators.grid_distort, operators.transpose])(img, 0),
+    ]
+    for stage in stages:
+        assert TRANSFORM_KEY not in stage(rotated_img).info
+    # A pipeline without a warp still records its transform
+    aug_img = Pipeline([operators.blur, operators.transpose])(rotated_img, 0)
+    assert TRANSFORM_KEY in aug_img.info
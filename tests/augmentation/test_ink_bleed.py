@@ -1,6 +1,8 @@
+import random
 import tempfile
 from pathlib import Path
 
+import numpy as np
 from PIL import Image
 
 from SynthImage.Augmentation.ink_bleed_augmentation import InkBleedAugmentation
@@ -26,3 +28,25 @@ def test_ink_bleed():
         expected_ink_bleed_image = Image.open(expected_ink_bleed_path)
         actual_ink_bleed_image = Image.open(actual_ink_bleed_path)
         assert expected_ink_bleed_image.size == actual_ink_bleed_image.size
+
+
+def test_ink_bleed_seed():
+    """Test that the same seed gives the same ink bleed, although augraphy uses the global random states."""
+    first_img = InkBleedAugmentation(original_img_obj, rng=11).apply_ink_bleed()
+    second_img = InkBleedAugmentation(original_img_obj, rng=11).apply_ink_bleed()
+    assert (np.array(first_img) == np.array(second_img)).all()
+
+
+def test_ink_bleed_seed_keeps_global_random():
+    """Test that a seeded ink bleed restores the global random states, so later draws stay independent."""
+    draws = []
+    for seed in [1, 2]:
+        random.seed(seed)
+        np.random.seed(seed)
+        expected = (random.random(), np.random.random())
+        random.seed(seed)
+        np.random.seed(seed)
+        InkBleedAugmentation(original_img_obj, rng=11).apply_ink_bleed()
+        draws.append((random.random(), np.random.random()))
+        assert draws[-1] == expected
+    assert draws[0] != draws[1]
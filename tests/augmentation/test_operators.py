@@ -0,0 +1,72 @@
+import pickle
+import threading
+from functools import partial
+from pathlib import Path
+
+import albumentations as A
+import numpy as np
+import pytest
+from PIL import Image
+
+import SynthImage.config as config
+from SynthImage.Augmentation import operators
+from SynthImage.Augmentation.geometry import get_transform
+
+original_img_path = Path("./tests/page_image/data/expected_page_image.png")
+
+original_img_obj = Image.open(original_img_path)
+
+
+def test_operator_reuses_transform():
+    """Test that an operator builds its library transform once per thread."""
+    op = operators.AlbumentationsOperator(A.MotionBlur)
+    transform = op.get_transform()
+    op(original_img_obj)
+    assert op.get_transform() is transform
+
+    thread_transforms = []
+    thread = threading.Thread(
+        target=lambda: thread_transforms.append(op.get_transform())
+    )
+    thread.start()
+    thread.join()
+    assert thread_transforms[0] is not transform
+
+    unpickled_op = pickle.loads(pickle.dumps(op))
+    assert unpickled_op(original_img_obj).size == original_img_obj.size
+
+
+def test_operator_rng():
+    """Test that operators called with equally seeded generators give the same images."""
+    for op in [operators.motion_blur, operators.ink_bleed]:
+        first_img = op(original_img_obj, np.random.default_rng(7))
+        second_img = op(original_img_obj, np.random.default_rng(7))
+        assert first_img.size == original_img_obj.size
+        assert (np.array(first_img) == np.array(second_img)).all()
+
+
+def test_geometric_operator():
+    """Test that geometric operators record their transform."""
+    horizontal_flip = operators.GeometricOperator(partial(A.HorizontalFlip, p=1))
+    flipped_img = horizontal_flip(original_img_obj)
+    width = original_img_obj.width
+    assert np.allclose(get_transform(flipped_img)[0], (-1, 0, width - 1))
+
+
+def test_rusting_operator_cache():
+    """Test that the rusting operator is built once per set of parameters."""
+    assert operators.get_rusting_operator() is operators.get_rusting_operator()
+    assert operators.get_rusting_operator(hue_shift_limit=10) is not (
+        operators.get_rusting_operator()
+    )
+    # Parameters drawn per sample must not grow the cache without bound
+    for hue_shift_limit in range(config.RUSTING_OPERATOR_CACHE_SIZE * 2):
+        operators.get_rusting_operator(hue_shift_limit=hue_shift_limit)
+    cache_info = operators.get_rusting_operator.cache_info()
+    assert cache_info.currsize <= config.RUSTING_OPERATOR_CACHE_SIZE
+
+
+def test_operator_is_abstract():
+    """Test that the base operator cannot be used without an apply_array implementation."""
+    with pytest.raises(TypeError):
+        operators.Operator(A.Blur)
@@ -1,9 +1,13 @@
 import tempfile
 from pathlib import Path
 
+import numpy as np
 from PIL import Image
 
-from SynthImage.Augmentation.paper_texture_augmentation import PaperTextureAugmentation
+from SynthImage.Augmentation.paper_texture_augmentation import (
+    PaperTextureAugmentation,
+    blend_texture,
+)
 
 original_img_path = Path("./tests/page_image/data/expected_page_image.png")
 
@@ -26,3 +30,21 @@ def test_paper_texture():
         expected_paper_texture_image = Image.open(expected_paper_texture_path)
         actual_paper_texture_image = Image.open(actual_paper_texture_path)
         assert expected_paper_texture_image.size == actual_paper_texture_image.size
+
+
+def test_blend_texture():
+    """Test that the fixed-point blend is within 1 of the floating point blend."""
+    rng = np.random.default_rng(0)
+    image_array = rng.integers(0, 256, (50, 40, 3), dtype=np.uint8)
+    texture = rng.integers(0, 256, (50, 40), dtype=np.uint8)
+    expected = (image_array * 0.7 + texture[..., np.newaxis] * 0.3).astype(np.uint8)
+
+    out = np.empty_like(image_array)
+    blended = blend_texture(image_array, texture, 0.7, 0.3, out=out)
+    assert blended is out
+    assert np.abs(blended.astype(int) - expected).max() <= 1
+
+    # Weights adding up to more than 1 saturate instead of wrapping around
+    saturated = blend_texture(image_array, texture, 0.9, 0.4)
+    expected = np.clip(image_array * 0.9 + texture[..., np.newaxis] * 0.4, 0, 255)
+    assert np.abs(saturated.astype(int) - expected.astype(np.uint8)).max() <= 1
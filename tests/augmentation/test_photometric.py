@@ -0,0 +1,102 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image, ImageEnhance, ImageOps
+
+from SynthImage.Augmentation import operators
+from SynthImage.Augmentation.contrast_augmentation import ContrastAugmentation
+from SynthImage.Augmentation.photometric import (
+    Brightness,
+    Contrast,
+    Gamma,
+    Invert,
+    PhotometricOperator,
+    PointOp,
+    Solarize,
+)
+from SynthImage.Augmentation.pipeline import Pipeline
+
+original_img_path = Path("./tests/page_image/data/expected_page_image.png")
+
+original_img_obj = Image.open(original_img_path)
+
+
+def test_photometric_matches_pil():
+    """Test that the fused lookup table gives the same image as the PIL enhancers one after the other."""
+    op = PhotometricOperator([Brightness(0.8), Contrast(1.4), Solarize(100)])
+    for mode in ["L", "RGB"]:
+        img = original_img_obj.convert(mode)
+        expected_img = ImageEnhance.Brightness(img).enhance(0.8)
+        expected_img = ImageEnhance.Contrast(expected_img).enhance(1.4)
+        expected_img = ImageOps.solarize(expected_img, 100)
+        aug_img = op(img)
+        assert aug_img.mode == mode
+        assert (np.array(aug_img) == np.array(expected_img)).all()
+        assert (op.apply_array(np.array(img)) == np.array(expected_img)).all()
+
+
+def test_photometric_alpha():
+    """Test that the alpha channel is kept as is."""
+    img = original_img_obj.convert("RGBA")
+    img.putalpha(Image.linear_gradient("L").resize(img.size))
+    aug_np = PhotometricOperator([Invert(), Gamma(0.8)]).apply_array(np.array(img))
+    assert (aug_np[..., 3] == np.array(img)[..., 3]).all()
+    assert (aug_np[..., :3] != np.array(img)[..., :3]).any()
+
+
+def test_photometric_seed():
+    """Test that random parameters are drawn from the random generator."""
+    op = PhotometricOperator([Brightness((0.5, 1.5)), Contrast((0.5, 1.5))])
+    first_img = op(original_img_obj, np.random.default_rng(4))
+    second_img = op(original_img_obj, np.random.default_rng(4))
+    other_img = op(original_img_obj, np.random.default_rng(5))
+    assert (np.array(first_img) == np.array(second_img)).all()
+    assert (np.array(first_img) != np.array(other_img)).any()
+
+
+def test_photometric_pipeline_stage():
+    """Test that the operator is a pipeline stage next to neighbourhood operations."""
+    op = PhotometricOperator([Contrast(1.5), Gamma(1.3)])
+    pipeline = Pipeline([operators.blur, op])
+    aug_img = pipeline(original_img_obj, np.random.default_rng(2))
+    expected_img = op(operators.blur(original_img_obj, np.random.default_rng(2)))
+    assert (np.array(aug_img) == np.array(expected_img)).all()
+
+
+def test_point_op_is_abstract():
+    """Test that the base point operation cannot be used without a table."""
+    with pytest.raises(TypeError):
+        PointOp()
+
+
+def test_contrast_matches_pil_on_color_noise():
+    """Test contrast on color images whose "L" mean differs from the mean of the channel means."""
+    # The mean of the "L" image is 183.5 and the weighted mean of the channel means 183.4
+    rounding_np = np.array([[[33, 215, 217], [130, 248, 189]]], dtype=np.uint8)
+    expected_np = np.array(
+        ImageEnhance.Contrast(Image.fromarray(rounding_np)).enhance(2)
+    )
+    assert (
+        PhotometricOperator([Contrast(2)]).apply_array(rounding_np) == expected_np
+    ).all()
+
+    rng = np.random.default_rng(0)
+    for index in range(40):
+        mode = ["RGB", "RGBA"][index % 2]
+        noise_np = rng.integers(0, 256, (37, 53, len(mode)), dtype=np.uint8)
+        noise_np //= rng.integers(1, 64, dtype=np.uint8)
+        img = Image.fromarray(noise_np, mode)
+        factor = float(rng.uniform(0, 3))
+        expected_np = np.array(ImageEnhance.Contrast(img).enhance(factor))
+        aug_img = ContrastAugmentation(img, factor).apply_contrast()
+        assert (np.array(aug_img) == expected_np).all()
+        op = PhotometricOperator([Contrast(factor)])
+        assert (op.apply_array(noise_np) == expected_np).all()
+
+        # After another operation the mean is estimated, at most a level off
+        expected_np = ImageEnhance.Brightness(img).enhance(0.8)
+        expected_np = np.array(ImageEnhance.Contrast(expected_np).enhance(factor))
+        aug_np = PhotometricOperator([Brightness(0.8), Contrast(factor)])(img)
+        diff = np.abs(np.array(aug_np, dtype=int) - expected_np)
+        assert diff.max() <= max(1, abs(1 - factor))
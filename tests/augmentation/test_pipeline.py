@@ -0,0 +1,48 @@
+from functools import partial
+from pathlib import Path
+
+import albumentations as A
+import numpy as np
+from PIL import Image
+
+from SynthImage.Augmentation import operators
+from SynthImage.Augmentation.geometry import get_transform
+from SynthImage.Augmentation.pipeline import Pipeline
+
+original_img_path = Path("./tests/page_image/data/expected_page_image.png")
+
+original_img_obj = Image.open(original_img_path)
+
+
+def test_pipeline_matches_operators():
+    """Test that a pipeline gives the same image as calling its operators one after the other."""
+    stages = [operators.motion_blur, operators.ink_bleed, operators.hue_saturation]
+    expected_img = original_img_obj
+    rng = np.random.default_rng(3)
+    for op in stages:
+        expected_img = op(expected_img, rng)
+
+    pipeline = Pipeline(stages)
+    aug_img = pipeline(original_img_obj, np.random.default_rng(3))
+    assert aug_img.mode == "RGB"
+    assert (np.array(aug_img) == np.array(expected_img)).all()
+
+
+def test_pipeline_transform():
+    """Test that the pipeline records the transforms of its geometric stages."""
+    pipeline = Pipeline(
+        [
+            operators.GeometricOperator(partial(A.HorizontalFlip, p=1)),
+            lambda image, rng: 255 - image,
+            operators.GeometricOperator(partial(A.VerticalFlip, p=1)),
+        ]
+    )
+    gray_img = original_img_obj.convert("L")
+    aug_img = pipeline(gray_img)
+    assert aug_img.mode == "L"
+    expected_np = 255 - np.array(gray_img)[::-1, ::-1]
+    assert (np.array(aug_img) == expected_np).all()
+    width, height = gray_img.size
+    assert np.allclose(
+        get_transform(aug_img), [[-1, 0, width - 1], [0, -1, height - 1], [0, 0, 1]]
+    )
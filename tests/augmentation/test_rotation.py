@@ -1,8 +1,11 @@
 import tempfile
 from pathlib import Path
 
+import numpy as np
+import pytest
 from PIL import Image
 
+from SynthImage.Augmentation.geometry import get_transform
 from SynthImage.Augmentation.rotate_augmentation import RotateAugmentation
 
 original_img_path = Path("./tests/page_image/data/expected_page_image.png")
@@ -31,3 +34,65 @@ def test_rotate_augmentation(utils):
         expected_rotate_image = Image.open(expected_rotate_save_path)
         actual_rotate_image = Image.open(actual_rotate_save_path)
         assert utils.is_same_img(actual_rotate_image, expected_rotate_image)
+
+
+def test_rotate_cv2_backend():
+    """Test that the cv2 backend matches the PIL rotation up to a few rounding differences."""
+    for interpolation in ["nearest", "bilinear", "bicubic"]:
+        pil_img, _ = RotateAugmentation(
+            original_img_obj, 3, interpolation=interpolation
+        ).apply_rotate()
+        cv2_img, angle = RotateAugmentation(
+            original_img_obj, 3, backend="cv2", interpolation=interpolation
+        ).apply_rotate()
+        assert angle == 3
+        assert cv2_img.size == pil_img.size
+        assert cv2_img.mode == pil_img.mode
+        assert np.allclose(get_transform(cv2_img), get_transform(pil_img))
+        diff = np.abs(np.array(cv2_img, dtype=int) - np.array(pil_img, dtype=int))
+        assert (diff > 32).mean() < 0.001
+
+
+def test_rotate_cv2_grayscale():
+    """Test that grayscale pages are rotated on a single channel with a white fill."""
+    gray_img = original_img_obj.convert("L")
+    rotated_img, _ = RotateAugmentation(gray_img, -5, backend="cv2").apply_rotate()
+    assert rotated_img.mode == "L"
+    assert rotated_img.getpixel((0, 0)) == 255
+
+
+def test_rotate_cv2_modes():
+    """Test that both backends return pages in the mode of the input, with the same pixels up to rounding."""
+    palette_img = Image.new("P", (120, 80), 0)
+    palette_img.putpalette([255, 0, 0, 255, 255, 255])
+    palette_img.paste(1, (30, 20, 90, 60))
+    for img in [
+        original_img_obj.convert("1"),
+        original_img_obj.convert("LA"),
+        original_img_obj.convert("RGBA"),
+        palette_img,
+    ]:
+        for interpolation in ["nearest", "bicubic"]:
+            pil_img, _ = RotateAugmentation(
+                img, 7, interpolation=interpolation
+            ).apply_rotate()
+            cv2_img, _ = RotateAugmentation(
+                img, 7, backend="cv2", interpolation=interpolation
+            ).apply_rotate()
+            assert cv2_img.mode == pil_img.mode == img.mode
+            assert cv2_img.size == pil_img.size
+            # PIL leaves the corners of interpolated "LA" pages transparent, so only colors are compared
+            cv2_np = np.array(cv2_img.convert("RGB"), dtype=int)
+            diff = np.abs(cv2_np - np.array(pil_img.convert("RGB"), dtype=int))
+            assert (diff > 32).mean() < 0.005
+    rotated_palette_img, _ = RotateAugmentation(
+        palette_img, 7, backend="cv2"
+    ).apply_rotate()
+    assert rotated_palette_img.getpalette()[:6] == [255, 0, 0, 255, 255, 255]
+
+
+def test_rotate_invalid_options():
+    with pytest.raises(ValueError):
+        RotateAugmentation(original_img_obj, 3, backend="skimage")
+    with pytest.raises(ValueError):
+        RotateAugmentation(original_img_obj, 3, interpolation="lanczos")
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from SynthImage.Augmentation import texture_bank as texture_bank_module
+from SynthImage.Augmentation.paper_texture_augmentation import PaperTextureAugmentation
+from SynthImage.Augmentation.texture_bank import TextureBank, reflect_indices
+
+
+def test_texture_bank_warm_up(tmp_path, monkeypatch):
+    """Test that textures are generated once and reused by later banks on the same directory."""
+    bank = TextureBank(tmp_path, texture_size=(64, 48), textures_per_type=3)
+    bank.warm_up(["rough_stains", "light_stains"])
+    assert bank.get_textures("rough_stains").shape == (3, 48, 64)
+    assert bank.get_nbytes() == 2 * 3 * 64 * 48
+
+    def fail():
+        raise AssertionError("textures were generated again")
+
+    monkeypatch.setattr(texture_bank_module, "TextureGenerator", fail)
+    reused_bank = TextureBank(tmp_path, texture_size=(64, 48), textures_per_type=3)
+    assert (
+        reused_bank.get_textures("rough_stains") == bank.get_textures("rough_stains")
+    ).all()
+
+
+def test_texture_bank_size_cap(tmp_path):
+    """Test that the bank stores fewer textures when they do not all fit."""
+    bank = TextureBank(
+        tmp_path, texture_size=(32, 32), textures_per_type=4, max_bytes=3 * 32 * 32
+    )
+    assert len(bank.get_textures("rough_stains")) == 3
+    with pytest.raises(ValueError):
+        bank.get_textures("light_stains")
+
+
+def test_texture_bank_sample(tmp_path):
+    """Test that samples are crops of the stored textures, mirrored when they are larger."""
+    bank = TextureBank(tmp_path, texture_size=(64, 48), textures_per_type=2)
+    textures = bank.get_textures("rough_stains")
+    rng = np.random.default_rng(0)
+
+    crop = bank.sample("rough_stains", (40, 30), rng)
+    assert crop.shape == (30, 40)
+    assert set(np.unique(crop)) <= set(np.unique(textures))
+
+    large_crop = bank.sample("rough_stains", (150, 100), rng)
+    assert large_crop.shape == (100, 150)
+    assert set(np.unique(large_crop)) <= set(np.unique(textures))
+
+
+def test_reflect_indices():
+    """Test that repeated indices are mirrored."""
+    assert reflect_indices(2, 8, 3).tolist() == [2, 2, 1, 0, 0, 1, 2, 2]
+
+
+def test_paper_texture_with_bank(tmp_path):
+    """Test the paper texture augmentation with textures from a bank."""
+    bank = TextureBank(tmp_path, texture_size=(64, 48), textures_per_type=2)
+    original_img_obj = Image.new("RGB", (100, 40), "white")
+    paper_texture_aug_img = PaperTextureAugmentation(
+        original_img_obj, texture_bank=bank, rng=np.random.default_rng(0)
+    ).apply_paper_texture()
+    assert paper_texture_aug_img.size == original_img_obj.size
+    assert paper_texture_aug_img.mode == "RGB"
@@ -1,6 +1,7 @@
 import tempfile
 from pathlib import Path
 
+import numpy as np
 from PIL import Image
 
 from SynthImage.Augmentation.torn_augmentation import TornAugmentation
@@ -36,3 +37,35 @@ def test_torn_augmentation():
 
         assert expected_torn_aug_img.size == actual_torn_aug_img.size
         assert expected_torn_aug_img.mode == actual_torn_aug_img.mode
+
+
+def test_torn_outputs():
+    """Tests that the outputs of a seeded tear share the same torn areas."""
+    gray_img = original_img_obj.convert("L")
+    mask_img = TornAugmentation(gray_img, 7, 40, seed=3, output="mask").apply_torn()
+    assert mask_img.mode == "L"
+    mask = np.array(mask_img) == 255
+    assert mask.any() and not mask.all()
+
+    filled_img = TornAugmentation(gray_img, 7, 40, seed=3, output="fill").apply_torn()
+    assert filled_img.mode == "L"
+    assert (np.array(filled_img)[mask] == 255).all()
+    assert (np.array(filled_img)[~mask] == np.array(gray_img)[~mask]).all()
+
+    torn_img = TornAugmentation(gray_img, 7, 40, seed=3).apply_torn()
+    assert torn_img.mode == "RGBA"
+    assert (np.array(torn_img)[..., 3] == np.where(mask, 0, 255)).all()
+
+
+def test_torn_mask_cache():
+    """Tests that the mask of a seed is drawn once."""
+    first_mask = TornAugmentation(original_img_obj, seed=5).get_mask()
+    assert TornAugmentation(original_img_obj, seed=5).get_mask() is first_mask
+    assert TornAugmentation(original_img_obj, seed=6).get_mask() is not first_mask
+
+
+def test_torn_rng():
+    """Tests that unseeded tears are drawn from the given random generator."""
+    first_mask = TornAugmentation(original_img_obj, rng=8, output="mask").apply_torn()
+    second_mask = TornAugmentation(original_img_obj, rng=8, output="mask").apply_torn()
+    assert (np.array(first_mask) == np.array(second_mask)).all()
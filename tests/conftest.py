@@ -12,6 +12,13 @@ class Utils:
             return False
         return True
 
+    @staticmethod
+    def is_similar_img(img1, img2, max_difference):
+        if img1.size != img2.size or img1.mode != img2.mode:
+            return False
+        diff = ImageChops.difference(img1, img2)
+        return max(band_max for _, band_max in diff.getextrema()) <= max_difference
+
 
 @pytest.fixture
 def utils():
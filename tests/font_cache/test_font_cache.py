@@ -0,0 +1,36 @@
+from SynthImage.font_cache import FontCache
+
+font_path = "./tests/font/monlam_uni_ochan1.ttf"
+
+
+def test_font_cache_hits_and_misses():
+    """Test that repeated lookups are served from the cache."""
+    cache = FontCache(max_size=4)
+    font = cache.get_font(font_path, 30)
+    assert cache.get_font(font_path, 30) is font
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 1, "max_size": 4}
+
+
+def test_font_cache_eviction():
+    """Test that the least recently used font is evicted once the cache is full."""
+    cache = FontCache(max_size=2)
+    font_20 = cache.get_font(font_path, 20)
+    cache.get_font(font_path, 30)
+    cache.get_font(font_path, 20)
+    cache.get_font(font_path, 40)
+    assert len(cache) == 2
+    assert cache.get_font(font_path, 20) is font_20
+    cache.get_font(font_path, 30)
+    assert cache.stats()["misses"] == 4
+
+
+def test_font_cache_forked_child():
+    """Test that a cache inherited by a forked child reloads its fonts instead of reusing the parent's."""
+    cache = FontCache()
+    parent_font = cache.get_font(font_path, 30)
+    # Pretend the cache was created by a parent process
+    cache._pid = -1
+    child_font = cache.get_font(font_path, 30)
+    assert child_font is not parent_font
+    assert cache.stats()["hits"] == 0
+    assert cache.stats()["misses"] == 1
@@ -0,0 +1,72 @@
+import multiprocessing
+
+import numpy as np
+
+from SynthImage.Augmentation.rotate_augmentation import RotateAugmentation
+from SynthImage.LineExtraction.batch_extraction import BatchLineExtractor, PageRecord
+from SynthImage.LineExtraction.line_extraction import ExtractLines
+from SynthImage.SynthPageImage.page_image import PageGenerator
+
+font_path = "./tests/font/monlam_uni_ochan1.ttf"
+text = """༄༅༅། །རྒྱ་གར་སྐད་དུ། བི་ན་ཡ་བསྟུ། བོད་སྐད་དུ། འདུལ་བ་གཞི།
+རྣམས་ཡང་དག་རབ་བཅད་ཅིང་། །མུ་སྟེགས་ཚོགས་རྣམས་ཐམས་ཅད་རབ་བཅོམ་སྟེ།
+ཕྱག་འཚལ་ལོ། །ཁྱིམ་དོན་ཆེ་ཆུང་སྤངས་ཏེ་དང་པོར་རབ་འབྱུང་དཀའ།"""
+
+
+def get_records():
+    page_generator = PageGenerator(30, font_path, 10, 10, 30, 30)
+    records = []
+    for page_id, page_text in enumerate([text, text[:60], text[::-1]]):
+        page_image, layout = page_generator.generate_page_image(
+            page_text, return_layout=True
+        )
+        rotated_image, angle = RotateAugmentation(page_image, page_id).apply_rotate()
+        records.append(
+            PageRecord(
+                rotated_image,
+                page_text,
+                rotation_angle=angle,
+                layout=layout,
+                page_id=f"page-{page_id}",
+            )
+        )
+    return records
+
+
+def test_batch_extraction():
+    """Test that lines extracted by a worker pool match lines extracted one page at a time."""
+    records = get_records()
+    expected_lines = []
+    for record in records:
+        line_images = ExtractLines(
+            record.aug_img,
+            record.page_text,
+            record.rotation_angle,
+            30,
+            font_path,
+            layout=record.layout,
+        ).extract_lines()
+        expected_lines.extend(
+            (line_image, record.page_id, line_index)
+            for line_index, line_image in enumerate(line_images)
+        )
+
+    extractor = BatchLineExtractor(
+        30,
+        font_path,
+        workers=2,
+        chunksize=1,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+    actual_lines = list(extractor.extract(iter(records)))
+    assert len(actual_lines) == len(expected_lines)
+    for actual_line, expected_line in zip(actual_lines, expected_lines):
+        line_image, line_text, page_id, line_index = actual_line
+        assert (page_id, line_index) == expected_line[1:]
+        assert line_text in text or line_text in text[::-1]
+        assert (np.array(line_image) == np.array(expected_line[0])).all()
+
+    in_process_lines = BatchLineExtractor(30, font_path, workers=0).extract(
+        records, ordered=False
+    )
+    assert len(list(in_process_lines)) == len(expected_lines)
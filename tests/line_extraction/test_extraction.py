@@ -1,9 +1,21 @@
 import tempfile
 from pathlib import Path
 
+import numpy as np
 from PIL import Image, ImageFont
 
+from SynthImage.Augmentation.blur_augmentation import BlurAugmentation
+from SynthImage.Augmentation.brightness_augmentation import BrightnessAugmentation
+from SynthImage.Augmentation.deform_augmentation import DeformAugmentation
+from SynthImage.Augmentation.flip_augmentation import FlipAugmentation
+from SynthImage.Augmentation.geometry import (
+    get_transform,
+    rotation_matrix,
+    transform_points,
+)
+from SynthImage.Augmentation.rotate_augmentation import RotateAugmentation
 from SynthImage.LineExtraction.line_extraction import ExtractLines
+from SynthImage.SynthPageImage.page_image import PageGenerator
 
 original_img_path = Path(
     "./tests/augmentation/data/expected_rotate_image/expected_rotate_image_3.png"
@@ -96,3 +108,125 @@ def test_line_images(utils):
             expected_line_image = Image.open(expected_line_images_path)
             actual_line_image = Image.open(actual_line_images_path)
             assert utils.is_same_img(actual_line_image, expected_line_image)
+
+
+def test_line_extraction_grayscale():
+    """Test that lines are extracted from grayscale pages the same way as from color pages."""
+    rgb_lines = ExtractLines(original_img_obj, text, 3, 30, font_path).extract_lines()
+    gray_lines = ExtractLines(
+        original_img_obj.convert("L"), text, 3, 30, font_path
+    ).extract_lines()
+    assert [line.size for line in gray_lines] == [line.size for line in rgb_lines]
+
+
+def test_line_extraction_with_layout():
+    """Test that lines are cut from the ground-truth layout without measuring the text again."""
+    page_generator = PageGenerator(30, font_path, 10, 10, 30, 30)
+    page_image, layout = page_generator.generate_page_image(text, return_layout=True)
+    line_images = ExtractLines(
+        page_image, text, 0, 30, font_path, layout=layout
+    ).extract_lines()
+    assert len(line_images) == len([line for line in layout if line.width > 0])
+
+
+def test_ink_profile():
+    """Test that the ink profile counts the non-white pixels of each row and follows the image."""
+    page = Image.new("L", (20, 10), 255)
+    page.putpixel((3, 4), 0)
+    page.putpixel((7, 4), 0)
+    page.putpixel((5, 6), 128)
+    extractor = ExtractLines(page, "", 0, 30, font_path)
+    assert extractor.get_ink_profile().tolist() == [0, 0, 0, 0, 2, 0, 1, 0, 0, 0]
+    assert extractor.get_first_ink_row() == 4
+
+    extractor.aug_img = Image.new("L", (20, 10), 255)
+    assert extractor.get_first_ink_row() == 0
+
+
+def test_extract_line_arrays():
+    """Test that line arrays are views into one page array with the same pixels as the line images."""
+    page_image = PageGenerator(30, font_path, 10, 10, 30, 30).generate_page_image(text)
+    extractor = ExtractLines(page_image, text, 0, 30, font_path)
+    line_arrays = extractor.extract_line_arrays()
+    line_images = ExtractLines(page_image, text, 0, 30, font_path).extract_lines()
+
+    assert len(line_arrays) == len(line_images)
+    for line_array, line_image in zip(line_arrays, line_images):
+        assert line_array.base is line_arrays[0].base
+        assert (line_array == np.asarray(line_image)).all()
+
+
+def test_line_extraction_with_transform():
+    """Test that lines are warped out of a flipped page the same as they are cut from the page."""
+    page_generator = PageGenerator(30, font_path, 10, 10, 30, 30)
+    page_image, layout = page_generator.generate_page_image(text, return_layout=True)
+    flipped_image = FlipAugmentation(page_image).apply_vertical_flip()
+    expected_lines = ExtractLines(
+        page_image, text, 0, 30, font_path, layout=layout
+    ).extract_lines()
+    warped_lines = ExtractLines(
+        flipped_image, text, 0, 30, font_path, layout=layout
+    ).extract_lines()
+    assert len(warped_lines) == len(expected_lines)
+    for warped_line, expected_line in zip(warped_lines, expected_lines):
+        assert (np.array(warped_line) == np.array(expected_line)).all()
+
+    rotated_image, angle = RotateAugmentation(page_image, 3).apply_rotate()
+    extractor = ExtractLines(rotated_image, text, angle, 30, font_path, layout=layout)
+    rotated_lines = extractor.extract_lines()
+    assert len(rotated_lines) == len(expected_lines)
+    assert extractor.aug_img is rotated_image
+    assert_rotated_quads(extractor, layout, page_image.size, angle)
+
+
+def assert_rotated_quads(extractor, layout, page_size, angle):
+    # The quads must be the layout boxes rotated exactly as Image.rotate rotates the page
+    rotation, _ = rotation_matrix(page_size, angle)
+    line_quads = extractor.get_line_quads()
+    lines = [line for line in layout if line.width > 0 and line.height > 0]
+    assert len(line_quads) == len(lines) > 0
+    for (line_text, quad), line in zip(line_quads, lines):
+        left, top, right, bottom = line.bbox
+        corners = [(left, top), (right, top), (right, bottom), (left, bottom)]
+        assert line_text == line.text
+        assert np.allclose(quad, transform_points(rotation, corners))
+
+
+def test_line_extraction_after_noise():
+    """Test that non-geometric augmentations after a rotation keep the transform for line extraction."""
+    page_generator = PageGenerator(30, font_path, 10, 10, 30, 30)
+    page_image, layout = page_generator.generate_page_image(text, return_layout=True)
+    rotated_image, angle = RotateAugmentation(page_image, 3).apply_rotate()
+    noisy_image = BlurAugmentation(rotated_image, rng=1).apply_blur()
+    noisy_image = BrightnessAugmentation(noisy_image, 0.9).apply_brightness()
+
+    extractor = ExtractLines(noisy_image, text, angle, 30, font_path, layout=layout)
+    assert np.allclose(extractor.transform, get_transform(rotated_image))
+    assert_rotated_quads(extractor, layout, page_image.size, angle)
+    expected_lines = ExtractLines(
+        rotated_image, text, angle, 30, font_path, layout=layout
+    ).extract_lines()
+    noisy_lines = extractor.extract_lines()
+    assert [line.size for line in noisy_lines] == [line.size for line in expected_lines]
+
+
+def test_line_extraction_after_deform():
+    """Test that lines are found without a transform after a deformation, as without a layout."""
+    page_generator = PageGenerator(30, font_path, 10, 10, 30, 30)
+    page_image, layout = page_generator.generate_page_image(text, return_layout=True)
+    rotated_image, angle = RotateAugmentation(page_image, 3).apply_rotate()
+    deformed_image = DeformAugmentation(rotated_image).apply_deform()
+
+    extractor = ExtractLines(deformed_image, text, angle, 30, font_path, layout=layout)
+    assert extractor.transform is None
+    # The lines of the rotated page found without its transform, which the deformation does not move
+    legacy_image = rotated_image.copy()
+    legacy_image.info.clear()
+    expected_lines = ExtractLines(
+        legacy_image, text, angle, 30, font_path, layout=layout
+    ).extract_lines()
+    deformed_lines = extractor.extract_lines()
+    assert len(deformed_lines) > 0
+    assert [line.size for line in deformed_lines] == [
+        line.size for line in expected_lines
+    ]
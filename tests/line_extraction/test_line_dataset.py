@@ -0,0 +1,58 @@
+import tempfile
+
+import numpy as np
+from PIL import Image
+
+from SynthImage.LineExtraction.line_dataset import (
+    LineDataset,
+    LineDatasetWriter,
+    get_bucket_width,
+    normalize_line_image,
+)
+
+
+def test_line_dataset():
+    """Test that lines written into width buckets are read back unchanged from the memory-mapped files."""
+    rng = np.random.default_rng(0)
+    lines = []
+    for width in [40, 100, 130, 300, 90]:
+        line_np = rng.integers(0, 256, size=(32, width), dtype=np.uint8)
+        lines.append((Image.fromarray(line_np).convert("RGB"), f"line {width}"))
+
+    with tempfile.TemporaryDirectory() as tempdirname:
+        with LineDatasetWriter(
+            tempdirname, line_height=32, bucket_growth=1.5
+        ) as writer:
+            writer.add_lines(lines)
+        dataset = LineDataset(tempdirname)
+
+        assert len(dataset) == len(lines)
+        assert dataset.bucket_widths == [58, 130, 195, 438]
+        line_np, text = dataset.get_line(130, 1)
+        assert text == "line 90"
+        assert (line_np == np.asarray(lines[4][0].convert("L"))).all()
+
+        batches = list(dataset.iter_batches(batch_size=2))
+        assert [batch.shape for batch, _, _ in batches] == [
+            (1, 32, 58),
+            (2, 32, 130),
+            (1, 32, 195),
+            (1, 32, 438),
+        ]
+        batch, widths, texts = batches[1]
+        assert widths == [100, 90] and texts == ["line 100", "line 90"]
+        assert (batch[1, :, 90:] == 255).all()
+
+
+def test_normalize_line_image():
+    """Test that lines are scaled to the line height, keeping their aspect ratio."""
+    line_np = normalize_line_image(Image.new("RGB", (200, 50), "white"), 64)
+    assert line_np.shape == (64, 256)
+
+
+def test_bucket_width():
+    """Test that short and long lines are padded by at most a growth step of their width."""
+    for width in range(1, 5000):
+        bucket_width = get_bucket_width(width, 1.25)
+        assert width <= bucket_width <= 1.25 * width + 1
+    assert get_bucket_width(64, 1.25) < 2 * 64
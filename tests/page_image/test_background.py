@@ -0,0 +1,163 @@
+import weakref
+
+import numpy as np
+from PIL import Image
+
+from SynthImage.SynthPageImage.background import BackgroundCache, composite_text
+from SynthImage.SynthPageImage.page_image import PageGenerator
+
+font_path = "./tests/font/monlam_uni_ochan1.ttf"
+text = """༄༅༅། །རྒྱ་གར་སྐད་དུ། བི་ན་ཡ་བསྟུ། བོད་སྐད་དུ། འདུལ་བ་གཞི། བམ་པོ་དང་པོ།
+རྣམས་ཡང་དག་རབ་བཅད་ཅིང་། །མུ་སྟེགས་ཚོགས་རྣམས་ཐམས་ཅད་རབ་བཅོམ་སྟེ། །སྡེ་དང་བཅས་པའི་བདུད་རྣམས་ངེས་བཅོམ་ནས།"""  # noqa
+
+
+def make_paper(size=(64, 48)):
+    width, height = size
+    gradient = np.linspace(180, 240, width, dtype=np.uint8)
+    paper = np.stack([np.tile(gradient, (height, 1))] * 3, axis=-1)
+    paper[..., 2] -= 20
+    return Image.fromarray(paper)
+
+
+def test_composite_text():
+    """Test that opaque text takes the text color and uncovered pixels keep the background."""
+    background = np.full((2, 2, 3), 200, dtype=np.uint8)
+    coverage = np.array([[0, 255], [128, 0]], dtype=np.uint8)
+    page = composite_text(background, coverage, (0, 0, 0))
+    assert page[0, 0].tolist() == [200, 200, 200]
+    assert page[0, 1].tolist() == [0, 0, 0]
+    assert page[1, 0].tolist() == [100, 100, 100]
+
+
+def test_background_page_image(tmp_path):
+    """Test that pages are composited onto a background decoded only once."""
+    paper_path = tmp_path / "paper.png"
+    make_paper().save(paper_path)
+    background_cache = BackgroundCache()
+    page_generator = PageGenerator(
+        30,
+        font_path,
+        10,
+        10,
+        30,
+        30,
+        background_image=paper_path,
+        background_cache=background_cache,
+    )
+    plain_generator = PageGenerator(30, font_path, 10, 10, 30, 30)
+
+    page_img = page_generator.generate_page_image(text)
+    plain_img = plain_generator.generate_page_image(text)
+    assert page_img.mode == "RGB"
+    assert page_img.size == plain_img.size
+
+    page_np = np.array(page_img)
+    plain_np = np.array(plain_img)
+    # Where there is no text, the page shows the stretched background
+    assert (page_np[plain_np == 255] < 255).all()
+    # Where the text is opaque, the page shows the text
+    assert (page_np[plain_np == 0] == 0).all()
+
+    page_generator.generate_page_image(text)
+    assert background_cache.stats()["misses"] == 2
+    assert background_cache.stats()["hits"] == 2
+
+
+def test_tiled_background_modes():
+    """Test that tiled backgrounds repeat the background and follow the page mode."""
+    paper = make_paper()
+    for image_mode in ["L", "1"]:
+        page_generator = PageGenerator(
+            30,
+            font_path,
+            10,
+            10,
+            30,
+            30,
+            background_image=paper,
+            background_fit="tile",
+            image_mode=image_mode,
+        )
+        page_img = page_generator.generate_page_image(text)
+        assert page_img.mode == image_mode
+
+    tiled = BackgroundCache().get_background(paper, (130, 100), "L", fit="tile")
+    assert tiled.shape == (100, 130)
+    assert (tiled[:, :64] == tiled[:, 64:128]).all()
+    assert (tiled[:48] == tiled[48:96]).all()
+
+
+def test_background_cache_eviction():
+    """Test that the cached arrays stay within the byte budget."""
+    background_cache = BackgroundCache(max_bytes=64 * 48 * 3 * 2)
+    paper = make_paper()
+    for height in range(50, 60):
+        background_cache.get_background(paper, (64, height), "RGB")
+    assert background_cache.stats()["bytes"] <= 64 * 48 * 3 * 2
+
+
+def test_background_line_images():
+    """Test that lines show the part of the page background under them, fitted to the page only once."""
+    background_cache = BackgroundCache()
+    page_generator = PageGenerator(
+        30,
+        font_path,
+        10,
+        10,
+        30,
+        30,
+        background_image=make_paper(),
+        background_cache=background_cache,
+    )
+    page_img, layout = page_generator.generate_page_image(text, return_layout=True)
+    misses = background_cache.stats()["misses"]
+    # Without padding, the crops do not reach into the neighbouring lines
+    line_images = list(
+        page_generator.generate_line_images(text, layout=layout, padding=0)
+    )
+    assert background_cache.stats()["misses"] == misses
+
+    text_lines = [line for line in layout if line.text.strip()]
+    assert len(line_images) == len(text_lines) > 0
+    for (line_image, _), line in zip(line_images, text_lines):
+        expected_line = page_img.crop(line.bbox)
+        assert (np.array(line_image) == np.array(expected_line)).all()
+
+    # Padding past the page edges mirrors the background
+    padded_images = page_generator.generate_line_images(text, layout=layout, padding=40)
+    for (line_image, _), line in zip(padded_images, text_lines):
+        assert line_image.size == (line.width + 80, line.height + 80)
+        assert (np.array(line_image) < 255).all()
+
+
+def test_bilevel_background_page():
+    """Test that bilevel pages threshold a light background to white instead of dithering it."""
+    page_generator = PageGenerator(
+        30,
+        font_path,
+        10,
+        10,
+        30,
+        30,
+        background_image=make_paper(),
+        background_cache=BackgroundCache(),
+        image_mode="1",
+    )
+    plain_generator = PageGenerator(30, font_path, 10, 10, 30, 30, image_mode="1")
+    page_np = np.array(page_generator.generate_page_image(text))
+    plain_np = np.array(plain_generator.generate_page_image(text))
+    assert page_np[plain_np].all()
+    assert not page_np.all()
+
+
+def test_background_cache_image_keys():
+    """Test that a new image is not served the arrays of a collected image with the same id."""
+    background_cache = BackgroundCache()
+    for level in range(0, 250, 10):
+        paper = Image.new("L", (8, 8), level)
+        assert (background_cache.get_decoded(paper, "L") == level).all()
+        paper_ref = weakref.ref(paper)
+        del paper
+        # The cache does not keep the images alive
+        assert paper_ref() is None
+    assert background_cache.stats()["hits"] == 0
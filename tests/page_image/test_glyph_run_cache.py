@@ -0,0 +1,44 @@
+import numpy as np
+
+from SynthImage.font_cache import get_font
+from SynthImage.SynthPageImage.glyph_run_cache import GlyphRunCache, split_runs
+from SynthImage.SynthPageImage.page_image import PageGenerator
+
+font_path = "./tests/font/monlam_uni_ochan1.ttf"
+text = """༄༅༅། །རྒྱ་གར་སྐད་དུ། བི་ན་ཡ་བསྟུ། བོད་སྐད་དུ། འདུལ་བ་གཞི། བམ་པོ་དང་པོ།
+རྣམས་ཡང་དག་རབ་བཅད་ཅིང་། །མུ་སྟེགས་ཚོགས་རྣམས་ཐམས་ཅད་རབ་བཅོམ་སྟེ། །སྡེ་དང་བཅས་པའི་བདུད་རྣམས་ངེས་བཅོམ་ནས།
+ཕྱག་འཚལ་ལོ། །ཁྱིམ་དོན་ཆེ་ཆུང་སྤངས་ཏེ་དང་པོར་རབ་འབྱུང་དཀའ། །རབ་བྱུང་ཐོབ་ནས་ཡུལ་སྤྱད་དག་གིས་དགའ་ཐོབ་དཀའ།"""  # noqa
+
+
+def test_split_runs():
+    """Test that runs end at syllable delimiters and concatenate back to the line."""
+    line = "བོད་སྐད་དུ། འདུལ་བ"
+    assert split_runs(line) == ["བོད་", "སྐད་", "དུ།", " ", "འདུལ་", "བ"]
+    assert "".join(split_runs(text)) == text
+
+
+def test_glyph_run_cache_matches_draw_text():
+    """Test that pages composited from cached runs match pages drawn with ImageDraw.text."""
+    draw_generator = PageGenerator(30, font_path, 10, 10, 30, 30)
+    glyph_run_cache = GlyphRunCache()
+    cached_generator = PageGenerator(
+        30, font_path, 10, 10, 30, 30, glyph_run_cache=glyph_run_cache
+    )
+    expected = np.array(draw_generator.generate_page_image(text), dtype=np.int16)
+    actual = np.array(cached_generator.generate_page_image(text), dtype=np.int16)
+    assert expected.shape == actual.shape
+    # Runs may land one pixel away from their position in the full line
+    assert np.count_nonzero(expected != actual) <= 0.01 * expected.size
+
+    misses = glyph_run_cache.stats()["misses"]
+    cached_generator.generate_page_image(text)
+    assert glyph_run_cache.stats()["misses"] == misses
+
+
+def test_glyph_run_cache_eviction():
+    """Test that the cached bitmaps stay within the byte budget."""
+    font = get_font(font_path, 30)
+    glyph_run_cache = GlyphRunCache(max_bytes=2000)
+    for run in split_runs(text):
+        glyph_run_cache.get_run(font, run)
+    assert 0 < glyph_run_cache.stats()["bytes"] <= 2000
@@ -1,8 +1,14 @@
+import multiprocessing
 import tempfile
 
-from PIL import Image
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
 
+from SynthImage.Augmentation import operators
+from SynthImage.Augmentation.pipeline import Pipeline
 from SynthImage.SynthPageImage.page_image import PageGenerator
+from SynthImage.SynthPageImage.page_layout import PageLayout
 
 font_path = "./tests/font/monlam_uni_ochan1.ttf"
 pgobject = PageGenerator(
@@ -56,3 +62,149 @@ def test_generate_page_image(utils):
         expected_image = Image.open(expected_image_path)
         actual_image = Image.open(actual_image_path)
         assert utils.is_same_img(actual_image, expected_image)
+
+
+def test_layout_page(monkeypatch):
+    """Test that the layout measures each line once and places the lines top to bottom."""
+    textbbox_calls = []
+    original_textbbox = ImageDraw.ImageDraw.textbbox
+
+    def counting_textbbox(self, *args, **kwargs):
+        textbbox_calls.append(args)
+        return original_textbbox(self, *args, **kwargs)
+
+    monkeypatch.setattr(ImageDraw.ImageDraw, "textbbox", counting_textbbox)
+    layout = pgobject.layout_page(text)
+    lines = text.split("\n")
+
+    assert len(textbbox_calls) == len(lines)
+    assert layout.size == pgobject.calculate_image_dimension(text)
+    assert [line.text for line in layout] == lines
+    assert layout.lines[0].origin == (10, 30)
+    for previous, current in zip(layout.lines, layout.lines[1:]):
+        assert current.origin[1] == previous.origin[1] + previous.height
+    for line in layout:
+        if line.text.strip():
+            assert line.bbox[1] <= line.baseline <= line.bbox[3]
+
+
+def test_generate_page_image_with_layout(utils):
+    """Test that a precomputed layout renders the same page as an implicit one."""
+    layout = pgobject.layout_page(text)
+    assert utils.is_same_img(
+        pgobject.generate_page_image(text, layout=layout),
+        pgobject.generate_page_image(text),
+    )
+
+
+def test_generate_pages(utils):
+    """Test that pages rendered by a worker pool match pages rendered one at a time."""
+    pages = [text, text.upper(), text[:200]]
+    expected_images = [pgobject.generate_page_image(page) for page in pages]
+    spawn_context = multiprocessing.get_context("spawn")
+
+    ordered_images = list(
+        pgobject.generate_pages(pages, workers=2, chunksize=1, mp_context=spawn_context)
+    )
+    assert len(ordered_images) == len(pages)
+    for actual_image, expected_image in zip(ordered_images, expected_images):
+        assert utils.is_same_img(actual_image, expected_image)
+
+    unordered_images = dict(pgobject.generate_pages(pages, workers=0, ordered=False))
+    for index, expected_image in enumerate(expected_images):
+        assert utils.is_same_img(unordered_images[index], expected_image)
+
+
+def test_generate_page_image_modes():
+    """Test that grayscale and bilevel pages are rendered directly in their own mode."""
+    rgb_image = pgobject.generate_page_image(text)
+    gray_generator = PageGenerator(30, font_path, 10, 10, 30, 30, image_mode="L")
+    gray_image = gray_generator.generate_page_image(text)
+    assert gray_image.mode == "L"
+    assert (np.array(gray_image) == np.array(rgb_image.convert("L"))).all()
+
+    bilevel_generator = PageGenerator(30, font_path, 10, 10, 30, 30, image_mode="1")
+    bilevel_image = bilevel_generator.generate_page_image(text)
+    assert bilevel_image.mode == "1"
+    assert not np.array(bilevel_image).all()
+
+    with pytest.raises(ValueError):
+        PageGenerator(30, font_path, 10, 10, 30, 30, image_mode="CMYK")
+
+
+def test_generate_page_image_return_layout(utils):
+    """Test that the layout returned with a page survives a JSON round trip."""
+    page_image, layout = pgobject.generate_page_image(text, return_layout=True)
+    assert utils.is_same_img(page_image, pgobject.generate_page_image(text))
+    assert layout.size == page_image.size
+
+    restored_layout = PageLayout.from_json(layout.to_json())
+    assert restored_layout.size == layout.size
+    assert [line.to_dict() for line in restored_layout] == [
+        line.to_dict() for line in layout
+    ]
+
+
+def test_page_layout_to_arrow():
+    """Test that the layout converts to an Arrow table with one row per line."""
+    pytest.importorskip("pyarrow")
+    layout = pgobject.layout_page(text)
+    table = layout.to_arrow()
+    assert table.num_rows == len(layout)
+    assert table.column("text").to_pylist() == [line.text for line in layout]
+    assert table.column("bottom").to_pylist() == [line.bbox[3] for line in layout]
+    assert table.schema.metadata[b"width"] == str(layout.width).encode()
+
+
+def test_generate_line_images():
+    """Test that lines rendered on their own match the same lines cut from the rendered page."""
+    page_image, layout = pgobject.generate_page_image(text, return_layout=True)
+    line_images = list(pgobject.generate_line_images(text, padding=0))
+    text_lines = [line for line in layout if line.text.strip()]
+    assert [line_text for _, line_text in line_images] == [
+        line.text for line in text_lines
+    ]
+    for (line_image, _), line in zip(line_images, text_lines):
+        expected_line = np.array(page_image.crop(line.bbox))
+        assert (np.array(line_image) == expected_line).all()
+
+    padded_images = pgobject.generate_line_images(
+        text, augment=lambda img: img.convert("L"), padding=4
+    )
+    for (line_image, _), line in zip(padded_images, text_lines):
+        assert line_image.mode == "L"
+        assert line_image.size == (line.width + 8, line.height + 8)
+
+
+def test_generate_pages_augment(utils):
+    """Test that augmented pages rendered by a worker pool can be reproduced one at a time."""
+    pages = [text, text.upper(), text[:200]]
+    augment = Pipeline([operators.motion_blur, operators.ink_bleed])
+    spawn_context = multiprocessing.get_context("spawn")
+    augmented_images = list(
+        pgobject.generate_pages(
+            pages,
+            workers=2,
+            chunksize=1,
+            mp_context=spawn_context,
+            augment=augment,
+            start_index=10,
+        )
+    )
+    for index, (page, actual_image) in enumerate(zip(pages, augmented_images)):
+        expected_image = pgobject.generate_augmented_page_image(
+            page, augment, 10 + index
+        )
+        assert utils.is_same_img(actual_image, expected_image)
+
+
+def test_page_rng():
+    """Test that the random generator of a page depends only on the seed and the page index."""
+    first_generator = PageGenerator(30, font_path, 10, 10, 30, 30, seed=4)
+    second_generator = PageGenerator(30, font_path, 10, 10, 30, 30, seed=4)
+    assert first_generator.get_page_rng(3).random() == (
+        second_generator.get_page_rng(3).random()
+    )
+    assert first_generator.get_page_rng(3).random() != (
+        first_generator.get_page_rng(4).random()
+    )
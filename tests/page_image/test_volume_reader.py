@@ -0,0 +1,61 @@
+import bz2
+import gzip
+import io
+import lzma
+from pathlib import Path
+
+import pytest
+
+from SynthImage.SynthPageImage.page_image import PageGenerator
+from SynthImage.SynthPageImage.volume_reader import iter_volume_pages
+
+font_path = "./tests/font/monlam_uni_ochan1.ttf"
+pgobject = PageGenerator(30, font_path, 10, 10, 30, 30)
+
+vol_text = "\n".join(
+    [
+        "༄༅༅། །རྒྱ་གར་སྐད་དུ། བི་ན་ཡ་བསྟུ།",
+        "བོད་སྐད་དུ། འདུལ་བ་གཞི། བམ་པོ་དང་པོ།",
+        "",
+        "དཀོན་མཆོག་གསུམ་ལ་ཕྱག་འཚལ་ལོ།",
+        "",
+        "",
+        "།གང་གིས་འཆིང་རྣམས་ཡང་དག་རབ་བཅད་ཅིང་།",
+        "",
+    ]
+)
+
+
+@pytest.mark.parametrize(
+    "opener", [open, gzip.open, bz2.open, lzma.open], ids=["plain", "gz", "bz2", "xz"]
+)
+def test_iter_pages_from_path(tmp_path, opener):
+    """Test that pages read lazily from a (compressed) volume file match get_pages."""
+    volume_path = Path(tmp_path) / "volume.txt"
+    with opener(volume_path, "wb") as volume_file:
+        volume_file.write(vol_text.encode("utf-8"))
+    assert list(pgobject.iter_pages(volume_path)) == pgobject.get_pages(vol_text)
+
+
+def test_iter_pages_with_mmap(tmp_path):
+    """Test that pages read through a memory map match get_pages."""
+    volume_path = Path(tmp_path) / "volume.txt"
+    volume_path.write_bytes(vol_text.encode("utf-8"))
+    pages = pgobject.iter_pages(str(volume_path), use_mmap=True)
+    assert list(pages) == pgobject.get_pages(vol_text)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64])
+def test_iter_pages_across_chunks(chunk_size):
+    """Test that separators and multi-byte characters split between reads are handled."""
+    binary_pages = iter_volume_pages(
+        io.BytesIO(vol_text.encode("utf-8")), chunk_size=chunk_size
+    )
+    text_pages = iter_volume_pages(io.StringIO(vol_text), chunk_size=chunk_size)
+    assert list(binary_pages) == pgobject.get_pages(vol_text)
+    assert list(text_pages) == pgobject.get_pages(vol_text)
+
+
+def test_iter_pages_empty_volume():
+    """Test that an empty volume yields a single empty page, like get_pages."""
+    assert list(iter_volume_pages(io.BytesIO(b""))) == pgobject.get_pages("")
@@ -0,0 +1,40 @@
+import multiprocessing
+
+from SynthImage.parallel import imap_bounded, iter_chunks
+
+spawn_context = multiprocessing.get_context("spawn")
+
+
+def test_iter_chunks():
+    """Test that items are grouped into chunks of at most chunksize items."""
+    assert list(iter_chunks(range(7), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+
+
+def test_imap_bounded_in_process():
+    """Test that the items are mapped in the calling process without workers."""
+    assert list(imap_bounded(abs, [-1, 2, -3], workers=0)) == [1, 2, 3]
+
+
+def test_imap_bounded_limits_in_flight_work():
+    """Test that the pool results keep their order and the input is consumed lazily."""
+    consumed = []
+
+    def items():
+        for item in range(-20, 0):
+            consumed.append(item)
+            yield item
+
+    results = imap_bounded(
+        abs, items(), workers=2, chunksize=2, max_in_flight=2, mp_context=spawn_context
+    )
+    assert next(results) == 20
+    assert len(consumed) <= 2 * 2
+    assert list(results) == list(range(19, 0, -1))
+
+
+def test_imap_bounded_unordered():
+    """Test that unordered results contain every result once."""
+    results = imap_bounded(
+        abs, range(-10, 0), workers=2, ordered=False, mp_context=spawn_context
+    )
+    assert sorted(results) == list(range(1, 11))